@@ -1,4 +1,5 @@
 from django import forms # Form helpers
 
 class RecipientUploadForm(forms.Form):
-    csv_file = forms.FileField(label="Recipient CSV")
\ No newline at end of file
+    csv_file = forms.FileField(label="Recipient CSV")
+    segment = forms.CharField(label="Add to segment (optional)", max_length=100, required=False)
@@ -0,0 +1,94 @@
+"""
+Concurrent-connection benchmark for the documents API under ASGI and WSGI.
+
+Start each server with a single worker, then point this script at both:
+
+    uvicorn notifier_core.asgi:application --port 8001 --workers 1
+    gunicorn notifier_core.wsgi:application --bind :8002 --workers 1 --threads 8
+
+    python benchmarks/asgi_vs_wsgi.py \\
+        --target asgi=http://127.0.0.1:8001/api/async/documents/ \\
+        --target wsgi=http://127.0.0.1:8002/api/documents/ \\
+        --connections 200 --seconds 10 --slow-client 0.5
+
+Each connection loops GET requests for --seconds. With --slow-client N, every
+connection first trickles a POST body over N seconds, like a client on a poor
+network. A thread-per-request server is blocked for the whole upload; an
+event loop is not.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import aiohttp
+
+
+async def slow_body(payload: bytes, delay: float):
+    middle = len(payload) // 2
+    yield payload[:middle]
+    await asyncio.sleep(delay)
+    yield payload[middle:]
+
+
+async def connection_loop(session, url, deadline, slow_client, latencies, errors, index):
+    if slow_client:
+        payload = json.dumps({"title": f"bench-{index}-{time.time()}"}).encode()
+        try:
+            async with session.post(
+                url, data=slow_body(payload, slow_client), headers={"Content-Type": "application/json"}
+            ) as response:
+                await response.read()
+        except aiohttp.ClientError:
+            errors.append(1)
+
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            async with session.get(url) as response:
+                await response.read()
+                if response.status != 200:
+                    errors.append(response.status)
+                    continue
+        except aiohttp.ClientError:
+            errors.append(1)
+            continue
+        latencies.append(time.perf_counter() - started)
+
+
+async def run_target(label, url, connections, seconds, slow_client):
+    latencies, errors = [], []
+    connector = aiohttp.TCPConnector(limit=connections)
+    timeout = aiohttp.ClientTimeout(total=seconds + 30)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        deadline = time.perf_counter() + seconds
+        await asyncio.gather(*(
+            connection_loop(session, url, deadline, slow_client, latencies, errors, index)
+            for index in range(connections)
+        ))
+
+    p95 = statistics.quantiles(latencies, n=20)[18] * 1000 if len(latencies) >= 20 else float("nan")
+    print(
+        f"{label:<6} requests/s={len(latencies) / seconds:>9.1f} "
+        f"p50_ms={statistics.median(latencies) * 1000 if latencies else float('nan'):>8.1f} "
+        f"p95_ms={p95:>8.1f} errors={len(errors)}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", action="append", required=True, help="label=url, repeatable")
+    parser.add_argument("--connections", type=int, default=100)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--slow-client", type=float, default=0.0, help="Seconds to trickle a POST body first.")
+    args = parser.parse_args()
+
+    for target in args.target:
+        label, _, url = target.partition("=")
+        asyncio.run(run_target(label, url, args.connections, args.seconds, args.slow_client))
+
+
+if __name__ == "__main__":
+    main()
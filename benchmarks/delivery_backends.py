@@ -0,0 +1,79 @@
+"""
+Delivery throughput against the local sink, per backend.
+
+Starts an in-process DeliverySink (no database involved) and sends --messages
+notification requests through:
+
+    smtp-per-message   a new Django SMTP connection for every message, as
+                       send_mail() does when called in a loop
+    smtp-pooled        SMTPBackend: one session reused for every batch
+    http-batched       HTTPBackend: one kept-alive connection, one POST per batch
+
+Usage:
+    python benchmarks/delivery_backends.py --messages 2000 --batch-size 100
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "notifier_core.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.mail import EmailMessage, get_connection  # noqa: E402
+
+from notifier.services.backends import HTTPBackend, SMTPBackend  # noqa: E402
+from notifier.services.delivery import NotificationRequest  # noqa: E402
+from notifier.services.sink import DeliverySink  # noqa: E402
+
+SMTP_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
+
+
+def send_per_message(sink, requests):
+    for request in requests:
+        connection = get_connection(SMTP_BACKEND, host=sink.host, port=sink.smtp_port)
+        EmailMessage(request.subject, request.message, to=[request.recipient_email], connection=connection).send()
+
+
+def send_batched(backend, requests):
+    for start in range(0, len(requests), backend.batch_size):
+        backend.send_messages(requests[start : start + backend.batch_size])
+    backend.close()
+
+
+def measure(label, sink, send):
+    before = sink.stats.messages, sink.stats.connections
+    started = time.perf_counter()
+    send()
+    elapsed = time.perf_counter() - started
+    messages = sink.stats.messages - before[0]
+    connections = sink.stats.connections - before[1]
+    print(f"{label:<20} {elapsed:>8.2f} s  msgs/s={messages / elapsed:>10,.0f}  connections={connections}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+
+    requests = [
+        NotificationRequest(f"user{i}@example.com", f"Alert {i}", "Disk usage above 90%.")
+        for i in range(args.messages)
+    ]
+    with DeliverySink() as sink:
+        smtp = SMTPBackend(host=sink.host, port=sink.smtp_port, batch_size=args.batch_size)
+        http = HTTPBackend(url=sink.http_url, batch_size=args.batch_size)
+        measure("smtp-per-message", sink, lambda: send_per_message(sink, requests))
+        measure("smtp-pooled", sink, lambda: send_batched(smtp, requests))
+        measure("http-batched", sink, lambda: send_batched(http, requests))
+
+
+if __name__ == "__main__":
+    main()
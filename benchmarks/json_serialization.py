@@ -0,0 +1,122 @@
+"""
+Serializer throughput for large API list responses.
+
+Builds unsaved Document and Notification instances in memory (no database)
+and times three ways of producing the response body:
+
+    baseline   hand-written dicts + JsonResponse (stdlib json, DjangoJSONEncoder)
+    json       the API serialisers + FastJsonResponse on the stdlib backend
+    orjson     the API serialisers + FastJsonResponse on orjson (if installed)
+
+Usage:
+    python benchmarks/json_serialization.py --rows 5000 --repeat 20
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "notifier_core.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.http import JsonResponse  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+
+from notifier.models import Document, Notification  # noqa: E402
+from notifier.utils.serialization import BACKENDS, FastJsonResponse  # noqa: E402
+from notifier.views.notifications import serialise_notification  # noqa: E402
+from notifier.views.views import serialise_document  # noqa: E402
+
+
+def baseline_document(document):
+    return {
+        "title": document.title,
+        "description": document.description,
+        "uploaded_at": document.uploaded_at.isoformat().replace("+00:00", "Z"),
+    }
+
+
+def baseline_notification(notification):
+    return {
+        "id": notification.id,
+        "recipient": notification.recipient.username,
+        "subject": notification.subject,
+        "status": notification.status,
+        "priority": notification.priority,
+        "metadata": notification.metadata,
+        "created_at": notification.created_at.isoformat().replace("+00:00", "Z"),
+        "sent_at": notification.sent_at.isoformat().replace("+00:00", "Z") if notification.sent_at else None,
+    }
+
+
+def build_rows(count):
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    recipient = get_user_model()(id=1, username="ops")
+    documents = [
+        Document(id=i, title=f"Report {i}", description="Quarterly numbers " * 4, uploaded_at=start + timedelta(seconds=i))
+        for i in range(count)
+    ]
+    notifications = []
+    for i in range(count):
+        notification = Notification(
+            id=i,
+            recipient=recipient,
+            subject=f"Report {i} is ready",
+            status="sent" if i % 3 else "queued",
+            priority=i % 3,
+            metadata={"campaign": "q1", "channel": "email", "tags": ["report", str(i % 7)]},
+            sent_at=start + timedelta(seconds=i + 5) if i % 3 else None,
+        )
+        notification.created_at = start + timedelta(seconds=i)
+        notifications.append(notification)
+    return documents, notifications
+
+
+def measure(label, build_body, repeat, rows):
+    best = float("inf")
+    size = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        size = len(build_body())
+        best = min(best, time.perf_counter() - started)
+    print(f"{label:<24} best={best * 1000:>8.2f} ms  rows/s={rows / best:>12,.0f}  bytes={size:,}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    documents, notifications = build_rows(args.rows)
+    cases = [
+        ("documents", documents, baseline_document, serialise_document),
+        ("notifications", notifications, baseline_notification, serialise_notification),
+    ]
+    for name, objects, baseline, serializer in cases:
+        measure(
+            f"{name}/baseline",
+            lambda: JsonResponse({name: [baseline(obj) for obj in objects]}).content,
+            args.repeat,
+            args.rows,
+        )
+        for backend in BACKENDS:
+            with override_settings(NOTIFIER_JSON_BACKEND=backend):
+                measure(
+                    f"{name}/{backend}",
+                    lambda: FastJsonResponse({name: [serializer(obj) for obj in objects]}).content,
+                    args.repeat,
+                    args.rows,
+                )
+
+
+if __name__ == "__main__":
+    main()
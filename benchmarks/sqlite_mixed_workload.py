@@ -0,0 +1,122 @@
+"""
+Mixed read/write benchmark for the tuned SQLite backend.
+
+Runs the same workload (several writer threads inserting notifications while
+reader threads run list/count queries) against a scratch database twice: once
+with SQLite's defaults and once with the PRAGMAs from
+notifier_core/db/sqlite3/base.py.
+
+Usage:
+    python benchmarks/sqlite_mixed_workload.py --writers 4 --readers 8 --seconds 5
+"""
+
+import argparse
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from notifier_core.db.sqlite3.base import DEFAULT_PRAGMAS  # noqa: E402
+
+SCHEMA = """
+CREATE TABLE notification (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    recipient_id INTEGER NOT NULL,
+    subject TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX notification_status ON notification (status);
+"""
+
+
+def connect(path, pragmas):
+    # Both runs keep sqlite3's default 5 second timeout (as Django does), so
+    # only the PRAGMAs and the transaction mode differ between them.
+    conn = sqlite3.connect(path, isolation_level=None)
+    for name, value in pragmas.items():
+        conn.execute(f"PRAGMA {name} = {value}")
+    return conn
+
+
+def writer(path, pragmas, immediate, stop, stats, worker_id):
+    conn = connect(path, pragmas)
+    begin = "BEGIN IMMEDIATE" if immediate else "BEGIN"
+    seq = 0
+    while not stop.is_set():
+        try:
+            conn.execute(begin)
+            conn.execute(
+                "INSERT INTO notification (recipient_id, subject, status, created_at) VALUES (?, ?, ?, ?)",
+                (worker_id, f"subject-{worker_id}-{seq}", "queued", time.time()),
+            )
+            conn.execute(
+                "UPDATE notification SET status = 'sent' WHERE id = (SELECT MAX(id) FROM notification WHERE recipient_id = ?)",
+                (worker_id,),
+            )
+            conn.execute("COMMIT")
+            stats["writes"] += 1
+            seq += 1
+        except sqlite3.OperationalError:
+            stats["locked"] += 1
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+    conn.close()
+
+
+def reader(path, pragmas, stop, stats):
+    conn = connect(path, pragmas)
+    while not stop.is_set():
+        try:
+            conn.execute("SELECT status, COUNT(*) FROM notification GROUP BY status").fetchall()
+            conn.execute("SELECT * FROM notification ORDER BY id DESC LIMIT 50").fetchall()
+            stats["reads"] += 1
+        except sqlite3.OperationalError:
+            stats["locked"] += 1
+    conn.close()
+
+
+def run(label, pragmas, immediate, writers, readers, seconds):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "bench.sqlite3")
+        setup = connect(path, pragmas)
+        setup.executescript(SCHEMA)
+        setup.close()
+
+        stop = threading.Event()
+        stats = {"writes": 0, "reads": 0, "locked": 0}
+        threads = [
+            threading.Thread(target=writer, args=(path, pragmas, immediate, stop, stats, i))
+            for i in range(writers)
+        ] + [threading.Thread(target=reader, args=(path, pragmas, stop, stats)) for _ in range(readers)]
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    print(
+        f"{label:<10} writes/s={stats['writes'] / seconds:>9.1f} "
+        f"reads/s={stats['reads'] / seconds:>9.1f} "
+        f"locked_errors={stats['locked']}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    run("default", {}, False, args.writers, args.readers, args.seconds)
+    run("tuned", DEFAULT_PRAGMAS, True, args.writers, args.readers, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,77 @@
 from django.contrib import admin
-from .models import Notification
+from .models import Document, Notification, Recipient, Segment
+from .models.notifications import HOT_METADATA_KEYS
+from .services.search import search_queryset, uses_fts
+from .utils.pagination import EstimatedCountPaginator
 
 # decorator registers the NotificationAdmin class with the admin site.
 # automatically configures the admin list page and filters using the tuples.
 # renders the correct admin templates (list, change, add, delete) automatically.
 @admin.register(Notification)
 class NotificationAdmin(admin.ModelAdmin):
-    list_display = ("subject", "recipient", "status", "created_at", "sent_at")
+    list_display = ("subject", "recipient", "contact", "status", "created_at", "sent_at")
     list_filter = ("status", "created_at", "sent_at")
-    search_fields = ("subject", "recipient__username", "metadata")
+    # Join recipients in the changelist query instead of one query per row.
+    list_select_related = ("recipient", "contact")
+    # Recipients can number in the millions; don't render them as a <select>.
+    raw_id_fields = ("contact",)
+    # No date_hierarchy: its year/month links come from SELECT DISTINCT over a
+    # truncated created_at, a per-row function no index can serve. The
+    # created_at list_filter gives bounded ranges (today, past 7 days, this
+    # month, this year) that notification_created_idx answers.
+    # Large tables: no exact COUNT(*) for pagination, for the "x of y total"
+    # line, or for per-filter facet counts.
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    show_facets = admin.ShowFacets.NEVER
+    # metadata is deliberately not searchable: that is a LIKE over the whole
+    # JSON column. Hot keys are searched through their indexed columns instead.
+    search_fields = ("subject", "recipient__username")
+    search_help_text = (
+        "Full-text search of subject and message, an exact username, "
+        "or an exact key: campaign:<name>, channel:<name>, tenant:<name>."
+    )
+
+    def get_queryset(self, request):
+        # The changelist never shows these potentially large columns.
+        return super().get_queryset(request).defer("message", "metadata", "last_error")
+
+    def get_search_results(self, request, queryset, search_term):
+        key, separator, value = search_term.partition(":")
+        if separator and key.strip() in HOT_METADATA_KEYS:
+            return queryset.with_metadata(**{key.strip(): value.strip()}), False
+        if search_term and uses_fts(Notification):
+            matches = search_queryset(queryset, search_term)
+            return matches | queryset.filter(recipient__username=search_term.strip()), False
+        return super().get_search_results(request, queryset, search_term)
+
+
+@admin.register(Document)
+class DocumentAdmin(admin.ModelAdmin):
+    list_display = ("title", "filename", "size", "uploaded_at")
+    search_fields = ("title", "description")
+    readonly_fields = ("filename", "content_type", "size", "sha256")
+
+    def get_search_results(self, request, queryset, search_term):
+        # Uses the FTS5 index instead of icontains scans where available.
+        if search_term and uses_fts(Document):
+            return search_queryset(queryset, search_term), False
+        return super().get_search_results(request, queryset, search_term)
+
+
+@admin.register(Recipient)
+class RecipientAdmin(admin.ModelAdmin):
+    list_display = ("email", "first_name", "last_name", "is_active", "created_at")
+    list_filter = ("is_active",)
+    search_fields = ("email",)
+    raw_id_fields = ("user",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+@admin.register(Segment)
+class SegmentAdmin(admin.ModelAdmin):
+    list_display = ("name", "created_at")
+    search_fields = ("name",)
+    # Memberships are managed in bulk (alerts upload, add_members), not in a widget.
+    exclude = ("recipients",)
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class NotifierConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'notifier'
+
+    def ready(self):
+        # Connect the profiler's connection_created receiver before any
+        # database connection is opened.
+        from notifier.services import profiling  # noqa: F401
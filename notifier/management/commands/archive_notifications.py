@@ -0,0 +1,48 @@
+from datetime import timedelta
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from notifier.services.archival import archive_notifications, get_archive_settings, purge_archive
+
+
+class Command(BaseCommand):
+    help = (
+        "Move sent, dead-lettered and digested notifications older than the retention "
+        "window into the archive, in small committed batches. Safe to interrupt and rerun."
+    )
+
+    def add_arguments(self, parser):
+        config = get_archive_settings()
+        parser.add_argument("--days", type=int, default=config["retention_days"], help="Retention window.")
+        parser.add_argument("--batch-size", type=int, default=config["batch_size"])
+        parser.add_argument("--pause", type=float, default=config["pause"], help="Seconds between batches.")
+        parser.add_argument("--to-dir", type=Path, help="Write .jsonl.gz files here instead of the archive table.")
+        parser.add_argument("--purge-days", type=int, help="Also delete archived data older than this many days.")
+
+    def handle(self, *args, **options):
+        directory = options["to_dir"]
+        if directory is not None and not directory.is_dir():
+            raise CommandError(f"{directory} is not a directory.")
+
+        now = timezone.now()
+        batches = archive_notifications(
+            now - timedelta(days=options["days"]),
+            batch_size=options["batch_size"],
+            directory=directory,
+            pause=options["pause"],
+        )
+        archived = 0
+        for progress in batches:
+            archived = progress.archived
+            self.stdout.write(f"[ARCHIVE] {progress.archived}/{progress.total} archived (up to id {progress.last_id})")
+        self.stdout.write(self.style.SUCCESS(f"Archived {archived} notification(s)."))
+
+        if options["purge_days"] is not None:
+            rows, files = purge_archive(
+                now - timedelta(days=options["purge_days"]),
+                batch_size=options["batch_size"],
+                directory=directory,
+            )
+            self.stdout.write(self.style.SUCCESS(f"Purged {rows} archived row(s) and {files} file(s)."))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from notifier.services.storage import collect_garbage, get_files_settings
+
+
+class Command(BaseCommand):
+    help = (
+        "Remove stored document files that no document references and abandoned upload "
+        "temp files, once they are older than the grace period. Safe to run at any time."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--grace", type=float, default=get_files_settings()["gc_grace"],
+            help="Seconds an unreferenced file is kept.",
+        )
+
+    def handle(self, *args, **options):
+        stats = collect_garbage(grace=options["grace"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Removed {stats.removed} file(s) ({stats.removed_bytes} bytes) and {stats.temp_removed} temp file(s); "
+            f"kept {stats.kept}."
+        ))
@@ -0,0 +1,42 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from notifier.models.notifications import HOT_METADATA_KEYS
+from notifier.services.export import EXPORT_FORMATS, export_lines, export_queryset, parse_moment
+
+
+class Command(BaseCommand):
+    help = "Stream notifications as CSV or NDJSON to a file or stdout, in constant memory."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=sorted(EXPORT_FORMATS), default="csv")
+        parser.add_argument("--status")
+        parser.add_argument("--since", help="ISO date or datetime; created_at lower bound.")
+        parser.add_argument("--until", help="ISO date or datetime; created_at upper bound (exclusive).")
+        for key in HOT_METADATA_KEYS:
+            parser.add_argument(f"--{key}")
+        parser.add_argument("--output", "-o", help="File to write; defaults to stdout.")
+
+    def handle(self, *args, **options):
+        bounds = {}
+        for name in ("since", "until"):
+            if options[name]:
+                bounds[name] = parse_moment(options[name])
+                if bounds[name] is None:
+                    raise CommandError(f"--{name} must be an ISO 8601 date or datetime.")
+
+        notifications = export_queryset(
+            status=options["status"],
+            **bounds,
+            **{key: options[key] for key in HOT_METADATA_KEYS if options[key]},
+        )
+        output = open(options["output"], "wb") if options["output"] else sys.stdout.buffer
+        try:
+            for chunk in export_lines(notifications, options["format"]):
+                output.write(chunk)
+        finally:
+            if options["output"]:
+                output.close()
+            else:
+                output.flush()
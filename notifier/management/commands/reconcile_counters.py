@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from notifier.services.counters import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = "Recount notifications per status and correct the dashboard counters."
+
+    def handle(self, *args, **options):
+        drift = reconcile_counters()
+        if not drift:
+            self.stdout.write(self.style.SUCCESS("Counters match the notifications table."))
+            return
+        for status, delta in sorted(drift.items()):
+            self.stdout.write(self.style.WARNING(f"{status}: corrected by {delta:+d}"))
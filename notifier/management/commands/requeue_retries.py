@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from notifier.services.retries import requeue_due_retries
+
+
+class Command(BaseCommand):
+    help = "Move failed notifications whose backoff has elapsed back to the queue."
+
+    def handle(self, *args, **options):
+        count = requeue_due_retries()
+        self.stdout.write(self.style.SUCCESS(f"Requeued {count} notification(s)."))
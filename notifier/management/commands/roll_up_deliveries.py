@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from notifier.services.rollups import roll_up_deliveries
+
+
+class Command(BaseCommand):
+    help = "Update the per-minute and per-hour delivery rollups from new notifications."
+
+    def handle(self, *args, **options):
+        count = roll_up_deliveries()
+        self.stdout.write(self.style.SUCCESS(f"Rolled up {count} minute(s)."))
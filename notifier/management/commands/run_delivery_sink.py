@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from notifier.services.sink import DeliverySink
+
+
+class Command(BaseCommand):
+    help = "Run a local SMTP and HTTP sink that accepts and counts deliveries."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--smtp-port", type=int, default=8025)
+        parser.add_argument("--http-port", type=int, default=8026)
+        parser.add_argument("--reject", action="append", default=[], help="Address to refuse (repeatable).")
+        parser.add_argument("--report-every", type=float, default=5.0, help="Seconds between counter reports.")
+
+    def handle(self, *args, **options):
+        sink = DeliverySink(
+            host=options["host"],
+            smtp_port=options["smtp_port"],
+            http_port=options["http_port"],
+            reject=options["reject"],
+        )
+        with sink:
+            self.stdout.write(f"[SINK] smtp://{sink.host}:{sink.smtp_port} and {sink.http_url}")
+            try:
+                while True:
+                    time.sleep(options["report_every"])
+                    stats = sink.stats
+                    self.stdout.write(
+                        f"[SINK] {stats.messages} message(s), {stats.rejected} rejected, "
+                        f"{stats.connections} connection(s)"
+                    )
+            except KeyboardInterrupt:
+                pass
@@ -0,0 +1,117 @@
+import multiprocessing
+import os
+import signal
+import socket
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from notifier.services.backends import get_backend
+from notifier.services.circuit_breaker import get_circuit_breaker
+from notifier.services.counters import reconcile_counters
+from notifier.services.digests import DigestConflict, coalesce_digests, get_digest_settings
+from notifier.services.queue import claim_batch, process_claim
+from notifier.services.rate_limiting import get_send_rate_limiter, prune_rate_buckets
+from notifier.services.retries import requeue_due_retries
+from notifier.services.rollups import roll_up_deliveries
+from notifier.services.shared_cache import get_shared_cache
+
+RECONCILE_KEY = "notifier.reconcile"
+ROLLUP_KEY = "notifier.rollup"
+PRUNE_KEY = "notifier.rate_bucket_prune"
+
+
+class Command(BaseCommand):
+    help = "Claim queued notifications in leased batches and deliver them."
+
+    def add_arguments(self, parser):
+        config = settings.NOTIFIER_WORKER
+        parser.add_argument("--batch-size", type=int, default=config["batch_size"])
+        parser.add_argument("--lease-seconds", type=int, default=config["lease_seconds"])
+        parser.add_argument("--poll-interval", type=float, default=config["poll_interval"])
+        parser.add_argument(
+            "--provider", default=config["provider"], help="Delivery backend from NOTIFIER_DELIVERY_BACKENDS."
+        )
+        parser.add_argument("--processes", type=int, default=1, help="Worker processes to fork.")
+        parser.add_argument("--once", action="store_true", help="Process one batch and exit.")
+
+    def handle(self, *args, **options):
+        if options["processes"] <= 1:
+            self.run(options)
+            return
+
+        # Children must not inherit the parent's open database connections.
+        connections.close_all()
+        context = multiprocessing.get_context("fork")
+        children = [context.Process(target=self.run, args=(options,)) for _ in range(options["processes"])]
+        for child in children:
+            child.start()
+        try:
+            for child in children:
+                child.join()
+        except KeyboardInterrupt:
+            for child in children:
+                child.terminate()
+
+    def run(self, options):
+        config = settings.NOTIFIER_WORKER
+        worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        provider = options["provider"]
+        backend = get_backend(provider)
+        limiter = get_send_rate_limiter()
+        breaker = get_circuit_breaker()
+        digests_enabled = get_digest_settings()["enabled"]
+        reconciled_at = rolled_up_at = pruned_at = time.monotonic()
+        stopping = False
+
+        def stop(signum, frame):
+            nonlocal stopping
+            stopping = True
+
+        signal.signal(signal.SIGTERM, stop)
+        self.stdout.write(f"[WORKER] {worker_id} started ({provider}: {type(backend).__name__})")
+
+        while not stopping:
+            requeue_due_retries()
+            if digests_enabled:
+                try:
+                    coalesce_digests()
+                except DigestConflict:
+                    # Another worker merged the same rows; retry next loop.
+                    pass
+            if time.monotonic() - reconciled_at >= config["reconcile_interval"]:
+                # One worker per interval, across forks and hosts, runs the recount.
+                if get_shared_cache().add(RECONCILE_KEY, worker_id, timeout=config["reconcile_interval"]):
+                    drift = reconcile_counters()
+                    if drift:
+                        self.stdout.write(f"[WORKER] {worker_id} corrected status counters {drift}")
+                reconciled_at = time.monotonic()
+            if time.monotonic() - rolled_up_at >= config["rollup_interval"]:
+                # Same leader check as the recount: one rollup run per interval.
+                if get_shared_cache().add(ROLLUP_KEY, worker_id, timeout=config["rollup_interval"]):
+                    roll_up_deliveries()
+                rolled_up_at = time.monotonic()
+            if limiter and time.monotonic() - pruned_at >= config["rate_bucket_prune_interval"]:
+                if get_shared_cache().add(PRUNE_KEY, worker_id, timeout=config["rate_bucket_prune_interval"]):
+                    prune_rate_buckets()
+                pruned_at = time.monotonic()
+            claim = claim_batch(
+                worker_id,
+                options["batch_size"],
+                options["lease_seconds"],
+                lane_min_share=config["lane_min_share"],
+            )
+            if claim.notifications:
+                outcomes = process_claim(
+                    claim, backend, provider=provider, limiter=limiter, breaker=breaker
+                )
+                self.stdout.write(f"[WORKER] {worker_id} {outcomes}")
+            if options["once"]:
+                break
+            if not claim.notifications:
+                time.sleep(options["poll_interval"])
+
+        backend.close()
+        self.stdout.write(f"[WORKER] {worker_id} stopped")
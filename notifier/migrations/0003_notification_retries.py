@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:51
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifier", "0002_notification"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notification",
+            name="attempts",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="notification",
+            name="last_error",
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name="notification",
+            name="next_attempt_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name="notification",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("draft", "Draft"),
+                    ("queued", "Queued"),
+                    ("sent", "Sent"),
+                    ("failed", "Failed"),
+                    ("dead", "Dead letter"),
+                ],
+                default="queued",
+                max_length=20,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                condition=models.Q(("status", "failed")),
+                fields=["status", "next_attempt_at"],
+                name="notification_retry_due_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:53
+
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_send_at(apps, schema_editor):
+    # Existing rows were due as soon as they were created.
+    Notification = apps.get_model("notifier", "Notification")
+    Notification.objects.update(send_at=models.F("created_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifier", "0004_notification_worker_lease"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="notification",
+            name="notification_claim_idx",
+        ),
+        migrations.AddField(
+            model_name="notification",
+            name="priority",
+            field=models.PositiveSmallIntegerField(
+                choices=[(0, "High"), (1, "Normal"), (2, "Bulk")], default=1
+            ),
+        ),
+        migrations.AddField(
+            model_name="notification",
+            name="send_at",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(backfill_send_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                condition=models.Q(("status", "queued")),
+                fields=["status", "priority", "send_at"],
+                name="notification_lane_idx",
+            ),
+        ),
+    ]
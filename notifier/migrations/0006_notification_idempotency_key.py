@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifier", "0005_notification_scheduling"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notification",
+            name="idempotency_key",
+            field=models.CharField(blank=True, max_length=64, null=True, unique=True),
+        ),
+    ]
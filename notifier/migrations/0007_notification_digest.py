@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifier", "0006_notification_idempotency_key"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notification",
+            name="digest",
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AlterField(
+            model_name="notification",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("draft", "Draft"),
+                    ("queued", "Queued"),
+                    ("sent", "Sent"),
+                    ("failed", "Failed"),
+                    ("dead", "Dead letter"),
+                    ("digested", "Merged into digest"),
+                ],
+                default="queued",
+                max_length=20,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                condition=models.Q(("digest", True), ("status", "queued")),
+                fields=["send_at", "recipient"],
+                name="notification_digest_idx",
+            ),
+        ),
+    ]
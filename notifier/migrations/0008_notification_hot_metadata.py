@@ -0,0 +1,61 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:56
+
+import django.db.models.fields.json
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifier", "0007_notification_digest"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notification",
+            name="campaign",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.fields.json.KeyTextTransform(
+                    "campaign", "metadata"
+                ),
+                output_field=models.CharField(max_length=100, null=True),
+            ),
+        ),
+        migrations.AddField(
+            model_name="notification",
+            name="channel",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.fields.json.KeyTextTransform(
+                    "channel", "metadata"
+                ),
+                output_field=models.CharField(max_length=100, null=True),
+            ),
+        ),
+        migrations.AddField(
+            model_name="notification",
+            name="tenant",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.fields.json.KeyTextTransform(
+                    "tenant", "metadata"
+                ),
+                output_field=models.CharField(max_length=100, null=True),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(fields=["campaign"], name="notification_campaign_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(fields=["channel"], name="notification_channel_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(fields=["tenant"], name="notification_tenant_idx"),
+        ),
+    ]
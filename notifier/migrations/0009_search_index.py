@@ -0,0 +1,62 @@
+from django.db import migrations
+
+# External-content FTS5 tables: the index stores only tokens and points back
+# at the real rows by rowid. Triggers keep it in sync on insert/update/delete.
+FTS_TABLES = {
+    "notifier_document": ("title", "description"),
+    "notifier_notification": ("subject", "message"),
+}
+
+
+def create_statements(table, columns):
+    fts = f"{table}_fts"
+    cols = ", ".join(columns)
+    new_cols = ", ".join(f"new.{column}" for column in columns)
+    old_cols = ", ".join(f"old.{column}" for column in columns)
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({cols}, content='{table}', content_rowid='id')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_cols}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_cols}); "
+        f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new_cols}); END",
+        # Index rows that already exist.
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+
+
+def drop_statements(table):
+    fts = f"{table}_fts"
+    return [f"DROP TRIGGER IF EXISTS {fts}_{suffix}" for suffix in ("ai", "ad", "au")] + [
+        f"DROP TABLE IF EXISTS {fts}"
+    ]
+
+
+def create_search_index(apps, schema_editor):
+    # FTS5 is SQLite-only; other databases fall back to icontains searches.
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for table, columns in FTS_TABLES.items():
+        for statement in create_statements(table, columns):
+            schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for table in FTS_TABLES:
+        for statement in drop_statements(table):
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifier", "0008_notification_hot_metadata"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
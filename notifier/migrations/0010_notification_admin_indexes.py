@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifier", "0009_search_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(fields=["created_at"], name="notification_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                fields=["status", "created_at"], name="notification_status_time_idx"
+            ),
+        ),
+    ]
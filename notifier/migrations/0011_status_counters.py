@@ -0,0 +1,105 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:03
+
+from django.db import migrations, models
+from django.db.models import Count
+
+# Keep notifier_statuscounter in step with notifier_notification inside the
+# writing statement itself, so bulk inserts and queryset.update() count too.
+SQLITE_TRIGGERS = [
+    "CREATE TRIGGER IF NOT EXISTS notifier_statuscounter_ai AFTER INSERT ON notifier_notification BEGIN "
+    "INSERT INTO notifier_statuscounter(status, count) VALUES (new.status, 1) "
+    "ON CONFLICT(status) DO UPDATE SET count = count + 1; END",
+    "CREATE TRIGGER IF NOT EXISTS notifier_statuscounter_ad AFTER DELETE ON notifier_notification BEGIN "
+    "UPDATE notifier_statuscounter SET count = count - 1 WHERE status = old.status; END",
+    "CREATE TRIGGER IF NOT EXISTS notifier_statuscounter_au AFTER UPDATE OF status ON notifier_notification "
+    "WHEN old.status IS NOT new.status BEGIN "
+    "UPDATE notifier_statuscounter SET count = count - 1 WHERE status = old.status; "
+    "INSERT INTO notifier_statuscounter(status, count) VALUES (new.status, 1) "
+    "ON CONFLICT(status) DO UPDATE SET count = count + 1; END",
+]
+
+# PostgreSQL: statement-level triggers with transition tables apply one
+# aggregated delta per status per statement instead of one write per row.
+POSTGRES_APPLY = """
+    INSERT INTO notifier_statuscounter AS counter (status, count)
+    SELECT status, SUM(delta) FROM ({rows}) AS deltas GROUP BY status HAVING SUM(delta) <> 0
+    ON CONFLICT (status) DO UPDATE SET count = counter.count + EXCLUDED.count;
+"""
+POSTGRES_ROWS = {
+    "insert": "SELECT status, 1 AS delta FROM new_rows",
+    "delete": "SELECT status, -1 AS delta FROM old_rows",
+    "update": "SELECT status, 1 AS delta FROM new_rows UNION ALL SELECT status, -1 FROM old_rows",
+}
+POSTGRES_REFERENCING = {
+    "insert": "NEW TABLE AS new_rows",
+    "delete": "OLD TABLE AS old_rows",
+    "update": "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+}
+
+
+def postgres_statements():
+    statements = []
+    for operation, rows in POSTGRES_ROWS.items():
+        function = f"notifier_statuscounter_{operation}"
+        statements += [
+            f"CREATE OR REPLACE FUNCTION {function}() RETURNS trigger AS $$ BEGIN "
+            f"{POSTGRES_APPLY.format(rows=rows)} RETURN NULL; END $$ LANGUAGE plpgsql",
+            f"CREATE TRIGGER {function} AFTER {operation.upper()} ON notifier_notification "
+            f"REFERENCING {POSTGRES_REFERENCING[operation]} FOR EACH STATEMENT EXECUTE FUNCTION {function}()",
+        ]
+    return statements
+
+
+def create_counter_triggers(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        statements = SQLITE_TRIGGERS
+    elif vendor == "postgresql":
+        statements = postgres_statements()
+    else:
+        # Elsewhere the counters are only as fresh as the last reconcile.
+        statements = []
+    for statement in statements:
+        schema_editor.execute(statement)
+
+    # Seed from the existing rows; every status gets a row so reconcile can lock them all.
+    Notification = apps.get_model("notifier", "Notification")
+    StatusCounter = apps.get_model("notifier", "StatusCounter")
+    totals = dict(Notification.objects.values_list("status").annotate(total=Count("id")).order_by())
+    statuses = [status for status, _ in Notification._meta.get_field("status").choices]
+    StatusCounter.objects.bulk_create(
+        StatusCounter(status=status, count=totals.get(status, 0)) for status in {*statuses, *totals}
+    )
+
+
+def drop_counter_triggers(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for operation in ("ai", "ad", "au") if vendor == "sqlite" else ():
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS notifier_statuscounter_{operation}")
+    for operation in POSTGRES_ROWS if vendor == "postgresql" else ():
+        function = f"notifier_statuscounter_{operation}"
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS {function} ON notifier_notification")
+        schema_editor.execute(f"DROP FUNCTION IF EXISTS {function}()")
+
+
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifier", "0010_notification_admin_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StatusCounter",
+            fields=[
+                (
+                    "status",
+                    models.CharField(max_length=20, primary_key=True, serialize=False),
+                ),
+                ("count", models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(create_counter_triggers, drop_counter_triggers),
+    ]
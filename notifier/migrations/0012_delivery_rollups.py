@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifier", "0011_status_counters"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DeliveryRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "granularity",
+                    models.CharField(
+                        choices=[("minute", "Minute"), ("hour", "Hour")], max_length=6
+                    ),
+                ),
+                ("bucket", models.DateTimeField()),
+                ("sent", models.PositiveIntegerField(default=0)),
+                ("failed", models.PositiveIntegerField(default=0)),
+                ("latency_histogram", models.JSONField(default=list)),
+                ("latency_p50", models.FloatField(null=True)),
+                ("latency_p95", models.FloatField(null=True)),
+                ("latency_p99", models.FloatField(null=True)),
+            ],
+            options={
+                "ordering": ["granularity", "bucket"],
+            },
+        ),
+        migrations.AddField(
+            model_name="notification",
+            name="last_failed_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(fields=["sent_at"], name="notification_sent_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                fields=["last_failed_at"], name="notification_failed_at_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="deliveryrollup",
+            constraint=models.UniqueConstraint(
+                fields=("granularity", "bucket"), name="unique_rollup_bucket"
+            ),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:07
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifier", "0012_delivery_rollups"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedNotification",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("recipient_id", models.BigIntegerField()),
+                ("document_id", models.BigIntegerField(null=True)),
+                ("subject", models.CharField(max_length=200)),
+                ("message", models.TextField()),
+                ("status", models.CharField(max_length=20)),
+                ("metadata", models.JSONField(default=dict)),
+                ("priority", models.PositiveSmallIntegerField()),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                ("last_error", models.TextField(blank=True)),
+                ("created_at", models.DateTimeField()),
+                ("sent_at", models.DateTimeField(null=True)),
+                (
+                    "archived_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["archived_at"], name="archived_notification_at_idx"
+                    ),
+                    models.Index(
+                        fields=["recipient_id", "created_at"],
+                        name="archived_recipient_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
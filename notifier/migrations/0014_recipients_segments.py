@@ -0,0 +1,176 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:13
+
+from importlib import import_module
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# Altering notifier_notification on SQLite rebuilds the table, which drops the
+# triggers from 0009 (full-text index) and 0011 (status counters). Both are
+# put back once the rebuilds are done, in either direction.
+search_index = import_module("notifier.migrations.0009_search_index")
+status_counters = import_module("notifier.migrations.0011_status_counters")
+
+
+def restore_notification_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    fts_statements = search_index.create_statements(
+        "notifier_notification", search_index.FTS_TABLES["notifier_notification"]
+    )
+    # The index content survives the rebuild (ids are kept), so skip its final 'rebuild'.
+    for statement in fts_statements[:-1] + status_counters.SQLITE_TRIGGERS:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifier", "0013_notification_archive"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, restore_notification_triggers),
+        migrations.CreateModel(
+            name="Segment",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100, unique=True)),
+                ("description", models.TextField(blank=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="SegmentMembership",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("added_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name="notification",
+            name="recipient",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="notifications",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.CreateModel(
+            name="Recipient",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("email", models.EmailField(max_length=254, unique=True)),
+                ("first_name", models.CharField(blank=True, max_length=150)),
+                ("last_name", models.CharField(blank=True, max_length=150)),
+                ("is_active", models.BooleanField(default=True)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "user",
+                    models.OneToOneField(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="contact",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="notification",
+            name="contact",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="notifications",
+                to="notifier.recipient",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="notification",
+            constraint=models.UniqueConstraint(
+                fields=("contact", "subject"), name="unique_notification_per_contact"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="notification",
+            constraint=models.CheckConstraint(
+                condition=models.Q(
+                    ("recipient__isnull", False),
+                    ("contact__isnull", False),
+                    _connector="OR",
+                ),
+                name="notification_has_recipient",
+            ),
+        ),
+        migrations.AddField(
+            model_name="segmentmembership",
+            name="recipient",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="notifier.recipient",
+            ),
+        ),
+        migrations.AddField(
+            model_name="segmentmembership",
+            name="segment",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="notifier.segment",
+            ),
+        ),
+        migrations.AddField(
+            model_name="segment",
+            name="recipients",
+            field=models.ManyToManyField(
+                related_name="segments",
+                through="notifier.SegmentMembership",
+                to="notifier.recipient",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="segmentmembership",
+            index=models.Index(
+                fields=["recipient", "segment"], name="membership_recipient_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="segmentmembership",
+            constraint=models.UniqueConstraint(
+                fields=("segment", "recipient"), name="unique_segment_member"
+            ),
+        ),
+        migrations.RunPython(restore_notification_triggers, migrations.RunPython.noop),
+    ]
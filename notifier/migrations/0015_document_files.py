@@ -0,0 +1,61 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:28
+
+from importlib import import_module
+
+import notifier.services.storage
+from django.db import migrations, models
+
+# Adding NOT NULL columns to notifier_document on SQLite rebuilds the table,
+# which drops its full-text index triggers from 0009. They are put back once
+# the rebuilds are done, in either direction.
+search_index = import_module("notifier.migrations.0009_search_index")
+
+
+def restore_document_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    statements = search_index.create_statements("notifier_document", search_index.FTS_TABLES["notifier_document"])
+    # The index content survives the rebuild (ids are kept), so skip its final 'rebuild'.
+    for statement in statements[:-1]:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifier", "0014_recipients_segments"),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, restore_document_triggers),
+        migrations.AddField(
+            model_name="document",
+            name="content_type",
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name="document",
+            name="file",
+            field=models.FileField(
+                blank=True,
+                storage=notifier.services.storage.get_document_storage,
+                upload_to="",
+            ),
+        ),
+        migrations.AddField(
+            model_name="document",
+            name="filename",
+            field=models.CharField(blank=True, max_length=255),
+        ),
+        migrations.AddField(
+            model_name="document",
+            name="sha256",
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+        migrations.AddField(
+            model_name="document",
+            name="size",
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.RunPython(restore_document_triggers, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifier", "0015_document_files"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="archivednotification",
+            name="contact_id",
+            field=models.BigIntegerField(null=True),
+        ),
+        migrations.AlterField(
+            model_name="archivednotification",
+            name="recipient_id",
+            field=models.BigIntegerField(null=True),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:05
+
+from django.core.management import call_command
+from django.db import migrations
+
+
+def create_cache_tables(apps, schema_editor):
+    # Tables for the DatabaseCache entries in settings.CACHES (the 'shared'
+    # cache); existing tables are left alone.
+    call_command("createcachetable", database=schema_editor.connection.alias, verbosity=0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifier", "0017_status_events"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_cache_tables, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-19 14:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("notifier", "0018_shared_cache_table"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RateBucket",
+            fields=[
+                (
+                    "name",
+                    models.CharField(max_length=64, primary_key=True, serialize=False),
+                ),
+                ("tokens", models.FloatField()),
+                ("updated_at", models.FloatField()),
+                ("full_at", models.FloatField(db_index=True)),
+            ],
+        ),
+    ]
@@ -1,2 +1,8 @@
 from .document import Document  # existing model
-from .notifications import Notification  # re-export so Django can auto-discover the new model
\ No newline at end of file
+from .recipients import Recipient, Segment, SegmentMembership
+from .notifications import Notification  # re-export so Django can auto-discover the new model
+from .counters import StatusCounter
+from .rollups import DeliveryRollup
+from .archive import ArchivedNotification
+from .events import StatusEvent
+from .rate_limits import RateBucket
@@ -0,0 +1,35 @@
+from django.db import models
+from django.utils import timezone
+
+
+class ArchivedNotification(models.Model):
+    """A delivered or dead-lettered notification moved out of the hot table.
+
+    Written by notifier/services/archival.py. The primary key is the original
+    notification id, and related rows are referenced by id only, so archived
+    history never blocks deleting a user or document.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    # Either a user or a Recipient contact, as on Notification.
+    recipient_id = models.BigIntegerField(null=True)
+    contact_id = models.BigIntegerField(null=True)
+    document_id = models.BigIntegerField(null=True)
+    subject = models.CharField(max_length=200)
+    message = models.TextField()
+    status = models.CharField(max_length=20)
+    metadata = models.JSONField(default=dict)
+    priority = models.PositiveSmallIntegerField()
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField()
+    sent_at = models.DateTimeField(null=True)
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["archived_at"], name="archived_notification_at_idx"),
+            models.Index(fields=["recipient_id", "created_at"], name="archived_recipient_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.subject} (archived)"
@@ -0,0 +1,24 @@
+from django.db import models
+
+
+class StatusCounterQuerySet(models.QuerySet):
+    def totals(self) -> dict:
+        """Notification count per status, read from a handful of counter rows."""
+        return dict(self.values_list("status", "count"))
+
+
+class StatusCounter(models.Model):
+    """Running number of notifications in each status.
+
+    Database triggers (migration 0011) adjust these rows in the same statement
+    as every insert, delete and status change on notifier_notification, so
+    bulk_create() and queryset.update() are covered too.
+    notifier/services/counters.py reconciles them against a real COUNT.
+    """
+    status = models.CharField(max_length=20, primary_key=True)
+    count = models.BigIntegerField(default=0)
+
+    objects = StatusCounterQuerySet.as_manager()
+
+    def __str__(self) -> str:
+        return f"{self.status}: {self.count}"
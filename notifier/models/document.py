@@ -1,11 +1,44 @@
+import mimetypes
+import posixpath
+
 from django.conf import settings
 from django.db import models
 
+from notifier.services.storage import get_document_storage
+
+
 class Document(models.Model):
     """Represents a file uploaded to the notifier application."""
     title = models.CharField(max_length=255)
     description = models.TextField(blank=True)
     uploaded_at = models.DateTimeField(auto_now_add=True)
+    # Stored by content (notifier/services/storage.py); documents with the
+    # same bytes share one file, keyed by sha256. Files no document references
+    # are removed later by the collect_document_files command.
+    file = models.FileField(storage=get_document_storage, max_length=100, blank=True)
+    filename = models.CharField(max_length=255, blank=True)
+    content_type = models.CharField(max_length=255, blank=True)
+    size = models.BigIntegerField(null=True, blank=True)
+    sha256 = models.CharField(max_length=64, blank=True, db_index=True)
 
     def __str__(self) -> str:
         return self.title
+
+    def save(self, *args, **kwargs):
+        # A newly assigned file (admin form, Document(file=ContentFile(...)))
+        # is stored first so its hash and size can be saved with the row.
+        # ContentAddressedUploadHandler uploads arrive already stored.
+        if self.file and not self.file._committed:
+            content = self.file.file
+            self.filename = self.filename or posixpath.basename(self.file.name)
+            self.content_type = (
+                self.content_type
+                or getattr(content, "content_type", None)
+                or mimetypes.guess_type(self.filename)[0]
+                or "application/octet-stream"
+            )
+            self.file.save(self.file.name, content, save=False)
+            self.size = self.file.size
+            self.sha256 = posixpath.basename(self.file.name)
+        super().save(*args, **kwargs)
+
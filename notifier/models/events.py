@@ -0,0 +1,18 @@
+from django.db import models
+
+
+class StatusEvent(models.Model):
+    """One status change for the live notification stream.
+
+    Written by notifier/services/events.py in the transaction that makes the
+    change, by whichever process makes it (web or run_worker), and read by
+    the stream views in any process. The id is the stream's event id, so it
+    stays unique and increasing across processes and restarts. Old rows are
+    pruned as new ones arrive.
+    """
+    type = models.CharField(max_length=10)  # "status" for one notification, "counts" for bulk transitions
+    data = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return f"#{self.id} {self.type}"
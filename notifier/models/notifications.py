@@ -1,15 +1,48 @@
 from django.conf import settings
 from django.db import models
+from django.db.models.fields.json import KT
 from notifier.models import Document
+from notifier.models.recipients import Recipient
 from django.utils import timezone
 
 
+# Metadata keys promoted to indexed columns on Notification. Each one is a
+# generated column computed by the database from the JSON, so it stays in sync
+# on every write path, including bulk_create() and queryset.update().
+HOT_METADATA_KEYS = ("campaign", "channel", "tenant")
+
+
+class NotificationQuerySet(models.QuerySet):
+    def with_metadata(self, **lookups):
+        """Filters on metadata keys, using the indexed column for hot keys."""
+        filters = {}
+        for key, value in lookups.items():
+            column = key if key in HOT_METADATA_KEYS else f"metadata__{key}"
+            filters[column] = value
+        return self.filter(**filters)
+
+
 class Notification(models.Model):
     """Stores notifications queued or sent to a user."""
+    # Priority lanes; workers drain lower numbers first.
+    PRIORITY_HIGH = 0
+    PRIORITY_NORMAL = 1
+    PRIORITY_BULK = 2
+
+    # Addressed to a user, or to a Recipient contact (segment fan-out).
     recipient = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
         related_name="notifications",
+        null=True,
+        blank=True,
+    )
+    contact = models.ForeignKey(
+        Recipient,
+        on_delete=models.CASCADE,
+        related_name="notifications",
+        null=True,
+        blank=True,
     )
     document = models.ForeignKey(
         Document,
@@ -22,22 +55,115 @@ class Notification(models.Model):
     message = models.TextField()
     status = models.CharField(
         max_length=20,
-        choices=[("draft", "Draft"), ("queued", "Queued"), ("sent", "Sent"), ("failed", "Failed")],
+        choices=[
+            ("draft", "Draft"),
+            ("queued", "Queued"),
+            ("sent", "Sent"),
+            ("failed", "Failed"),
+            ("dead", "Dead letter"),
+            ("digested", "Merged into digest"),
+        ],
         default="queued",
     )
     metadata = models.JSONField(default=dict, blank=True)
+    campaign = models.GeneratedField(
+        expression=KT("metadata__campaign"),
+        output_field=models.CharField(max_length=100, null=True),
+        db_persist=True,
+    )
+    channel = models.GeneratedField(
+        expression=KT("metadata__channel"),
+        output_field=models.CharField(max_length=100, null=True),
+        db_persist=True,
+    )
+    tenant = models.GeneratedField(
+        expression=KT("metadata__tenant"),
+        output_field=models.CharField(max_length=100, null=True),
+        db_persist=True,
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     sent_at = models.DateTimeField(null=True, blank=True)
 
+    # Buffered for notifier/services/digests.py to merge per recipient.
+    digest = models.BooleanField(default=False)
+
+    # Set by notifier/services/fanout.py so a retried fan-out inserts nothing twice.
+    idempotency_key = models.CharField(max_length=64, unique=True, null=True, blank=True)
+
+    # Scheduling: a queued notification is not delivered before send_at.
+    send_at = models.DateTimeField(default=timezone.now)
+    priority = models.PositiveSmallIntegerField(
+        choices=[(PRIORITY_HIGH, "High"), (PRIORITY_NORMAL, "Normal"), (PRIORITY_BULK, "Bulk")],
+        default=PRIORITY_NORMAL,
+    )
+
+    # Retry bookkeeping, maintained by notifier/services/retries.py
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+    last_failed_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    # Worker lease, maintained by notifier/services/queue.py. A queued row with
+    # an unexpired lease belongs to the worker named in claimed_by.
+    claimed_by = models.CharField(max_length=100, blank=True)
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
+
+    objects = NotificationQuerySet.as_manager()
+
     class Meta:
         constraints = [
             models.UniqueConstraint(
                 fields=["recipient", "subject"],
                 name="unique_notification_subject_per_user",
-            )
+            ),
+            models.UniqueConstraint(
+                fields=["contact", "subject"],
+                name="unique_notification_per_contact",
+            ),
+            models.CheckConstraint(
+                condition=models.Q(recipient__isnull=False) | models.Q(contact__isnull=False),
+                name="notification_has_recipient",
+            ),
+        ]
+        indexes = [
+            # Only failed rows awaiting a retry are indexed, so the scheduler's
+            # "due now" lookup is a short range scan instead of a table scan.
+            models.Index(
+                fields=["status", "next_attempt_at"],
+                name="notification_retry_due_idx",
+                condition=models.Q(status="failed"),
+            ),
+            # One range scan per lane: queued rows of a priority, due by send_at.
+            models.Index(
+                fields=["status", "priority", "send_at"],
+                name="notification_lane_idx",
+                condition=models.Q(status="queued"),
+            ),
+            models.Index(
+                fields=["send_at", "recipient"],
+                name="notification_digest_idx",
+                condition=models.Q(status="queued", digest=True),
+            ),
+            # Default ordering, the admin created_at range filter, and status filter + ordering.
+            models.Index(fields=["created_at"], name="notification_created_idx"),
+            models.Index(fields=["status", "created_at"], name="notification_status_time_idx"),
+            # Time-range scans for notifier/services/rollups.py.
+            models.Index(fields=["sent_at"], name="notification_sent_idx"),
+            models.Index(fields=["last_failed_at"], name="notification_failed_at_idx"),
+            models.Index(fields=["campaign"], name="notification_campaign_idx"),
+            models.Index(fields=["channel"], name="notification_channel_idx"),
+            models.Index(fields=["tenant"], name="notification_tenant_idx"),
         ]
         ordering = ["-created_at"]
 
+    @property
+    def delivery_email(self) -> str:
+        return self.contact.email if self.contact_id else self.recipient.email
+
+    @property
+    def recipient_name(self) -> str:
+        return self.contact.email if self.contact_id else self.recipient.username
+
     def mark_as_sent(self, timestamp=None):
         self.status = "sent"
         self.sent_at = timestamp or timezone.now()
@@ -0,0 +1,18 @@
+from django.db import models
+
+
+class RateBucket(models.Model):
+    """Token bucket state for notifier/services/rate_limiting.py.
+
+    One row per provider or recipient bucket, refilled and spent by a single
+    conditional upsert. Once full_at has passed the bucket is full again,
+    which is the same as having no row, so prune_rate_buckets() deletes it.
+    Times are time.time() seconds, as passed to SendRateLimiter.acquire().
+    """
+    name = models.CharField(max_length=64, primary_key=True)
+    tokens = models.FloatField()
+    updated_at = models.FloatField()
+    full_at = models.FloatField(db_index=True)
+
+    def __str__(self) -> str:
+        return f"{self.name}: {self.tokens:.2f}"
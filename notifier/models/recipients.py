@@ -0,0 +1,56 @@
+from django.conf import settings
+from django.db import models
+
+
+class Recipient(models.Model):
+    """A contact that can be notified without having a login.
+
+    Filled from alerts uploads. user links the contact to an account when
+    there is one; notifications for a segment address the Recipient directly.
+    """
+    email = models.EmailField(unique=True)
+    first_name = models.CharField(max_length=150, blank=True)
+    last_name = models.CharField(max_length=150, blank=True)
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        related_name="contact",
+        null=True,
+        blank=True,
+    )
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return self.email
+
+
+class Segment(models.Model):
+    """A named set of recipients that notifications can target at once."""
+    name = models.CharField(max_length=100, unique=True)
+    description = models.TextField(blank=True)
+    recipients = models.ManyToManyField(Recipient, through="SegmentMembership", related_name="segments")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class SegmentMembership(models.Model):
+    # The two composite indexes cover both foreign keys, so the per-column
+    # FK indexes are left out: (segment, recipient) is the fan-out scan and
+    # (recipient, segment) serves "segments of a recipient" and cascades.
+    segment = models.ForeignKey(Segment, on_delete=models.CASCADE, db_index=False)
+    recipient = models.ForeignKey(Recipient, on_delete=models.CASCADE, db_index=False)
+    added_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["segment", "recipient"], name="unique_segment_member"),
+        ]
+        indexes = [
+            models.Index(fields=["recipient", "segment"], name="membership_recipient_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.recipient} in {self.segment}"
@@ -0,0 +1,31 @@
+from django.db import models
+
+
+class DeliveryRollup(models.Model):
+    """Delivery totals and latency distribution for one minute or one hour.
+
+    Maintained by notifier/services/rollups.py. Latency is sent_at - created_at.
+    It is kept as a fixed-bucket histogram so minute rows can be summed into
+    hour rows without rereading notifications. The percentiles are derived
+    from the histogram when the row is written.
+    """
+    MINUTE = "minute"
+    HOUR = "hour"
+
+    granularity = models.CharField(max_length=6, choices=[(MINUTE, "Minute"), (HOUR, "Hour")])
+    bucket = models.DateTimeField()
+    sent = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    latency_histogram = models.JSONField(default=list)
+    latency_p50 = models.FloatField(null=True)
+    latency_p95 = models.FloatField(null=True)
+    latency_p99 = models.FloatField(null=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["granularity", "bucket"], name="unique_rollup_bucket"),
+        ]
+        ordering = ["granularity", "bucket"]
+
+    def __str__(self) -> str:
+        return f"{self.granularity} {self.bucket:%Y-%m-%d %H:%M}: {self.sent} sent, {self.failed} failed"
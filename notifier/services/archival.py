@@ -0,0 +1,122 @@
+import gzip
+import json
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Optional
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import QuerySet
+
+from notifier.models import ArchivedNotification, Notification
+
+# Terminal states only: "failed" rows are still waiting for a retry, and a
+# permanently failed notification ends up "dead".
+ARCHIVABLE_STATUSES = ("sent", "dead", "digested")
+
+ARCHIVE_FIELDS = (
+    "id", "recipient_id", "contact_id", "document_id", "subject", "message", "status", "metadata",
+    "priority", "attempts", "last_error", "created_at", "sent_at",
+)
+
+DEFAULT_ARCHIVE_SETTINGS = {
+    "retention_days": 90,  # notifications older than this are archived
+    "batch_size": 500,  # rows moved per transaction
+    "pause": 0.0,  # seconds to sleep between batches so other writers get in
+}
+
+
+def get_archive_settings() -> dict:
+    return {**DEFAULT_ARCHIVE_SETTINGS, **getattr(settings, "NOTIFIER_ARCHIVE", {})}
+
+
+@dataclass
+class ArchiveProgress:
+    archived: int
+    total: int
+    last_id: int
+
+
+def archivable(cutoff: datetime) -> QuerySet:
+    # Matches notification_status_time_idx (status, created_at).
+    return Notification.objects.filter(status__in=ARCHIVABLE_STATUSES, created_at__lt=cutoff)
+
+
+def write_batch_file(directory: Path, rows: list) -> Path:
+    """Writes one batch as gzipped JSON lines, renamed into place once durable."""
+    path = directory / f"notifications-{rows[0]['id']:012d}-{rows[-1]['id']:012d}.jsonl.gz"
+    partial = path.with_name(path.name + ".partial")
+    with open(partial, "wb") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="wb") as compressed:
+            for row in rows:
+                compressed.write(json.dumps(row, cls=DjangoJSONEncoder).encode() + b"\n")
+        raw.flush()
+        os.fsync(raw.fileno())
+    os.replace(partial, path)
+    return path
+
+
+def archive_notifications(
+    cutoff: datetime,
+    batch_size: int = 500,
+    directory: Optional[Path] = None,
+    pause: float = 0.0,
+) -> Iterator[ArchiveProgress]:
+    """Moves archivable notifications out of the hot table, yielding per batch.
+
+    Each batch is copied (to ArchivedNotification, or to a .jsonl.gz file in
+    directory) and deleted in its own short transaction, so an interrupted
+    run loses nothing and simply continues on the next one. The table copy is
+    keyed on the original id: rows an earlier run already copied are skipped,
+    and a source row is deleted only once its copy is confirmed. A file
+    written just before a crash may be written again under another name;
+    readers should treat the id as the key.
+    """
+    total = archivable(cutoff).count()
+    archived = 0
+    while True:
+        with transaction.atomic():
+            rows = list(archivable(cutoff).order_by("id").values(*ARCHIVE_FIELDS)[:batch_size])
+            if not rows:
+                return
+            ids = [row["id"] for row in rows]
+            if directory is not None:
+                write_batch_file(directory, rows)
+            else:
+                # Rows already copied by an interrupted run are skipped; any
+                # other insert failure raises and rolls the batch back.
+                done = set(ArchivedNotification.objects.filter(id__in=ids).values_list("id", flat=True))
+                ArchivedNotification.objects.bulk_create(
+                    [ArchivedNotification(**row) for row in rows if row["id"] not in done]
+                )
+                # Only delete what the archive table is confirmed to hold.
+                ids = list(ArchivedNotification.objects.filter(id__in=ids).values_list("id", flat=True))
+            Notification.objects.filter(id__in=ids).delete()
+        archived += len(rows)
+        yield ArchiveProgress(archived=archived, total=max(total, archived), last_id=rows[-1]["id"])
+        if pause:
+            time.sleep(pause)
+
+
+def purge_archive(cutoff: datetime, batch_size: int = 500, directory: Optional[Path] = None) -> tuple:
+    """Deletes archived rows and archive files older than cutoff; returns both counts."""
+    purged = files = 0
+    expired = ArchivedNotification.objects.filter(archived_at__lt=cutoff)
+    while True:
+        with transaction.atomic():
+            ids = list(expired.values_list("id", flat=True)[:batch_size])
+            if not ids:
+                break
+            ArchivedNotification.objects.filter(id__in=ids).delete()
+        purged += len(ids)
+
+    if directory is not None:
+        for path in directory.glob("notifications-*.jsonl.gz"):
+            if path.stat().st_mtime < cutoff.timestamp():
+                path.unlink()
+                files += 1
+    return purged, files
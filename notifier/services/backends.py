@@ -0,0 +1,238 @@
+import http.client
+import json
+import smtplib
+import threading
+from email.utils import make_msgid
+from typing import Dict, List, Union
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+from notifier.services.delivery import NotificationDeliveryError, NotificationRequest, log_sender
+
+# One entry per provider name, the same names the rate limiter uses. "class"
+# picks the backend; every other key is passed to its constructor.
+DEFAULT_BACKENDS = {
+    "default": {"class": "notifier.services.backends.LogBackend", "batch_size": 100},
+}
+
+Result = Union[str, NotificationDeliveryError]
+
+
+class DeliveryBackend:
+    """Sends notification requests to one provider.
+
+    send_messages() takes up to batch_size requests and returns one result
+    per request, in order: the provider's message id, or the
+    NotificationDeliveryError that request failed with. A backend is also a
+    send_callable: calling it with one request returns the id or raises.
+    """
+
+    def __init__(self, name: str = "default", batch_size: int = 100):
+        self.name = name
+        self.batch_size = max(1, int(batch_size))
+
+    def open(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def send_messages(self, requests: List[NotificationRequest]) -> List[Result]:
+        raise NotImplementedError
+
+    def __call__(self, request: NotificationRequest) -> str:
+        result = self.send_messages([request])[0]
+        if isinstance(result, NotificationDeliveryError):
+            raise result
+        return result
+
+
+class CallableBackend(DeliveryBackend):
+    """Adapts a plain send_callable; every request is sent on its own."""
+
+    def __init__(self, send_callable, name: str = "default", batch_size: int = 1):
+        super().__init__(name=name, batch_size=batch_size)
+        self.send_callable = send_callable
+
+    def send_messages(self, requests: List[NotificationRequest]) -> List[Result]:
+        results = []
+        for request in requests:
+            try:
+                results.append(self.send_callable(request))
+            except NotificationDeliveryError as exc:
+                results.append(exc)
+        return results
+
+
+class LogBackend(CallableBackend):
+    """Logs each message instead of sending it; the development default."""
+
+    def __init__(self, name: str = "default", batch_size: int = 100):
+        super().__init__(log_sender, name=name, batch_size=batch_size)
+
+
+class SMTPBackend(DeliveryBackend):
+    """Sends email through one long-lived SMTP session.
+
+    The Django mail connection is opened once and reused for every batch, so
+    the TCP/TLS handshake and AUTH happen once per worker rather than once per
+    message. Each message goes through connection.send_messages() on its own
+    so a refused recipient fails only its own notification; a session the
+    server has dropped is reopened and the message tried once more.
+    Connection options (host, port, username, password, use_tls, use_ssl,
+    timeout) fall back to the EMAIL_* settings.
+    """
+
+    def __init__(
+        self,
+        name: str = "smtp",
+        batch_size: int = 100,
+        from_email: str = None,
+        email_backend: str = "django.core.mail.backends.smtp.EmailBackend",
+        **connection_options,
+    ):
+        super().__init__(name=name, batch_size=batch_size)
+        self.from_email = from_email or settings.DEFAULT_FROM_EMAIL
+        self.connection = get_connection(email_backend, fail_silently=False, **connection_options)
+        self._lock = threading.Lock()
+
+    def open(self) -> None:
+        self.connection.open()
+
+    def close(self) -> None:
+        try:
+            self.connection.close()
+        except (OSError, smtplib.SMTPException):
+            pass
+
+    def build_message(self, request: NotificationRequest) -> EmailMessage:
+        return EmailMessage(
+            subject=request.subject,
+            body=request.message,
+            from_email=self.from_email,
+            to=[request.recipient_email],
+            headers={"Message-ID": make_msgid(domain="notifier")},
+            connection=self.connection,
+        )
+
+    def _send(self, message: EmailMessage) -> Result:
+        for attempt in range(2):
+            try:
+                # Opened here rather than inside send_messages(), which would
+                # close a session it opened itself after the one message.
+                self.connection.open()
+                self.connection.send_messages([message])
+                return message.extra_headers["Message-ID"]
+            except smtplib.SMTPServerDisconnected as exc:
+                # Idle sessions get dropped by the server; the message was not
+                # accepted, so reconnect and try it once more.
+                self.close()
+                if attempt:
+                    return NotificationDeliveryError(f"SMTP server disconnected: {exc}")
+            except smtplib.SMTPException as exc:
+                return NotificationDeliveryError(f"SMTP error: {exc}")
+            except OSError as exc:
+                self.close()
+                return NotificationDeliveryError(f"SMTP connection failed: {exc}")
+
+    def send_messages(self, requests: List[NotificationRequest]) -> List[Result]:
+        with self._lock:
+            return [self._send(self.build_message(request)) for request in requests]
+
+
+class HTTPBackend(DeliveryBackend):
+    """Posts each batch as one JSON request over a kept-alive HTTP connection.
+
+    The endpoint receives {"messages": [{"to", "subject", "message"}, ...]}
+    and answers {"results": [{"id": ...} or {"error": ...}, ...]} in the
+    same order. A transport error, a non-2xx answer, or a body that is not
+    one result per message fails the whole batch.
+    """
+
+    def __init__(self, url: str, name: str = "http", batch_size: int = 100, timeout: float = 10.0, headers=None):
+        super().__init__(name=name, batch_size=batch_size)
+        parts = urlsplit(url)
+        self.scheme, self.host, self.port = parts.scheme, parts.hostname, parts.port
+        self.path = parts.path or "/"
+        self.timeout = timeout
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+        self.connection = None
+        self._lock = threading.Lock()
+
+    def open(self) -> None:
+        if self.connection is None:
+            connection_class = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            self.connection = connection_class(self.host, self.port, timeout=self.timeout)
+
+    def close(self) -> None:
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def send_messages(self, requests: List[NotificationRequest]) -> List[Result]:
+        body = json.dumps(
+            {
+                "messages": [
+                    {"to": request.recipient_email, "subject": request.subject, "message": request.message}
+                    for request in requests
+                ]
+            }
+        ).encode()
+        with self._lock:
+            self.open()
+            try:
+                self.connection.request("POST", self.path, body=body, headers=self.headers)
+                response = self.connection.getresponse()
+                payload = response.read()
+            except (OSError, http.client.HTTPException) as exc:
+                self.close()
+                error = NotificationDeliveryError(f"HTTP delivery failed: {exc}")
+                return [error] * len(requests)
+        if not 200 <= response.status < 300:
+            error = NotificationDeliveryError(f"HTTP delivery failed with status {response.status}.")
+            return [error] * len(requests)
+        try:
+            results = json.loads(payload)["results"]
+            if len(results) != len(requests):
+                raise ValueError(f"{len(results)} results for {len(requests)} messages")
+            return [
+                result["id"] if "id" in result else NotificationDeliveryError(result.get("error", "Rejected."))
+                for result in results
+            ]
+        except (ValueError, KeyError, TypeError, AttributeError) as exc:
+            # Without a usable answer no message can be matched to a result.
+            error = NotificationDeliveryError(f"HTTP delivery returned an unusable response: {exc}")
+            return [error] * len(requests)
+
+
+def get_backend_settings() -> Dict[str, dict]:
+    return getattr(settings, "NOTIFIER_DELIVERY_BACKENDS", DEFAULT_BACKENDS)
+
+
+_backends: Dict[str, DeliveryBackend] = {}
+
+
+def get_backend(name: str = "default") -> DeliveryBackend:
+    """Returns the process-wide backend for a provider, building it on first use."""
+    if name not in _backends:
+        options = dict(get_backend_settings()[name])
+        backend_class = import_string(options.pop("class"))
+        _backends[name] = backend_class(name=name, **options)
+    return _backends[name]
+
+
+def close_backends() -> None:
+    for backend in _backends.values():
+        backend.close()
+    _backends.clear()
+
+
+@receiver(setting_changed)
+def reset_backends(sender, setting, **kwargs):
+    if setting in ("NOTIFIER_DELIVERY_BACKENDS", "EMAIL_HOST", "EMAIL_PORT"):
+        close_backends()
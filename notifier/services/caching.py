@@ -3,17 +3,37 @@ from django.core.cache import cache
 from notifier.models import Document
 
 CACHE_KEY = "activity.session14.documents:list"
+CACHE_TIMEOUT = 60
+
+
+def _document_row(doc: Document) -> dict:
+    return {
+        "title": doc.title,
+        "description": doc.description,
+    }
 
 
 def get_cached_document_payload() -> List[dict]:
     def _query():
         documents = Document.objects.order_by("-uploaded_at")
-        return [
-            {
-                "title": doc.title,
-                "description": doc.description,
-            }
-            for doc in documents
-        ]
-
-    return cache.get_or_set(CACHE_KEY, _query, timeout=60)
+        return [_document_row(doc) for doc in documents]
+
+    return cache.get_or_set(CACHE_KEY, _query, timeout=CACHE_TIMEOUT)
+
+
+# Async twin of get_cached_document_payload for views running under ASGI.
+async def aget_cached_document_payload() -> List[dict]:
+    payload = await cache.aget(CACHE_KEY)
+    if payload is None:
+        payload = [_document_row(doc) async for doc in Document.objects.order_by("-uploaded_at")]
+        await cache.aset(CACHE_KEY, payload, timeout=CACHE_TIMEOUT)
+    return payload
+
+
+# Call after any document write so the list is rebuilt on the next read.
+def invalidate_document_payload() -> None:
+    cache.delete(CACHE_KEY)
+
+
+async def ainvalidate_document_payload() -> None:
+    await cache.adelete(CACHE_KEY)
@@ -0,0 +1,218 @@
+import logging
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+
+from django.conf import settings
+
+from notifier.services.shared_cache import get_shared_cache, shared_lock
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = "notifier.breaker"
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+DEFAULT_BREAKER_SETTINGS = {
+    "failure_rate": 0.5,  # share of failed sends in a window that opens the breaker
+    "minimum_requests": 20,  # sends a window needs before the rate counts
+    "window": 60,  # seconds per counting window while closed
+    "cooldown": 30,  # seconds an open breaker rejects before probing
+    "half_open_max": 1,  # probe sends allowed through while half-open
+}
+
+@dataclass(frozen=True)
+class BreakerConfig:
+    failure_rate: float
+    minimum_requests: int
+    window: float
+    cooldown: float
+    half_open_max: int
+
+    @classmethod
+    def from_setting(cls, value: dict) -> "BreakerConfig":
+        return cls(
+            failure_rate=float(value["failure_rate"]),
+            minimum_requests=int(value["minimum_requests"]),
+            window=float(value["window"]),
+            cooldown=float(value["cooldown"]),
+            half_open_max=int(value["half_open_max"]),
+        )
+
+
+@dataclass
+class BreakerState:
+    state: str = CLOSED
+    window_started_at: float = 0.0
+    successes: int = 0
+    failures: int = 0
+    opened_at: Optional[float] = None
+    probes: int = 0  # sends let through since going half-open
+    probed_at: Optional[float] = None
+    trips: int = 0  # times the breaker has opened
+    rejected: int = 0  # sends refused while open
+
+    @property
+    def failure_rate(self) -> float:
+        total = self.successes + self.failures
+        return self.failures / total if total else 0.0
+
+
+@dataclass(frozen=True)
+class Permit:
+    allowed: int  # how many of the requested sends may go out now
+    retry_after: float  # seconds until the rest may be tried (0 when all allowed)
+
+
+class CircuitBreaker:
+    """Stops sending to a provider that keeps failing.
+
+    closed: sends go through and outcomes are counted per window; once a
+    window has minimum_requests sends and at least failure_rate of them
+    failed, the breaker opens.
+    open: every send is refused at once, for cooldown seconds.
+    half_open: up to half_open_max probe sends go through. A successful probe
+    closes the breaker; a failed one opens it for another cooldown.
+
+    allow() never blocks, like SendRateLimiter.acquire(): callers defer what
+    it refuses. State lives in the shared cache and every update holds the
+    provider's shared lock, so the workers trip one breaker between them and
+    the API reports what they wrote.
+    """
+
+    def __init__(self, default: dict, providers: Optional[dict] = None):
+        self.default = BreakerConfig.from_setting(default)
+        self.providers = {
+            name: BreakerConfig.from_setting({**default, **value}) for name, value in (providers or {}).items()
+        }
+
+    def config_for(self, provider: str) -> BreakerConfig:
+        return self.providers.get(provider, self.default)
+
+    def _key(self, provider: str) -> str:
+        return f"{CACHE_PREFIX}:{provider}"
+
+    def _load(self, provider: str, now: float) -> BreakerState:
+        return self._from_cache(get_shared_cache().get(self._key(provider)), now)
+
+    def _from_cache(self, value: Optional[dict], now: float) -> BreakerState:
+        return BreakerState(**value) if value else BreakerState(window_started_at=now)
+
+    def _save(self, provider: str, state: BreakerState) -> None:
+        get_shared_cache().set(self._key(provider), asdict(state), timeout=None)
+
+    def _advance(self, state: BreakerState, config: BreakerConfig, now: float) -> None:
+        # Time-driven transitions, applied on every read.
+        if state.state == OPEN and now - state.opened_at >= config.cooldown:
+            state.state = HALF_OPEN
+            state.probes = 0
+        elif state.state == HALF_OPEN and state.probes and now - state.probed_at >= config.cooldown:
+            # The probes never reported back (their worker died); allow new ones.
+            state.probes = 0
+        elif state.state == CLOSED and now - state.window_started_at >= config.window:
+            state.window_started_at = now
+            state.successes = state.failures = 0
+
+    def state(self, provider: str, now: Optional[float] = None) -> BreakerState:
+        now = time.time() if now is None else now
+        # Read-only: transitions advanced here are not saved, so no lock.
+        state = self._load(provider, now)
+        self._advance(state, self.config_for(provider), now)
+        return state
+
+    def allow(self, provider: str, wanted: int = 1, now: Optional[float] = None) -> Permit:
+        now = time.time() if now is None else now
+        config = self.config_for(provider)
+        with shared_lock(self._key(provider)):
+            state = self._load(provider, now)
+            self._advance(state, config, now)
+            if state.state == CLOSED:
+                permit = Permit(allowed=wanted, retry_after=0.0)
+            elif state.state == OPEN:
+                permit = Permit(allowed=0, retry_after=config.cooldown - (now - state.opened_at))
+            else:
+                allowed = max(0, min(wanted, config.half_open_max - state.probes))
+                if allowed:
+                    state.probes += allowed
+                    state.probed_at = now
+                # Refused sends wait for the probe's verdict; a cooldown is the
+                # longest that can take to change anything.
+                permit = Permit(allowed=allowed, retry_after=config.cooldown if allowed < wanted else 0.0)
+            state.rejected += wanted - permit.allowed
+            self._save(provider, state)
+        return permit
+
+    def record(self, provider: str, successes: int = 0, failures: int = 0, now: Optional[float] = None) -> str:
+        """Counts the outcome of sends that allow() let through; returns the new state."""
+        now = time.time() if now is None else now
+        config = self.config_for(provider)
+        with shared_lock(self._key(provider)):
+            state = self._load(provider, now)
+            self._advance(state, config, now)
+            previous = state.state
+            if state.state == HALF_OPEN:
+                if failures:
+                    self._open(state, now)
+                elif successes:
+                    state.state = CLOSED
+                    state.window_started_at = now
+                    state.successes, state.failures = successes, 0
+            elif state.state == CLOSED:
+                state.successes += successes
+                state.failures += failures
+                total = state.successes + state.failures
+                if total >= config.minimum_requests and state.failure_rate >= config.failure_rate:
+                    self._open(state, now)
+            # Outcomes arriving while open come from sends started before it
+            # opened; they change nothing.
+            self._save(provider, state)
+        if state.state != previous:
+            logger.warning("[BREAKER] %s: %s -> %s", provider, previous, state.state)
+        return state.state
+
+    def _open(self, state: BreakerState, now: float) -> None:
+        state.state = OPEN
+        state.opened_at = now
+        state.probes = 0
+        state.trips += 1
+
+    def reset(self, provider: str) -> None:
+        get_shared_cache().delete(self._key(provider))
+
+    def snapshot(self, providers: List[str], now: Optional[float] = None) -> List[Dict]:
+        """Breaker metrics per provider, for the API and the dashboard."""
+        now = time.time() if now is None else now
+        stored = get_shared_cache().get_many([self._key(provider) for provider in providers])
+        rows = []
+        for provider in providers:
+            state = self._from_cache(stored.get(self._key(provider)), now)
+            config = self.config_for(provider)
+            self._advance(state, config, now)
+            rows.append(
+                {
+                    "provider": provider,
+                    "state": state.state,
+                    "successes": state.successes,
+                    "failures": state.failures,
+                    "failure_rate": round(state.failure_rate, 4),
+                    "trips": state.trips,
+                    "rejected": state.rejected,
+                    "retry_after": (
+                        max(0.0, config.cooldown - (now - state.opened_at)) if state.state == OPEN else 0.0
+                    ),
+                }
+            )
+        return rows
+
+
+def get_breaker_settings() -> dict:
+    return {**DEFAULT_BREAKER_SETTINGS, **getattr(settings, "NOTIFIER_CIRCUIT_BREAKER", {})}
+
+
+def get_circuit_breaker() -> Optional[CircuitBreaker]:
+    """Builds the breaker from settings.NOTIFIER_CIRCUIT_BREAKER; None disables it."""
+    if getattr(settings, "NOTIFIER_CIRCUIT_BREAKER", {}) is None:
+        return None
+    config = get_breaker_settings()
+    providers = config.pop("providers", {})
+    return CircuitBreaker(config, providers)
@@ -0,0 +1,55 @@
+from django.db import transaction
+from django.db.models import Count, F
+
+from notifier.models import Notification, StatusCounter
+
+
+def status_totals() -> dict:
+    """Notification count per status in O(1), with every known status present."""
+    statuses = [status for status, _ in Notification._meta.get_field("status").choices]
+    return {**dict.fromkeys(statuses, 0), **StatusCounter.objects.totals()}
+
+
+def measure_drift(attempts: int = 3) -> dict:
+    """Difference between a real COUNT and the counters, per status that differs.
+
+    Runs outside any transaction, so the COUNT never holds the write lock. The
+    counters are read before and after it; if they moved, a status change
+    landed mid-count and the comparison is retried. Returns {} when the table
+    stayed busy for every attempt; the next round will catch any drift.
+    """
+    for _ in range(attempts):
+        counted = dict(StatusCounter.objects.values_list("status", "count"))
+        actual = dict(Notification.objects.values_list("status").annotate(total=Count("id")).order_by())
+        if dict(StatusCounter.objects.values_list("status", "count")) == counted:
+            return {
+                status: actual.get(status, 0) - counted.get(status, 0)
+                for status in {*counted, *actual}
+                if actual.get(status, 0) != counted.get(status, 0)
+            }
+    return {}
+
+
+def apply_drift(drift: dict) -> None:
+    """Adds each drift to its counter in one short write transaction.
+
+    Relative updates keep any status change committed since measure_drift(),
+    which the triggers have already counted.
+    """
+    with transaction.atomic():
+        for status, delta in drift.items():
+            if not StatusCounter.objects.filter(status=status).update(count=F("count") + delta):
+                StatusCounter.objects.create(status=status, count=delta)
+
+
+def reconcile_counters() -> dict:
+    """Corrects the counters to a real COUNT and returns the drift that was fixed.
+
+    The triggers keep the counters exact, so drift means something bypassed
+    them (raw SQL with triggers disabled, a restored backup, a database
+    without trigger support).
+    """
+    drift = measure_drift()
+    if drift:
+        apply_drift(drift)
+    return drift
@@ -1,5 +1,19 @@
+import logging
+import uuid
 from dataclasses import dataclass
-from django.template.loader import render_to_string
+from datetime import timedelta
+from typing import List, Optional, Sequence
+
+from django.utils import timezone
+
+from notifier.services.circuit_breaker import CircuitBreaker
+from notifier.services.events import broadcaster
+from notifier.services.rate_limiting import SendRateLimiter
+from notifier.services.rendering import renderer
+from notifier.services.retries import record_failure
+
+
+logger = logging.getLogger(__name__)
 
 
 class NotificationDeliveryError(Exception):
@@ -13,27 +27,168 @@ class NotificationRequest:
     message: str
 
 
+# Default sender for the worker until a real provider is configured.
+def log_sender(request: NotificationRequest) -> str:
+    message_id = uuid.uuid4().hex
+    logger.info("[SEND] %s to %s (%s)", request.subject, request.recipient_email, message_id)
+    return message_id
+
+
 # Helper: wraps the delivery attempt and formats a UI response.
-def safe_send_notification(request: NotificationRequest, send_callable):
+# With a limiter, over-quota sends come back as "deferred" (with retry_after in
+# seconds) instead of being attempted, so callers can requeue rather than fail.
+def safe_send_notification(
+    request: NotificationRequest,
+    send_callable,
+    provider: str = "default",
+    limiter: Optional[SendRateLimiter] = None,
+):
     if not request.recipient_email:
         raise ValueError("Recipient email is required.")
 
+    deferred = _check_rate(request, provider, limiter)
+    if deferred is not None:
+        return deferred
+
     try:
         message_id = send_callable(request)
     except NotificationDeliveryError as exc:
-        return {
-            "status": "error",
-            "template": render_to_string(
-                "notifier/partials/notification_error.html",
-                {
-                    "recipient_email": request.recipient_email,
-                    "subject": request.subject,
-                    "details": str(exc),
-                },
-            ),
-        }
+        return _error_payload(request, exc)
 
     return {
         "status": "success",
         "message_id": message_id,
     }
+
+
+# Helper: the "deferred" payload when the limiter has no token for this send.
+def _check_rate(request: NotificationRequest, provider: str, limiter: Optional[SendRateLimiter]):
+    if limiter is None:
+        return None
+    retry_after = limiter.acquire(provider, request.recipient_email)
+    if retry_after > 0:
+        return {
+            "status": "deferred",
+            "retry_after": retry_after,
+        }
+    return None
+
+
+def _error_payload(request: NotificationRequest, exc: NotificationDeliveryError) -> dict:
+    return {
+        "status": "error",
+        "details": str(exc),
+        "template": renderer.render(
+            "notifier/partials/notification_error.html",
+            {
+                "recipient_email": request.recipient_email,
+                "subject": request.subject,
+                "details": str(exc),
+            },
+        ),
+    }
+
+
+def _request_for(notification) -> NotificationRequest:
+    return NotificationRequest(
+        recipient_email=notification.delivery_email,
+        subject=notification.subject,
+        message=notification.message,
+    )
+
+
+# Helper: sends a stored Notification and records the outcome on the row.
+def deliver_notification(
+    notification,
+    send_callable,
+    provider: str = "default",
+    limiter: Optional[SendRateLimiter] = None,
+):
+    request = _request_for(notification)
+    previous_status = notification.status
+
+    try:
+        payload = safe_send_notification(request, send_callable, provider=provider, limiter=limiter)
+    except ValueError as exc:
+        record_failure(notification, exc, permanent=True)
+        _announce(notification, previous_status)
+        return {"status": "error", "details": str(exc)}
+
+    _record_outcome(notification, payload)
+    _announce(notification, previous_status)
+    return payload
+
+
+# Helper: delivers several notifications with a single backend.send_messages()
+# call. Validation and rate limiting still happen per notification, exactly as
+# in deliver_notification; only the sends that pass reach the backend.
+# With a breaker, sends it refuses (provider failing) come back "deferred"
+# straight away instead of each waiting on the provider's timeout.
+def deliver_batch(
+    notifications: Sequence,
+    backend,
+    provider: str = "default",
+    limiter: Optional[SendRateLimiter] = None,
+    breaker: Optional[CircuitBreaker] = None,
+) -> List[dict]:
+    payloads: List[Optional[dict]] = [None] * len(notifications)
+    ready, invalid = [], set()
+    for index, notification in enumerate(notifications):
+        request = _request_for(notification)
+        if not request.recipient_email:
+            payloads[index] = {"status": "error", "details": "Recipient email is required."}
+            invalid.add(index)
+            continue
+        deferred = _check_rate(request, provider, limiter)
+        if deferred is not None:
+            payloads[index] = deferred
+            continue
+        ready.append((index, request))
+
+    if breaker is not None and ready:
+        permit = breaker.allow(provider, len(ready))
+        for index, _ in ready[permit.allowed :]:
+            payloads[index] = {"status": "deferred", "retry_after": permit.retry_after, "circuit": "open"}
+        ready = ready[: permit.allowed]
+
+    results = list(backend.send_messages([request for _, request in ready])) if ready else []
+    if len(results) < len(ready):
+        # A backend that answered for fewer messages than it was given: the
+        # rest count as failed rather than being left without an outcome.
+        missing = NotificationDeliveryError(f"{backend.name} returned no result for this message.")
+        results += [missing] * (len(ready) - len(results))
+    failures = 0
+    for (index, request), result in zip(ready, results):
+        if isinstance(result, NotificationDeliveryError):
+            payloads[index] = _error_payload(request, result)
+            failures += 1
+        else:
+            payloads[index] = {"status": "success", "message_id": result}
+    if breaker is not None and ready:
+        breaker.record(provider, successes=len(ready) - failures, failures=failures)
+
+    for index, (notification, payload) in enumerate(zip(notifications, payloads)):
+        previous_status = notification.status
+        if index in invalid:
+            record_failure(notification, ValueError(payload["details"]), permanent=True)
+        else:
+            _record_outcome(notification, payload)
+        _announce(notification, previous_status)
+    return payloads
+
+
+def _record_outcome(notification, payload: dict):
+    if payload["status"] == "success":
+        notification.mark_as_sent()
+    elif payload["status"] == "deferred":
+        # Still queued, just not before the limiter has a token for it.
+        notification.send_at = timezone.now() + timedelta(seconds=payload["retry_after"])
+        notification.save(update_fields=["send_at"])
+    else:
+        record_failure(notification, payload["details"])
+
+
+# Helper: records a transition for live status streams; it becomes visible when it commits.
+def _announce(notification, previous_status: str):
+    if notification.status != previous_status:
+        broadcaster.publish_status(notification.pk, previous_status, notification.status)
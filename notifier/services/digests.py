@@ -0,0 +1,94 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from notifier.models import Notification
+from notifier.services.events import broadcaster
+from notifier.services.rendering import renderer
+
+DIGEST_TEMPLATE = "notifier/partials/notification_digest.txt"
+
+DEFAULT_DIGEST_SETTINGS = {
+    "enabled": False,
+    "window": 10 * 60,  # seconds a digest-mode notification is buffered
+    "min_items": 2,  # fewer buffered items are sent as-is
+}
+
+
+class DigestConflict(Exception):
+    """Another process coalesced some of the same rows first."""
+
+
+def get_digest_settings() -> dict:
+    return {**DEFAULT_DIGEST_SETTINGS, **getattr(settings, "NOTIFIER_DIGEST", {})}
+
+
+def coalesce_digests(now: Optional[datetime] = None) -> int:
+    """Merges buffered notifications into one digest per recipient.
+
+    Any recipient with at least one buffered notification whose window has
+    elapsed gets everything currently buffered for them merged. The work is a
+    fixed number of queries however many recipients are involved: one read of
+    the buffered rows, one UPDATE for singletons, one UPDATE marking merged
+    rows "digested" and one bulk INSERT of the digests. Returns the number of
+    digests created.
+    """
+    now = now or timezone.now()
+    config = get_digest_settings()
+    buffered = Notification.objects.filter(status="queued", digest=True)
+
+    with transaction.atomic():
+        due_recipients = buffered.filter(send_at__lte=now).values("recipient_id")
+        rows = (
+            buffered.filter(recipient_id__in=due_recipients)
+            .values_list("recipient_id", "id", "subject", "document__title", "priority", "created_at")
+            .order_by("recipient_id", "created_at")
+        )
+        groups = defaultdict(list)
+        for row in rows:
+            groups[row[0]].append(row)
+
+        singles = [row[1] for group in groups.values() if len(group) < config["min_items"] for row in group]
+        merged = {recipient: group for recipient, group in groups.items() if len(group) >= config["min_items"]}
+        if singles:
+            # Too few to merge: release them to the normal queue right away.
+            buffered.filter(id__in=singles).update(digest=False, send_at=now)
+        if not merged:
+            return 0
+
+        member_ids = [row[1] for group in merged.values() for row in group]
+        updated = buffered.filter(id__in=member_ids).update(status="digested")
+        if updated != len(member_ids):
+            raise DigestConflict("Buffered notifications changed while building digests.")
+
+        contexts = [
+            {
+                "count": len(group),
+                "items": [{"subject": row[2], "document": row[3]} for row in group],
+                "since": group[0][5],
+            }
+            for group in merged.values()
+        ]
+        messages = renderer.render_many(DIGEST_TEMPLATE, contexts)
+        digests = [
+            Notification(
+                recipient_id=recipient,
+                subject=f"Digest #{group[0][1]}: {len(group)} updates",
+                message=message,
+                priority=min(row[4] for row in group),
+                send_at=now,
+                metadata={
+                    "digest_of": [row[1] for row in group],
+                    "documents": [row[3] for row in group if row[3]],
+                },
+            )
+            for (recipient, group), message in zip(merged.items(), messages)
+        ]
+        Notification.objects.bulk_create(digests)
+        deltas = {"queued": len(digests) - updated, "digested": updated}
+        broadcaster.publish_counts(deltas)
+    return len(digests)
@@ -0,0 +1,150 @@
+import asyncio
+import threading
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.db.models import Max, Min
+
+from notifier.models import StatusEvent
+from notifier.services.counters import status_totals
+
+
+class StatusBroadcaster:
+    """Fan-out of notification status changes to stream listeners.
+
+    Follows the UploadNotifier observer idea, but events go through the
+    StatusEvent table, so changes made by run_worker processes reach streams
+    served by the web process, and event ids stay unique and increasing
+    across processes and restarts. Listeners poll the table every
+    poll_interval seconds; a publish in the same process wakes them at once
+    after its commit.
+
+    The newest `retain` events are kept, so a reconnecting client can catch
+    up from its last event id instead of reloading the page. A client whose
+    cursor is older than that, or newer than the newest event (the table was
+    reset or restored), skips to the retained events.
+
+    Counts are not rebuilt from event deltas: fan-out inserts, archival and
+    plain creates publish nothing. listen() instead sends the trigger-kept
+    StatusCounter totals whenever they change, which covers every writer.
+
+    Events are written in the transaction that makes the change, so they
+    appear exactly when it commits. SQLite (transaction_mode IMMEDIATE)
+    serialises write transactions, so ids are also in commit order.
+    """
+
+    def __init__(self, retain: int = 1000, poll_interval: float = 1.0, batch_size: int = 500):
+        self.retain = retain
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._listeners = set()
+
+    @property
+    def cursor(self) -> int:
+        """Id of the newest event; a page rendered now streams from here."""
+        return StatusEvent.objects.aggregate(newest=Max("id"))["newest"] or 0
+
+    def publish(self, event_type: str, **data) -> StatusEvent:
+        event = StatusEvent.objects.create(type=event_type, data=data)
+        # Prune in one statement every `retain` events rather than on each one.
+        if event.id % self.retain == 0:
+            StatusEvent.objects.filter(id__lte=event.id - self.retain).delete()
+        transaction.on_commit(self._wake)
+        return event
+
+    def _wake(self):
+        with self._lock:
+            listeners = list(self._listeners)
+        for loop, wakeup in listeners:
+            loop.call_soon_threadsafe(wakeup.set)
+
+    def publish_status(self, notification_id: int, previous: str, status: str) -> StatusEvent:
+        return self.publish(
+            "status",
+            notification=notification_id,
+            previous=previous,
+            status=status,
+            deltas={previous: -1, status: 1},
+        )
+
+    def publish_counts(self, deltas: Dict[str, int]) -> Optional[StatusEvent]:
+        deltas = {status: delta for status, delta in deltas.items() if delta}
+        if not deltas:
+            return None
+        return self.publish("counts", deltas=deltas)
+
+    def _reset_cursor(self, cursor: int, bounds: dict) -> Optional[int]:
+        """Where a client at cursor must resync to, or None when it can catch up."""
+        oldest, newest = bounds["oldest"], bounds["newest"] or 0
+        if cursor > newest:
+            # Ahead of every event: the table was reset; start from its end.
+            return newest
+        if cursor > 0 and oldest is not None and cursor < oldest - 1:
+            # Events after cursor were pruned; deltas would be wrong.
+            return oldest - 1
+        return None
+
+    def since(self, cursor: int) -> Tuple[List[StatusEvent], Optional[int]]:
+        """Up to batch_size events after cursor, and the cursor to reset to if it is out of range."""
+        reset = self._reset_cursor(cursor, StatusEvent.objects.aggregate(oldest=Min("id"), newest=Max("id")))
+        if reset is not None:
+            cursor = reset
+        return list(StatusEvent.objects.filter(id__gt=cursor).order_by("id")[: self.batch_size]), reset
+
+    async def asince(self, cursor: int) -> Tuple[List[StatusEvent], Optional[int]]:
+        bounds = await StatusEvent.objects.aaggregate(oldest=Min("id"), newest=Max("id"))
+        reset = self._reset_cursor(cursor, bounds)
+        if reset is not None:
+            cursor = reset
+        events = StatusEvent.objects.filter(id__gt=cursor).order_by("id")[: self.batch_size]
+        return [event async for event in events], reset
+
+    async def atotals(self, cursor: int) -> StatusEvent:
+        """An unsaved "totals" event carrying the status counters, tagged with cursor."""
+        return StatusEvent(id=cursor, type="totals", data=await sync_to_async(status_totals)())
+
+    async def listen(self, cursor: int = 0, heartbeat: float = 15.0) -> AsyncIterator[Optional[StatusEvent]]:
+        """Yields events after cursor forever, plus a "totals" event first and
+        whenever the counters change; yields None as a keep-alive tick."""
+        wakeup = asyncio.Event()
+        listener = (asyncio.get_running_loop(), wakeup)
+        with self._lock:
+            self._listeners.add(listener)
+        try:
+            idle = 0.0
+            sent_totals = None
+            while True:
+                events, reset = await self.asince(cursor)
+                if reset is not None:
+                    cursor = reset
+                for event in events:
+                    cursor = event.id
+                    yield event
+                if len(events) == self.batch_size:
+                    # More are waiting; send totals once caught up.
+                    continue
+                totals = await self.atotals(cursor)
+                if totals.data != sent_totals:
+                    sent_totals = totals.data
+                    idle = 0.0
+                    yield totals
+                if events:
+                    idle = 0.0
+                    continue
+                wakeup.clear()
+                wait = min(self.poll_interval, heartbeat)
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    idle += wait
+                if idle >= heartbeat:
+                    idle = 0.0
+                    yield None
+        finally:
+            with self._lock:
+                self._listeners.discard(listener)
+
+
+broadcaster = StatusBroadcaster()
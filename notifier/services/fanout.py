@@ -0,0 +1,148 @@
+import hashlib
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from django.db import connections, router
+from django.db.models import QuerySet
+from django.db.models.constants import OnConflict
+from django.utils import timezone
+
+from notifier.models import Notification, Recipient, Segment, SegmentMembership
+from notifier.services.digests import get_digest_settings
+
+
+def row_idempotency_key(idempotency_key: str, recipient_id: int) -> str:
+    return hashlib.sha256(f"{idempotency_key}:{recipient_id}".encode()).hexdigest()
+
+
+def fan_out(
+    recipients: Iterable,
+    subject: str,
+    message: str,
+    idempotency_key: str,
+    batch_size: int = 500,
+    digest: bool = False,
+    **fields,
+) -> QuerySet:
+    """Queues one notification per recipient; repeating the call is a no-op.
+
+    Every row gets a key derived from idempotency_key and the recipient, and
+    the insert ignores conflicts, so a retried fan-out skips rows that already
+    exist (including ones blocked by unique_notification_subject_per_user)
+    in the same batched INSERT instead of raising IntegrityError row by row.
+    Returns all notifications belonging to this fan-out.
+
+    digest=True buffers the rows for the configured window so the digest job
+    can merge them per recipient (ignored unless NOTIFIER_DIGEST is enabled).
+    """
+    config = get_digest_settings()
+    if digest and config["enabled"]:
+        fields.setdefault("send_at", timezone.now() + timedelta(seconds=config["window"]))
+        fields["digest"] = True
+
+    rows = [
+        Notification(
+            recipient_id=recipient.pk,
+            subject=subject,
+            message=message,
+            idempotency_key=row_idempotency_key(idempotency_key, recipient.pk),
+            **fields,
+        )
+        for recipient in recipients
+    ]
+    Notification.objects.bulk_create(rows, batch_size=batch_size, ignore_conflicts=True)
+    return Notification.objects.filter(idempotency_key__in=[row.idempotency_key for row in rows])
+
+
+def segment_key_prefix(segment: Segment, idempotency_key: str) -> str:
+    # 40 hex chars + ":" + the contact id stays within idempotency_key's 64.
+    return hashlib.sha256(f"segment:{segment.pk}:{idempotency_key}".encode()).hexdigest()[:40] + ":"
+
+
+def fan_out_segment(
+    segment: Segment,
+    subject: str,
+    message: str,
+    idempotency_key: str,
+    priority: int = Notification.PRIORITY_NORMAL,
+    metadata: Optional[dict] = None,
+    send_at: Optional[datetime] = None,
+    document=None,
+) -> int:
+    """Queues one notification per active member of segment; returns rows inserted.
+
+    On SQLite and PostgreSQL this is a single INSERT ... SELECT over the
+    membership table: the database joins members to contacts and writes the
+    rows itself, so no recipient is loaded into Python. Each row's key is
+    derived from idempotency_key and the contact id, and conflicts are
+    ignored, so repeating the call inserts nothing new. Other databases
+    fall back to batched bulk_create().
+    """
+    now = timezone.now()
+    prefix = segment_key_prefix(segment, idempotency_key)
+    constants = {
+        "subject": subject,
+        "message": message,
+        "status": "queued",
+        "metadata": metadata or {},
+        "document_id": document.pk if document else None,
+        "priority": priority,
+        "attempts": 0,
+        "last_error": "",
+        "claimed_by": "",
+        "digest": False,
+        "created_at": now,
+        "send_at": send_at or now,
+    }
+    connection = connections[router.db_for_write(Notification)]
+    if connection.vendor not in {"sqlite", "postgresql"}:
+        return _fan_out_segment_in_batches(segment, prefix, constants)
+
+    quote = connection.ops.quote_name
+    fields = [Notification._meta.get_field(name) for name in constants]
+    params = [field.get_db_prep_save(value, connection) for field, value in zip(fields, constants.values())]
+    if connection.vendor == "postgresql":
+        # Bare parameters in a SELECT list are typed as text; cast to the column types.
+        placeholders = [f"CAST(%s AS {field.db_type(connection)})" for field in fields]
+    else:
+        placeholders = ["%s"] * len(fields)
+
+    on_conflict_fields = [Notification._meta.get_field("idempotency_key")]
+    sql = (
+        f"{connection.ops.insert_statement(on_conflict=OnConflict.IGNORE)} {quote(Notification._meta.db_table)} "
+        f"({', '.join(quote(field.column) for field in fields)}, {quote('contact_id')}, {quote('idempotency_key')}) "
+        f"SELECT {', '.join(placeholders)}, member.{quote('recipient_id')}, "
+        f"%s || CAST(member.{quote('recipient_id')} AS VARCHAR(20)) "
+        f"FROM {quote(SegmentMembership._meta.db_table)} member "
+        f"INNER JOIN {quote(Recipient._meta.db_table)} contact ON contact.{quote('id')} = member.{quote('recipient_id')} "
+        f"WHERE member.{quote('segment_id')} = %s AND contact.{quote('is_active')} "
+        f"{connection.ops.on_conflict_suffix_sql(on_conflict_fields, OnConflict.IGNORE, None, None)}"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [*params, prefix, segment.pk])
+        return cursor.rowcount
+
+
+def _fan_out_segment_in_batches(segment: Segment, prefix: str, constants: dict, batch_size: int = 1000) -> int:
+    members = (
+        SegmentMembership.objects.filter(segment=segment, recipient__is_active=True)
+        .values_list("recipient_id", flat=True)
+        .iterator(chunk_size=batch_size)
+    )
+    inserted = 0
+    batch = []
+    for contact_id in members:
+        batch.append(Notification(contact_id=contact_id, idempotency_key=f"{prefix}{contact_id}", **constants))
+        if len(batch) >= batch_size:
+            inserted += _insert_new(batch)
+            batch = []
+    if batch:
+        inserted += _insert_new(batch)
+    return inserted
+
+
+def _insert_new(rows: list) -> int:
+    keys = [row.idempotency_key for row in rows]
+    before = Notification.objects.filter(idempotency_key__in=keys).count()
+    Notification.objects.bulk_create(rows, ignore_conflicts=True)
+    return Notification.objects.filter(idempotency_key__in=keys).count() - before
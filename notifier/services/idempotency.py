@@ -0,0 +1,135 @@
+import hashlib
+from dataclasses import dataclass
+from functools import wraps
+from inspect import iscoroutinefunction
+from typing import Optional
+
+from django.http import HttpResponse, JsonResponse
+
+from notifier.services.shared_cache import get_shared_cache
+
+CACHE_PREFIX = "notifier.idempotency"
+HEADER = "Idempotency-Key"
+DEFAULT_TTL = 24 * 60 * 60
+LOCK_TIMEOUT = 60
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def _cache_key(request, user_id, key: str) -> str:
+    # Scope keys per user and endpoint so two clients can't collide on a key.
+    # user_id is resolved by the caller: request.user is sync-only.
+    raw = f"{user_id or 'anon'}:{request.method}:{request.path}:{key}"
+    return f"{CACHE_PREFIX}:{hashlib.sha256(raw.encode()).hexdigest()}"
+
+
+def _idempotency_key(request) -> Optional[str]:
+    """The request's Idempotency-Key, or None when the request is not deduplicated."""
+    if request.method in SAFE_METHODS:
+        return None
+    return request.headers.get(HEADER) or None
+
+
+@dataclass(frozen=True)
+class _Attempt:
+    cache_key: str
+    fingerprint: str
+
+    @classmethod
+    def build(cls, request, user_id, key: str) -> "_Attempt":
+        return cls(_cache_key(request, user_id, key), hashlib.sha256(request.body).hexdigest())
+
+    @property
+    def lock_key(self) -> str:
+        return f"{self.cache_key}:lock"
+
+    def replay(self, stored: Optional[dict]):
+        """The response for a retry whose original was stored, else None."""
+        if stored is None:
+            return None
+        if stored["fingerprint"] != self.fingerprint:
+            return JsonResponse({"error": "Idempotency-Key was already used with a different payload."}, status=422)
+        response = HttpResponse(stored["content"], status=stored["status"], content_type=stored["content_type"])
+        response["Idempotent-Replayed"] = "true"
+        return response
+
+    def record(self, response) -> Optional[dict]:
+        # Server errors are not cached, so a retry gets a fresh attempt.
+        if response.status_code >= 500 or response.streaming:
+            return None
+        return {
+            "fingerprint": self.fingerprint,
+            "status": response.status_code,
+            "content": response.content,
+            "content_type": response.get("Content-Type"),
+        }
+
+
+def _in_progress():
+    return JsonResponse({"error": "A request with this Idempotency-Key is in progress."}, status=409)
+
+
+def idempotent(ttl: int = DEFAULT_TTL):
+    """Replays the stored response when a write is retried with the same Idempotency-Key.
+
+    The first request runs the view and stores its status, body and content
+    type for ttl seconds. A retry with the same key and body gets that response
+    back without running the view again; the same key with a different body is
+    rejected with 422. A retry that arrives while the original is still running
+    gets 409 so it can back off. Works on both sync and async views.
+
+    Responses and locks live in the shared cache, so a retry that lands on
+    another process still replays; the lock is a cache.add(), which only one
+    process can win. The two wrappers differ only in resolving the user and
+    awaiting the cache calls; everything else is _Attempt.
+    """
+
+    def decorator(view):
+        if iscoroutinefunction(view):
+
+            @wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                key = _idempotency_key(request)
+                if key is None:
+                    return await view(request, *args, **kwargs)
+
+                user = await request.auser() if hasattr(request, "auser") else None
+                attempt = _Attempt.build(request, getattr(user, "pk", None), key)
+                cache = get_shared_cache()
+                if (replayed := attempt.replay(await cache.aget(attempt.cache_key))) is not None:
+                    return replayed
+                if not await cache.aadd(attempt.lock_key, attempt.fingerprint, timeout=LOCK_TIMEOUT):
+                    return _in_progress()
+                try:
+                    response = await view(request, *args, **kwargs)
+                    if (record := attempt.record(response)) is not None:
+                        await cache.aset(attempt.cache_key, record, timeout=ttl)
+                finally:
+                    await cache.adelete(attempt.lock_key)
+                return response
+
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            key = _idempotency_key(request)
+            if key is None:
+                return view(request, *args, **kwargs)
+
+            user = getattr(request, "user", None)
+            attempt = _Attempt.build(request, getattr(user, "pk", None), key)
+            cache = get_shared_cache()
+            if (replayed := attempt.replay(cache.get(attempt.cache_key))) is not None:
+                return replayed
+            if not cache.add(attempt.lock_key, attempt.fingerprint, timeout=LOCK_TIMEOUT):
+                return _in_progress()
+            try:
+                response = view(request, *args, **kwargs)
+                if (record := attempt.record(response)) is not None:
+                    cache.set(attempt.cache_key, record, timeout=ttl)
+            finally:
+                cache.delete(attempt.lock_key)
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,242 @@
+"""
+On-demand request profiling.
+
+ProfilingMiddleware profiles a request when a staff user asks for it, with
+the X-Profile header or ?profile=1, or when it is picked by
+NOTIFIER_PROFILING['sample_rate']. The request runs under pyinstrument when
+it is installed (a sampling profiler, cheap enough for production) and
+under cProfile otherwise. Each profile is written to
+NOTIFIER_PROFILING['directory'] with the request's SQL queries and their
+timings. Staff browse them at /profiles/.
+
+Requests that are not profiled pay for one settings lookup and, for every
+query, one context-variable read.
+"""
+
+import cProfile
+import io
+import json
+import pstats
+import random
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone as dt_timezone
+from pathlib import Path
+from typing import List, Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+try:
+    import pyinstrument
+except ImportError:  # optional sampling profiler
+    pyinstrument = None
+
+DEFAULT_PROFILING_SETTINGS = {
+    "directory": "profiles",  # relative paths are under BASE_DIR
+    "header": "X-Profile",  # staff send this header (any value) ...
+    "param": "profile",  # ... or this query parameter to profile a request
+    "sample_rate": 0.0,  # share of all requests profiled without asking
+    "profiler": "auto",  # "auto" uses pyinstrument if installed; "cprofile" forces cProfile
+    "keep": 200,  # newest profiles kept on disk
+    "max_queries": 1000,  # SQL statements recorded per request
+}
+
+TOP_FUNCTIONS = 40
+
+_queries: ContextVar[Optional[list]] = ContextVar("profiled_queries", default=None)
+
+
+def get_profiling_settings() -> dict:
+    return {**DEFAULT_PROFILING_SETTINGS, **getattr(settings, "NOTIFIER_PROFILING", {})}
+
+
+def get_profile_directory() -> Path:
+    return Path(settings.BASE_DIR) / get_profiling_settings()["directory"]
+
+
+def record_query(execute, sql, params, many, context):
+    queries = _queries.get()
+    if queries is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        if len(queries) < get_profiling_settings()["max_queries"]:
+            queries.append(
+                {
+                    "alias": context["connection"].alias,
+                    "sql": sql,
+                    "many": many,
+                    "ms": round((time.perf_counter() - started) * 1000, 3),
+                }
+            )
+
+
+def install_query_recorder(connection) -> None:
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+# Connections are per thread (and sync_to_async runs ORM code on other
+# threads), so the recorder goes onto every connection as it is created; the
+# context variable decides whether it records anything.
+@receiver(connection_created)
+def on_connection_created(sender, connection, **kwargs):
+    install_query_recorder(connection)
+
+
+class RequestProfiler:
+    """Profiles one request and writes the result to the profile directory."""
+
+    def __init__(self, request, user, config: dict):
+        self.request = request
+        self.user = user
+        self.config = config
+        self.id = f"{datetime.now(dt_timezone.utc):%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+        if pyinstrument is not None and config["profiler"] != "cprofile":
+            self.profiler = pyinstrument.Profiler(async_mode="enabled")
+        else:
+            self.profiler = cProfile.Profile()
+        self.queries: List[dict] = []
+
+    def start(self):
+        for connection in connections.all(initialized_only=True):
+            install_query_recorder(connection)
+        self.token = _queries.set(self.queries)
+        self.started = time.perf_counter()
+        if isinstance(self.profiler, cProfile.Profile):
+            self.profiler.enable()
+        else:
+            self.profiler.start()
+
+    def stop(self, response) -> Path:
+        if isinstance(self.profiler, cProfile.Profile):
+            self.profiler.disable()
+        else:
+            self.profiler.stop()
+        elapsed = time.perf_counter() - self.started
+        _queries.reset(self.token)
+        return self.write(response, elapsed)
+
+    def summary(self) -> str:
+        if isinstance(self.profiler, cProfile.Profile):
+            out = io.StringIO()
+            pstats.Stats(self.profiler, stream=out).sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+            return out.getvalue()
+        return self.profiler.output_text(unicode=True, color=False)
+
+    def write(self, response, elapsed: float) -> Path:
+        directory = get_profile_directory()
+        directory.mkdir(parents=True, exist_ok=True)
+        match = getattr(self.request, "resolver_match", None)
+        user = self.user
+        meta = {
+            "id": self.id,
+            "created_at": datetime.now(dt_timezone.utc).isoformat(),
+            "method": self.request.method,
+            "path": self.request.get_full_path(),
+            "view": match.view_name if match else None,
+            "status": response.status_code,
+            "user": user.get_username() if user is not None and user.is_authenticated else None,
+            "duration_ms": round(elapsed * 1000, 3),
+            "profiler": "cprofile" if isinstance(self.profiler, cProfile.Profile) else "pyinstrument",
+            "query_count": len(self.queries),
+            "query_ms": round(sum(query["ms"] for query in self.queries), 3),
+            "queries": self.queries,
+            "summary": self.summary(),
+        }
+        if isinstance(self.profiler, cProfile.Profile):
+            self.profiler.dump_stats(directory / f"{self.id}.prof")
+        else:
+            (directory / f"{self.id}.html").write_text(self.profiler.output_html())
+        path = directory / f"{self.id}.json"
+        path.write_text(json.dumps(meta, indent=1))
+        prune_profiles(directory, self.config["keep"])
+        return path
+
+
+def prune_profiles(directory: Path, keep: int) -> None:
+    for path in sorted(directory.glob("*.json"), reverse=True)[keep:]:
+        for artifact in directory.glob(f"{path.stem}.*"):
+            artifact.unlink(missing_ok=True)
+
+
+def list_profiles(directory: Optional[Path] = None) -> List[dict]:
+    """Newest first, without the bulky query list and summary."""
+    directory = directory or get_profile_directory()
+    profiles = []
+    for path in sorted(directory.glob("*.json"), reverse=True):
+        meta = json.loads(path.read_text())
+        meta.pop("queries", None)
+        meta.pop("summary", None)
+        profiles.append(meta)
+    return profiles
+
+
+def load_profile(profile_id: str, directory: Optional[Path] = None) -> Optional[dict]:
+    directory = directory or get_profile_directory()
+    path = directory / f"{profile_id}.json"
+    # Ids come from URLs; only ever open files directly inside the directory.
+    if path.parent != directory or not path.is_file():
+        return None
+    meta = json.loads(path.read_text())
+    meta["artifact"] = next(
+        (artifact.name for artifact in directory.glob(f"{profile_id}.*") if artifact.suffix != ".json"), None
+    )
+    return meta
+
+
+class ProfilingMiddleware:
+    """Runs selected requests under a profiler; see the module docstring."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        config = get_profiling_settings()
+        profiler = None
+        if (self.asked(request, config) and request.user.is_staff) or self.sampled(config):
+            profiler = RequestProfiler(request, request.user, config)
+        if profiler is None:
+            return self.get_response(request)
+        profiler.start()
+        response = self.get_response(request)
+        self.finish(profiler, response)
+        return response
+
+    async def __acall__(self, request):
+        config = get_profiling_settings()
+        profiler = None
+        # request.user would load the session synchronously; auser() does not.
+        if (self.asked(request, config) and (await request.auser()).is_staff) or self.sampled(config):
+            profiler = RequestProfiler(request, await request.auser(), config)
+        if profiler is None:
+            return await self.get_response(request)
+        profiler.start()
+        response = await self.get_response(request)
+        self.finish(profiler, response)
+        return response
+
+    def asked(self, request, config: dict) -> bool:
+        return config["header"] in request.headers or config["param"] in request.GET
+
+    def sampled(self, config: dict) -> bool:
+        return bool(config["sample_rate"]) and random.random() < config["sample_rate"]
+
+    def finish(self, profiler: RequestProfiler, response):
+        path = profiler.stop(response)
+        response["X-Profile-Id"] = path.stem
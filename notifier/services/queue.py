@@ -0,0 +1,149 @@
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from django.db import connection, transaction
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+
+from notifier.models import Notification
+from notifier.services.backends import CallableBackend, DeliveryBackend
+from notifier.services.circuit_breaker import CircuitBreaker
+from notifier.services.delivery import deliver_batch
+from notifier.services.rate_limiting import SendRateLimiter
+
+
+@dataclass
+class Claim:
+    token: str
+    lease_expires_at: datetime
+    notifications: List[Notification]
+
+
+# Lanes in the order workers drain them.
+LANES = [Notification.PRIORITY_HIGH, Notification.PRIORITY_NORMAL, Notification.PRIORITY_BULK]
+
+
+def claimable(now: datetime, priority: Optional[int] = None) -> QuerySet:
+    """Queued rows that are due and not held by a live lease."""
+    # Buffered digest rows are merged by notifier/services/digests.py first.
+    queryset = Notification.objects.filter(status="queued", digest=False, send_at__lte=now).filter(
+        Q(lease_expires_at__isnull=True) | Q(lease_expires_at__lt=now)
+    )
+    if priority is not None:
+        queryset = queryset.filter(priority=priority)
+    return queryset
+
+
+def select_candidates(now: datetime, batch_size: int, lane_min_share: float) -> List[int]:
+    """Picks ids for one batch, highest-priority lane first.
+
+    Starvation guard: every lower lane keeps lane_min_share of the batch
+    reserved for it, so a steady stream of urgent notifications cannot stall
+    bulk sends completely. Reserved slots a lane does not need are handed back
+    to the higher lanes in a second pass. Reserves shrink so the top lane
+    always gets at least one slot (batches of 1 or 2 reserve nothing).
+    """
+    reserve = max(1, int(batch_size * lane_min_share)) if lane_min_share else 0
+    # The top lane always keeps at least one slot; tiny batches reserve nothing.
+    reserve = min(reserve, (batch_size - 1) // (len(LANES) - 1))
+    ids: List[int] = []
+    exhausted = set()
+
+    def take(lane, limit):
+        candidates = claimable(now, lane).exclude(id__in=ids).order_by("send_at", "id")
+        if connection.features.has_select_for_update_skip_locked:
+            # Postgres/MySQL: skip rows another worker is claiming right now.
+            candidates = candidates.select_for_update(skip_locked=True)
+        found = list(candidates.values_list("id", flat=True)[:limit])
+        if len(found) < limit:
+            exhausted.add(lane)
+        ids.extend(found)
+
+    # First pass: lower lanes get only their reserved slots, the top lane the rest.
+    for position, lane in enumerate(LANES):
+        limit = batch_size - reserve * (len(LANES) - 1) if position == 0 else reserve
+        limit = min(limit, batch_size - len(ids))
+        if limit > 0:
+            take(lane, limit)
+
+    for lane in LANES:
+        remaining = batch_size - len(ids)
+        if remaining <= 0:
+            break
+        if lane not in exhausted:
+            take(lane, remaining)
+
+    return ids
+
+
+def claim_batch(
+    worker_id: str,
+    batch_size: int,
+    lease_seconds: int,
+    now: Optional[datetime] = None,
+    lane_min_share: float = 0.1,
+) -> Claim:
+    """Atomically leases up to batch_size queued notifications to one worker.
+
+    The UPDATE repeats the claimable() conditions, so when two workers pick the
+    same candidate ids only one of them actually takes each row; the loser gets
+    whatever is left. Expired leases (a crashed worker) match claimable() again
+    and are picked up by the next claim.
+    """
+    now = now or timezone.now()
+    token = f"{worker_id}:{uuid.uuid4().hex[:12]}"
+    lease_expires_at = now + timedelta(seconds=lease_seconds)
+
+    with transaction.atomic():
+        ids = select_candidates(now, batch_size, lane_min_share)
+        if ids:
+            claimable(now).filter(id__in=ids).update(claimed_by=token, lease_expires_at=lease_expires_at)
+
+    notifications = list(
+        Notification.objects.filter(id__in=ids, claimed_by=token)
+        .select_related("recipient", "contact")
+        .order_by("priority", "send_at", "id")
+    )
+    return Claim(token=token, lease_expires_at=lease_expires_at, notifications=notifications)
+
+
+def release(claim: Claim) -> int:
+    return Notification.objects.filter(
+        id__in=[notification.id for notification in claim.notifications],
+        claimed_by=claim.token,
+    ).update(claimed_by="", lease_expires_at=None)
+
+
+def process_claim(
+    claim: Claim,
+    backend,
+    provider: str = "default",
+    limiter: Optional[SendRateLimiter] = None,
+    safety_margin: int = 5,
+    breaker: Optional[CircuitBreaker] = None,
+) -> dict:
+    """Delivers every notification in the claim, then releases the lease.
+
+    backend is a DeliveryBackend (or a plain send_callable, sent one at a
+    time); the claim goes to it backend.batch_size notifications at a time.
+    Stops early once the lease is about to expire: the remaining rows may
+    already be reclaimed by another worker, and sending them here as well
+    would double-send.
+    """
+    if not isinstance(backend, DeliveryBackend):
+        backend = CallableBackend(backend)
+    notifications = claim.notifications
+    outcomes = {"success": 0, "deferred": 0, "error": 0, "skipped": 0}
+    try:
+        for start in range(0, len(notifications), backend.batch_size):
+            if timezone.now() >= claim.lease_expires_at - timedelta(seconds=safety_margin):
+                outcomes["skipped"] = len(notifications) - start
+                break
+            batch = notifications[start : start + backend.batch_size]
+            for payload in deliver_batch(batch, backend, provider=provider, limiter=limiter, breaker=breaker):
+                outcomes[payload["status"]] += 1
+    finally:
+        release(claim)
+    return outcomes
@@ -0,0 +1,129 @@
+import hashlib
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+from django.conf import settings
+from django.db import connections, router, transaction
+
+from notifier.models import RateBucket
+
+
+@dataclass(frozen=True)
+class BucketConfig:
+    rate: float  # tokens added per second
+    capacity: int  # maximum burst
+
+    @classmethod
+    def from_setting(cls, value: dict) -> "BucketConfig":
+        return cls(rate=float(value["rate"]), capacity=int(value["capacity"]))
+
+
+class _BucketEmpty(Exception):
+    """Rolls back the takes already made in an acquire() that cannot complete."""
+
+
+class TokenBucket:
+    """Token bucket whose state (tokens, last refill time) is a RateBucket row."""
+
+    def __init__(self, name: str, config: BucketConfig):
+        self.name = name
+        self.config = config
+
+    def _take_sql(self, connection) -> str:
+        table = connection.ops.quote_name(RateBucket._meta.db_table)
+        least, greatest = ("LEAST", "GREATEST") if connection.vendor == "postgresql" else ("MIN", "MAX")
+        # Refilled level; "excluded.updated_at" is the now of this take.
+        level = f"{least}(%s, {table}.tokens + {greatest}(excluded.updated_at - {table}.updated_at, 0) * %s)"
+        return (
+            f"INSERT INTO {table} (name, tokens, updated_at, full_at) VALUES (%s, %s, %s, %s) "
+            f"ON CONFLICT (name) DO UPDATE SET tokens = {level} - 1, updated_at = excluded.updated_at, "
+            f"full_at = excluded.updated_at + (%s - ({level} - 1)) / %s "
+            f"WHERE {level} >= 1 RETURNING tokens"
+        )
+
+    def take(self, cursor, now: float) -> bool:
+        """Refills and spends one token in one statement; False if the bucket is empty.
+
+        A missing row is a full bucket, so it is inserted already spent by one.
+        """
+        capacity, rate = self.config.capacity, self.config.rate
+        cursor.execute(
+            self._take_sql(cursor.db),
+            [
+                self.name, capacity - 1, now, now + 1 / rate,
+                capacity, rate,
+                capacity, capacity, rate, rate,
+                capacity, rate,
+            ],
+        )
+        return cursor.fetchone() is not None
+
+    def peek(self, state: Optional[tuple], now: float) -> float:
+        if state is None:
+            return float(self.config.capacity)
+        tokens, updated_at = state
+        return min(self.config.capacity, tokens + max(now - updated_at, 0) * self.config.rate)
+
+    def delay_for(self, tokens: float) -> float:
+        """Seconds until one token is available, given the current level."""
+        return max(0.0, (1 - tokens) / self.config.rate)
+
+
+class SendRateLimiter:
+    """Paces sends per provider and per recipient.
+
+    acquire() never blocks on an empty bucket: it either takes a token from
+    both buckets and returns 0, or takes nothing and returns how many seconds
+    to defer the send. Buckets are RateBucket rows shared by the web process
+    and every worker. Each take is one conditional upsert, and a send's takes
+    share one short transaction that rolls back if any bucket is empty.
+    """
+
+    def __init__(self, providers: dict, recipient: Optional[dict] = None):
+        self.providers = {name: BucketConfig.from_setting(value) for name, value in providers.items()}
+        self.recipient = BucketConfig.from_setting(recipient) if recipient else None
+
+    def _buckets(self, provider: str, recipient: str) -> List[TokenBucket]:
+        buckets = []
+        if provider in self.providers:
+            buckets.append(TokenBucket(f"provider:{provider}", self.providers[provider]))
+        if self.recipient:
+            digest = hashlib.sha1(recipient.lower().encode()).hexdigest()
+            buckets.append(TokenBucket(f"recipient:{digest}", self.recipient))
+        return buckets
+
+    def acquire(self, provider: str, recipient: str, now: Optional[float] = None) -> float:
+        now = time.time() if now is None else now
+        buckets = self._buckets(provider, recipient)
+        if not buckets:
+            return 0.0
+        using = router.db_for_write(RateBucket)
+        try:
+            with transaction.atomic(using=using), connections[using].cursor() as cursor:
+                for bucket in buckets:
+                    if not bucket.take(cursor, now):
+                        raise _BucketEmpty
+        except _BucketEmpty:
+            # The takes are rolled back; the deferral only needs a fresh read.
+            rows = RateBucket.objects.using(using).filter(name__in=[bucket.name for bucket in buckets])
+            states = {name: (tokens, updated_at) for name, tokens, updated_at in rows.values_list(
+                "name", "tokens", "updated_at"
+            )}
+            return max(bucket.delay_for(bucket.peek(states.get(bucket.name), now)) for bucket in buckets)
+        return 0.0
+
+
+def prune_rate_buckets(now: Optional[float] = None) -> int:
+    """Deletes buckets that have refilled completely; returns how many."""
+    now = time.time() if now is None else now
+    deleted, _ = RateBucket.objects.filter(full_at__lte=now).delete()
+    return deleted
+
+
+def get_send_rate_limiter() -> Optional[SendRateLimiter]:
+    """Builds the limiter from settings.NOTIFIER_RATE_LIMITS, if configured."""
+    limits = getattr(settings, "NOTIFIER_RATE_LIMITS", None)
+    if not limits:
+        return None
+    return SendRateLimiter(limits.get("providers", {}), limits.get("recipient"))
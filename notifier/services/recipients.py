@@ -0,0 +1,60 @@
+from typing import Iterable, List, Optional
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+
+from notifier.models import Recipient, Segment, SegmentMembership
+
+
+def clean_records(records: Iterable[dict]) -> tuple:
+    """Normalises uploaded rows; returns (valid records, number skipped).
+
+    Emails are trimmed and lower-cased, invalid ones are skipped, and a
+    repeated email keeps its last row.
+    """
+    cleaned = {}
+    skipped = 0
+    for record in records:
+        email = str(record.get("email") or "").strip().lower()
+        try:
+            validate_email(email)
+        except ValidationError:
+            skipped += 1
+            continue
+        cleaned[email] = {
+            "email": email,
+            "first_name": str(record.get("first_name") or "").strip()[:150],
+            "last_name": str(record.get("last_name") or "").strip()[:150],
+        }
+    return list(cleaned.values()), skipped
+
+
+def upsert_recipients(records: List[dict], segment: Optional[Segment] = None, batch_size: int = 1000) -> int:
+    """Creates or updates recipients by email, optionally adding them to segment.
+
+    Each batch is one INSERT ... ON CONFLICT DO UPDATE, plus one lookup and
+    one INSERT for the memberships, whatever the number of rows.
+    """
+    with transaction.atomic():
+        for start in range(0, len(records), batch_size):
+            batch = records[start:start + batch_size]
+            Recipient.objects.bulk_create(
+                [Recipient(**record) for record in batch],
+                update_conflicts=True,
+                unique_fields=["email"],
+                update_fields=["first_name", "last_name"],
+            )
+            if segment is not None:
+                ids = Recipient.objects.filter(email__in=[record["email"] for record in batch]).values_list(
+                    "id", flat=True
+                )
+                add_members(segment, ids)
+    return len(records)
+
+
+def add_members(segment: Segment, recipient_ids: Iterable[int]) -> None:
+    SegmentMembership.objects.bulk_create(
+        [SegmentMembership(segment=segment, recipient_id=recipient_id) for recipient_id in recipient_ids],
+        ignore_conflicts=True,
+    )
@@ -0,0 +1,93 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.template import Context
+from django.template.autoreload import reset_loaders
+from django.template.loader import get_template
+
+
+@dataclass
+class RenderStats:
+    renders: int = 0
+    total_seconds: float = 0.0
+
+    def as_dict(self) -> dict:
+        mean_ms = self.total_seconds / self.renders * 1000 if self.renders else 0.0
+        return {"renders": self.renders, "total_seconds": self.total_seconds, "mean_ms": mean_ms}
+
+
+class TemplateRenderer:
+    """Compiles notification templates once and renders them in batches.
+
+    Compiled templates are cached by name, at most max_templates of them,
+    least recently used first out. After editing template files, call clear(),
+    which also resets Django's cached template loaders so the edit is read.
+    render_many() reuses one Context across every recipient instead of
+    building the full render_to_string() machinery per message.
+    """
+
+    def __init__(self, max_templates: int = 128):
+        self.max_templates = max_templates
+        self._compiled: "OrderedDict[str, object]" = OrderedDict()
+        self._stats: Dict[str, RenderStats] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str):
+        with self._lock:
+            compiled = self._compiled.get(name)
+            if compiled is not None:
+                self._compiled.move_to_end(name)
+                return compiled
+        # get_template() returns the backend wrapper; keep the engine-level
+        # Template so rendering skips the wrapper's per-call context setup.
+        compiled = get_template(name).template
+        with self._lock:
+            self._compiled[name] = compiled
+            while len(self._compiled) > self.max_templates:
+                self._compiled.popitem(last=False)
+        return compiled
+
+    def render(self, name: str, context: dict) -> str:
+        return self.render_many(name, [context])[0]
+
+    def render_many(self, name: str, contexts: Iterable[dict]) -> List[str]:
+        compiled = self.get(name)
+        context = Context(autoescape=compiled.engine.autoescape)
+        rendered = []
+        started = time.perf_counter()
+        for values in contexts:
+            with context.push(values):
+                rendered.append(compiled.render(context))
+        self._record(name, len(rendered), time.perf_counter() - started)
+        return rendered
+
+    def _record(self, name: str, renders: int, seconds: float) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(name, RenderStats())
+            stats.renders += renders
+            stats.total_seconds += seconds
+
+    def stats(self) -> dict:
+        """Per-template render counts and timings."""
+        with self._lock:
+            return {name: stats.as_dict() for name, stats in self._stats.items()}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._compiled.clear()
+            self._stats.clear()
+        reset_loaders()
+
+
+renderer = TemplateRenderer()
+
+
+@receiver(setting_changed)
+def clear_on_templates_change(sender, setting, **kwargs):
+    if setting == "TEMPLATES":
+        renderer.clear()
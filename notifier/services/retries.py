@@ -0,0 +1,73 @@
+import random
+from datetime import datetime, timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.db.models import F, QuerySet
+from django.utils import timezone
+
+from notifier.models import Notification
+from notifier.services.events import broadcaster
+
+DEFAULT_RETRY_POLICY = {
+    "max_attempts": 5,
+    "base_delay": 30,  # seconds before the first retry
+    "max_delay": 60 * 60,  # cap for any single backoff
+}
+
+
+def get_retry_policy() -> dict:
+    return {**DEFAULT_RETRY_POLICY, **getattr(settings, "NOTIFIER_RETRY_POLICY", {})}
+
+
+def compute_backoff(attempt: int, base_delay: float, max_delay: float, rng=random) -> float:
+    """Exponential backoff with "equal jitter".
+
+    The ceiling doubles per attempt (base, 2*base, 4*base, ... up to max_delay).
+    Half of it is fixed and half is random, so retries never fire immediately
+    but a burst of failures still spreads out instead of retrying in lockstep.
+    """
+    ceiling = min(max_delay, base_delay * 2 ** max(attempt - 1, 0))
+    return ceiling / 2 + rng.uniform(0, ceiling / 2)
+
+
+def record_failure(
+    notification: Notification,
+    error,
+    now: Optional[datetime] = None,
+    permanent: bool = False,
+) -> Notification:
+    """Counts a failed attempt and either schedules a retry or dead-letters it.
+
+    permanent=True skips straight to the dead-letter state for errors that no
+    retry can fix (e.g. a recipient without an email address).
+    """
+    now = now or timezone.now()
+    policy = get_retry_policy()
+
+    notification.attempts += 1
+    notification.last_error = str(error)
+    notification.last_failed_at = now
+    if permanent or notification.attempts >= policy["max_attempts"]:
+        notification.status = "dead"
+        notification.next_attempt_at = None
+    else:
+        delay = compute_backoff(notification.attempts, policy["base_delay"], policy["max_delay"])
+        notification.status = "failed"
+        notification.next_attempt_at = now + timedelta(seconds=delay)
+
+    notification.save(update_fields=["attempts", "last_error", "last_failed_at", "status", "next_attempt_at"])
+    return notification
+
+
+def due_retries(now: Optional[datetime] = None) -> QuerySet:
+    # Matches the partial index notification_retry_due_idx.
+    return Notification.objects.filter(status="failed", next_attempt_at__lte=now or timezone.now())
+
+
+def requeue_due_retries(now: Optional[datetime] = None) -> int:
+    """Moves every retry that is due back to "queued" in one UPDATE."""
+    moved = due_retries(now).update(status="queued", send_at=F("next_attempt_at"))
+    if moved:
+        broadcaster.publish_counts({"failed": -moved, "queued": moved})
+    return moved
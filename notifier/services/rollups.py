@@ -0,0 +1,165 @@
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max, Min
+from django.db.models.functions import TruncMinute
+from django.utils import timezone
+
+from notifier.models import DeliveryRollup, Notification
+from notifier.utils.serialization import isoformat_z
+
+# Upper edges, in seconds, of the latency histogram slots. One extra slot at
+# the end holds anything slower than the last edge.
+LATENCY_BOUNDS = (
+    0.1, 0.2, 0.5, 1, 2, 5, 10, 20, 30, 60, 120, 300, 600, 1200, 1800, 3600, 7200, 14400, 43200, 86400,
+)
+
+DEFAULT_ROLLUP_SETTINGS = {
+    "grace": 5 * 60,  # recent minutes are rolled up again to catch late commits
+    "minute_retention": 2 * 24 * 60 * 60,  # must exceed an hour plus grace
+}
+
+
+def get_rollup_settings() -> dict:
+    return {**DEFAULT_ROLLUP_SETTINGS, **getattr(settings, "NOTIFIER_ROLLUPS", {})}
+
+
+def empty_histogram() -> list:
+    return [0] * (len(LATENCY_BOUNDS) + 1)
+
+
+def latency_slot(seconds: float) -> int:
+    return bisect_left(LATENCY_BOUNDS, seconds)
+
+
+def percentile(histogram: list, q: float) -> Optional[float]:
+    """Estimates a latency percentile, interpolating inside the matching slot."""
+    total = sum(histogram)
+    if not total:
+        return None
+    rank = q * total
+    seen = 0
+    for slot, count in enumerate(histogram):
+        if count and seen + count >= rank:
+            lower = LATENCY_BOUNDS[slot - 1] if slot else 0.0
+            upper = LATENCY_BOUNDS[min(slot, len(LATENCY_BOUNDS) - 1)]
+            return lower + (upper - lower) * (rank - seen) / count
+        seen += count
+    return float(LATENCY_BOUNDS[-1])
+
+
+def build_rollup(granularity: str, bucket: datetime, sent: int, failed: int, histogram: list) -> DeliveryRollup:
+    return DeliveryRollup(
+        granularity=granularity,
+        bucket=bucket,
+        sent=sent,
+        failed=failed,
+        latency_histogram=histogram,
+        latency_p50=percentile(histogram, 0.5),
+        latency_p95=percentile(histogram, 0.95),
+        latency_p99=percentile(histogram, 0.99),
+    )
+
+
+def floor_minute(value: datetime) -> datetime:
+    return value.replace(second=0, microsecond=0)
+
+
+def floor_hour(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def rollup_start(now: datetime, grace: int) -> Optional[datetime]:
+    last = DeliveryRollup.objects.filter(granularity=DeliveryRollup.MINUTE).aggregate(last=Max("bucket"))["last"]
+    if last is not None:
+        # Pick up where the last run stopped, or re-roll the grace period.
+        return floor_minute(min(last, now - timedelta(seconds=grace)))
+    first = Notification.objects.aggregate(sent=Min("sent_at"), failed=Min("last_failed_at"))
+    earliest = [value for value in first.values() if value is not None]
+    return floor_minute(min(earliest)) if earliest else None
+
+
+def roll_up_deliveries(now: Optional[datetime] = None) -> int:
+    """Brings the minute and hour rollups up to date and returns minutes written.
+
+    Only notifications sent or failed since the previous run are read: sent
+    rows are streamed to fill each minute's latency histogram, and failures
+    are counted per minute in SQL. Hours affected by those minutes are then
+    rebuilt by summing minute rows, never from the notifications table.
+    A notification that fails repeatedly is counted at its latest failure.
+    """
+    now = now or timezone.now()
+    config = get_rollup_settings()
+    start = rollup_start(now, config["grace"])
+    if start is None:
+        return 0
+
+    minutes = defaultdict(lambda: {"sent": 0, "failed": 0, "histogram": empty_histogram()})
+    sent_rows = (
+        Notification.objects.filter(sent_at__gte=start, sent_at__lt=now)
+        .values_list("sent_at", "created_at")
+        .order_by()
+        .iterator(chunk_size=2000)
+    )
+    for sent_at, created_at in sent_rows:
+        minute = minutes[floor_minute(sent_at)]
+        minute["sent"] += 1
+        minute["histogram"][latency_slot((sent_at - created_at).total_seconds())] += 1
+
+    failures = (
+        Notification.objects.filter(last_failed_at__gte=start, last_failed_at__lt=now)
+        .annotate(minute=TruncMinute("last_failed_at", tzinfo=dt_timezone.utc))
+        .values_list("minute")
+        .annotate(total=Count("id"))
+        .order_by()
+    )
+    for minute, total in failures:
+        minutes[minute]["failed"] = total
+
+    hour_start = floor_hour(start)
+    with transaction.atomic():
+        DeliveryRollup.objects.filter(granularity=DeliveryRollup.MINUTE, bucket__gte=start).delete()
+        DeliveryRollup.objects.bulk_create(
+            build_rollup(DeliveryRollup.MINUTE, bucket, values["sent"], values["failed"], values["histogram"])
+            for bucket, values in minutes.items()
+        )
+
+        hours = defaultdict(lambda: {"sent": 0, "failed": 0, "histogram": empty_histogram()})
+        minute_rows = DeliveryRollup.objects.filter(
+            granularity=DeliveryRollup.MINUTE, bucket__gte=hour_start
+        ).values_list("bucket", "sent", "failed", "latency_histogram")
+        for bucket, sent, failed, histogram in minute_rows:
+            hour = hours[floor_hour(bucket)]
+            hour["sent"] += sent
+            hour["failed"] += failed
+            hour["histogram"] = [total + count for total, count in zip(hour["histogram"], histogram)]
+        DeliveryRollup.objects.filter(granularity=DeliveryRollup.HOUR, bucket__gte=hour_start).delete()
+        DeliveryRollup.objects.bulk_create(
+            build_rollup(DeliveryRollup.HOUR, bucket, values["sent"], values["failed"], values["histogram"])
+            for bucket, values in hours.items()
+        )
+
+        DeliveryRollup.objects.filter(
+            granularity=DeliveryRollup.MINUTE,
+            bucket__lt=now - timedelta(seconds=config["minute_retention"]),
+        ).delete()
+    return len(minutes)
+
+
+def recent_rollups(granularity: str, since: datetime, limit: int = 1440):
+    return DeliveryRollup.objects.filter(granularity=granularity, bucket__gte=since).order_by("bucket")[:limit]
+
+
+def serialise_rollup(rollup: DeliveryRollup) -> dict:
+    return {
+        "bucket": isoformat_z(rollup.bucket),
+        "sent": rollup.sent,
+        "failed": rollup.failed,
+        "latency_p50": rollup.latency_p50,
+        "latency_p95": rollup.latency_p95,
+        "latency_p99": rollup.latency_p99,
+    }
@@ -0,0 +1,69 @@
+import re
+from typing import List, Tuple
+
+from django.db import connections, router
+from django.db.models import Q, QuerySet
+from django.db.models.expressions import RawSQL
+
+from notifier.models import Document
+
+# Relative bm25 weight of each indexed column (see migration 0009): a hit in a
+# title outranks the same hit in a description.
+DOCUMENT_WEIGHTS = (10.0, 1.0)
+
+
+def to_match_query(text: str) -> str:
+    """Turns free text into a safe FTS5 query: every word must match, the last as a prefix.
+
+    Quoting each token keeps user input from being parsed as FTS5 syntax
+    (AND/OR/NEAR, column filters, unbalanced quotes).
+    """
+    tokens = re.findall(r"\w+", text)
+    if not tokens:
+        return ""
+    quoted = [f'"{token}"' for token in tokens]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def uses_fts(model) -> bool:
+    return connections[router.db_for_read(model)].vendor == "sqlite"
+
+
+def fts_match(model, text: str) -> RawSQL:
+    """Subquery of ids matching text, for use as .filter(id__in=...)."""
+    table = f"{model._meta.db_table}_fts"
+    return RawSQL(f"SELECT rowid FROM {table} WHERE {table} MATCH %s", [to_match_query(text)])
+
+
+def search_documents(text: str, page: int = 1, per_page: int = 20) -> Tuple[List[Document], bool]:
+    """Returns one page of documents ranked by relevance, and whether another page exists."""
+    if not to_match_query(text):
+        return [], False
+    offset = (page - 1) * per_page
+
+    if not uses_fts(Document):
+        documents = list(
+            Document.objects.filter(Q(title__icontains=text) | Q(description__icontains=text))
+            .order_by("-uploaded_at")[offset:offset + per_page + 1]
+        )
+        return documents[:per_page], len(documents) > per_page
+
+    alias = router.db_for_read(Document)
+    with connections[alias].cursor() as cursor:
+        cursor.execute(
+            "SELECT rowid FROM notifier_document_fts WHERE notifier_document_fts MATCH %s "
+            "ORDER BY bm25(notifier_document_fts, %s, %s) LIMIT %s OFFSET %s",
+            [to_match_query(text), *DOCUMENT_WEIGHTS, per_page + 1, offset],
+        )
+        ids = [row[0] for row in cursor.fetchall()]
+
+    found = Document.objects.using(alias).in_bulk(ids[:per_page])
+    return [found[pk] for pk in ids[:per_page] if pk in found], len(ids) > per_page
+
+
+def search_queryset(queryset: QuerySet, text: str) -> QuerySet:
+    """Narrows a queryset to rows whose indexed text matches."""
+    if not to_match_query(text):
+        return queryset
+    return queryset.filter(id__in=fts_match(queryset.model, text))
@@ -0,0 +1,55 @@
+"""
+Cache for state that every process must see.
+
+CACHES['default'] is per process (LocMem) and only holds data that is fine
+to rebuild or serve slightly stale, like the document list. Rate-limit
+buckets, circuit breakers and idempotency records must be the same for the
+web process and every run_worker process, so they go to the cache named by
+settings.NOTIFIER_SHARED_CACHE ('shared', a DatabaseCache by default).
+
+shared_lock() is a cross-process mutex built on cache.add(), which only one
+caller can win on a shared backend. It serialises the read-modify-write of
+bucket and breaker state.
+"""
+
+import logging
+import time
+import uuid
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+LOCK_PREFIX = "notifier.lock"
+
+
+def get_shared_cache():
+    return caches[getattr(settings, "NOTIFIER_SHARED_CACHE", "shared")]
+
+
+@contextmanager
+def shared_lock(name: str, timeout: float = 5.0, poll: float = 0.005):
+    """Holds a lock on name across processes for at most timeout seconds.
+
+    A holder that dies leaves the lock to expire after timeout. A caller that
+    still has not got it by then logs a warning and goes ahead unlocked, so a
+    stuck lock can slow sends down but never stop them.
+    """
+    cache = get_shared_cache()
+    key = f"{LOCK_PREFIX}:{name}"
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + timeout
+    acquired = cache.add(key, token, timeout=timeout)
+    while not acquired and time.monotonic() < deadline:
+        time.sleep(poll)
+        acquired = cache.add(key, token, timeout=timeout)
+    if not acquired:
+        logger.warning("[LOCK] %s still held after %.1fs; going ahead without it", name, timeout)
+    try:
+        yield acquired
+    finally:
+        # Only release our own lock, not one taken after ours expired.
+        if acquired and cache.get(key) == token:
+            cache.delete(key)
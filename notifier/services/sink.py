@@ -0,0 +1,189 @@
+"""
+A local stand-in for a delivery provider, for tests and benchmarks.
+
+DeliverySink accepts mail over SMTP and batches over HTTP (the request format
+HTTPBackend sends) and only counts what it receives. Start it with
+`manage.py run_delivery_sink`, or in-process:
+
+    with DeliverySink() as sink:
+        ...  # point SMTPBackend at sink.smtp_port, HTTPBackend at sink.http_url
+        sink.stats.messages
+
+Addresses in `reject` are refused (SMTP 550, or an HTTP "error" result) so
+per-message failures can be exercised as well.
+"""
+
+import asyncio
+import itertools
+import json
+import threading
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterable, Optional
+
+
+@dataclass
+class SinkStats:
+    connections: int = 0
+    messages: int = 0
+    rejected: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add(self, **counts) -> None:
+        with self.lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+
+class DeliverySink:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        smtp_port: int = 0,
+        http_port: int = 0,
+        reject: Iterable[str] = (),
+    ):
+        self.host = host
+        self.smtp_port = smtp_port
+        self.http_port = http_port
+        self.reject = {address.lower() for address in reject}
+        self.stats = SinkStats()
+        self._ids = itertools.count(1)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._http: Optional[ThreadingHTTPServer] = None
+        self._threads = []
+
+    @property
+    def http_url(self) -> str:
+        return f"http://{self.host}:{self.http_port}/send"
+
+    def next_id(self) -> str:
+        return f"sink-{next(self._ids)}"
+
+    # SMTP: just enough of RFC 5321 for smtplib (and so Django's backend).
+
+    async def _smtp_session(self, reader, writer):
+        self.stats.add(connections=1)
+
+        def reply(line: str):
+            writer.write(line.encode() + b"\r\n")
+
+        reply("220 notifier-sink ESMTP")
+        recipients = []
+        while line := await reader.readline():
+            command = line.decode("latin-1").strip()
+            verb = command[:4].upper()
+            if verb == "EHLO":
+                reply("250-notifier-sink")
+                reply("250 8BITMIME")
+            elif verb in ("HELO", "NOOP"):
+                reply("250 OK")
+            elif verb in ("MAIL", "RSET"):
+                recipients = []
+                reply("250 OK")
+            elif verb == "RCPT":
+                address = command.partition(":")[2].strip().strip("<>").lower()
+                if address in self.reject:
+                    self.stats.add(rejected=1)
+                    reply("550 Mailbox unavailable")
+                else:
+                    recipients.append(address)
+                    reply("250 OK")
+            elif verb == "DATA":
+                if not recipients:
+                    reply("503 No valid recipients")
+                    continue
+                reply("354 End data with <CR><LF>.<CR><LF>")
+                while await reader.readline() not in (b".\r\n", b""):
+                    pass
+                self.stats.add(messages=1)
+                recipients = []
+                reply(f"250 OK queued as {self.next_id()}")
+            elif verb == "QUIT":
+                reply("221 Bye")
+                await writer.drain()
+                break
+            else:
+                reply("502 Command not implemented")
+            await writer.drain()
+        writer.close()
+
+    def _run_smtp(self, started: threading.Event):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        server = self._loop.run_until_complete(asyncio.start_server(self._smtp_session, self.host, self.smtp_port))
+        self.smtp_port = server.sockets[0].getsockname()[1]
+        started.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            server.close()
+            sessions = asyncio.all_tasks(self._loop)
+            for session in sessions:
+                session.cancel()
+            self._loop.run_until_complete(asyncio.gather(*sessions, return_exceptions=True))
+            self._loop.run_until_complete(server.wait_closed())
+            self._loop.close()
+
+    # HTTP: the batch format of notifier.services.backends.HTTPBackend.
+
+    def _http_handler(self):
+        sink = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like a real provider
+
+            def setup(self):
+                super().setup()
+                sink.stats.add(connections=1)
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                results = []
+                for message in json.loads(body)["messages"]:
+                    if message["to"].lower() in sink.reject:
+                        sink.stats.add(rejected=1)
+                        results.append({"error": "Mailbox unavailable"})
+                    else:
+                        sink.stats.add(messages=1)
+                        results.append({"id": sink.next_id()})
+                payload = json.dumps({"results": results}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "DeliverySink":
+        started = threading.Event()
+        smtp_thread = threading.Thread(target=self._run_smtp, args=(started,), daemon=True)
+        smtp_thread.start()
+        started.wait()
+
+        self._http = ThreadingHTTPServer((self.host, self.http_port), self._http_handler())
+        self._http.daemon_threads = True
+        self.http_port = self._http.server_address[1]
+        http_thread = threading.Thread(target=self._http.serve_forever, daemon=True)
+        http_thread.start()
+        self._threads = [smtp_thread, http_thread]
+        return self
+
+    def stop(self) -> None:
+        if self._http is not None:
+            self._http.shutdown()
+            self._http.server_close()
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        for thread in self._threads:
+            thread.join(timeout=5)
+
+    def __enter__(self) -> "DeliverySink":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
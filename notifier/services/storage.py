@@ -0,0 +1,399 @@
+"""
+Content-addressed storage for uploaded document files.
+
+Each file is stored once, under its SHA-256: <root>/ab/cd/abcd.... Uploading
+the same bytes again reuses the stored copy. Uploads stream chunk by chunk
+into a temporary file under <root>/tmp and are hashed on the way. The
+finished file is renamed into place, so a file is never held in memory
+and no half-written file ever appears under a hash name.
+
+Stored files are never deleted when a document goes away: another upload
+of the same bytes may be about to reference them. collect_garbage() (the
+collect_document_files command) removes files that no document references
+and that have not been written or re-uploaded for NOTIFIER_FILES['gc_grace']
+seconds, together with abandoned temp files and blobs from uploads that
+failed before their document was saved.
+
+ContentAddressedUploadHandler plugs this into Django's upload machinery.
+blob_response() serves a stored file with conditional and single-range
+requests. It uses sendfile under WSGI servers that provide
+wsgi.file_wrapper, or hands the file to the web server via
+NOTIFIER_FILES['sendfile_header'] (X-Accel-Redirect for nginx,
+X-Sendfile for Apache/lighttpd).
+"""
+
+import hashlib
+import os
+import re
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler, StopUpload
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.http import content_disposition_header, http_date
+
+DEFAULT_FILES_SETTINGS = {
+    "root": "media/documents",  # relative paths are under BASE_DIR
+    "chunk_size": 64 * 1024,  # bytes read per upload chunk and per response block
+    "max_size": 512 * 1024 * 1024,  # larger uploads are cut off
+    "sendfile_header": None,  # "X-Accel-Redirect" or "X-Sendfile" to offload to the web server
+    "sendfile_prefix": "/protected/documents/",  # internal location mapped to root
+    "gc_grace": 60 * 60,  # seconds an unreferenced file is kept before collect_garbage() removes it
+}
+
+TEMP_DIR = "tmp"
+GC_BATCH_SIZE = 500
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def get_files_settings() -> dict:
+    return {**DEFAULT_FILES_SETTINGS, **getattr(settings, "NOTIFIER_FILES", {})}
+
+
+def blob_name(digest: str) -> str:
+    return f"{digest[:2]}/{digest[2:4]}/{digest}"
+
+
+class BlobWriter:
+    """Streams one file into the store, hashing as it goes."""
+
+    def __init__(self, storage: "ContentAddressedStorage"):
+        self.storage = storage
+        temp_dir = storage.path(TEMP_DIR)
+        os.makedirs(temp_dir, exist_ok=True)
+        fd, self.temp_path = tempfile.mkstemp(dir=temp_dir, suffix=".upload")
+        self.file = os.fdopen(fd, "wb")
+        self.hasher = hashlib.sha256()
+        self.size = 0
+
+    def write(self, chunk: bytes) -> None:
+        self.hasher.update(chunk)
+        self.file.write(chunk)
+        self.size += len(chunk)
+
+    def commit(self) -> str:
+        """Moves the file to its hash name, or drops it if that content is already stored."""
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+        name = blob_name(self.hasher.hexdigest())
+        path = self.storage.path(name)
+        try:
+            # Already stored: restart its grace period so collect_garbage()
+            # cannot remove it before this upload's document is saved.
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        else:
+            os.unlink(self.temp_path)
+            return name
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if self.storage.file_permissions_mode is not None:
+            os.chmod(self.temp_path, self.storage.file_permissions_mode)
+        # Same filesystem, so this is an atomic rename. A concurrent upload of
+        # the same bytes renames identical content over it, which is harmless.
+        os.replace(self.temp_path, path)
+        return name
+
+    def abort(self) -> None:
+        self.file.close()
+        try:
+            os.unlink(self.temp_path)
+        except FileNotFoundError:
+            pass
+
+    @property
+    def sha256(self) -> str:
+        return self.hasher.hexdigest()
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """FileSystemStorage that names files by their SHA-256 and stores each content once.
+
+    The name passed to save() is ignored, since the content decides it. The
+    location follows NOTIFIER_FILES['root'], so override_settings works.
+    """
+
+    @property
+    def base_location(self):
+        root = get_files_settings()["root"]
+        return os.path.join(settings.BASE_DIR, root)
+
+    @property
+    def location(self):
+        return os.path.abspath(self.base_location)
+
+    def get_available_name(self, name, max_length=None):
+        return name
+
+    def writer(self) -> BlobWriter:
+        return BlobWriter(self)
+
+    def _save(self, name, content):
+        writer = self.writer()
+        try:
+            for chunk in content.chunks(get_files_settings()["chunk_size"]):
+                writer.write(chunk)
+        except BaseException:
+            writer.abort()
+            raise
+        return writer.commit()
+
+
+document_storage = ContentAddressedStorage()
+
+
+def get_document_storage() -> ContentAddressedStorage:
+    return document_storage
+
+
+class StoredUpload(UploadedFile):
+    """An upload that is already in the store; storage_name is its FileField value."""
+
+    def __init__(self, storage_name: str, sha256: str, **kwargs):
+        super().__init__(**kwargs)
+        self.storage_name = storage_name
+        self.sha256 = sha256
+
+
+class ContentAddressedUploadHandler(FileUploadHandler):
+    """Writes file parts of a multipart upload straight into the document store.
+
+    Install it before request.POST or request.FILES is read:
+    request.upload_handlers = [ContentAddressedUploadHandler(request)].
+    """
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        config = get_files_settings()
+        self.chunk_size = config["chunk_size"]
+        self.max_size = config["max_size"]
+        self.writer: Optional[BlobWriter] = None
+        # Set when an upload is cut off at max_size, so the view can answer 413.
+        self.too_large = False
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.writer = document_storage.writer()
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > self.max_size:
+            self.writer.abort()
+            self.writer = None
+            self.too_large = True
+            raise StopUpload(connection_reset=True)
+        self.writer.write(raw_data)
+        return None  # consumed; nothing for later handlers
+
+    def file_complete(self, file_size):
+        if self.writer is None:
+            return None
+        name = self.writer.commit()
+        return StoredUpload(
+            storage_name=name,
+            sha256=self.writer.sha256,
+            file=document_storage.open(name),
+            name=self.file_name,
+            content_type=self.content_type,
+            size=file_size,
+            charset=self.charset,
+        )
+
+    def upload_interrupted(self):
+        if self.writer is not None:
+            self.writer.abort()
+
+
+class FileRange:
+    """Read-only view of length bytes from start; fileno() lets servers sendfile it."""
+
+    def __init__(self, file, start: int, length: int):
+        file.seek(start)
+        self.file = file
+        self.remaining = length
+
+    def read(self, size: int = -1) -> bytes:
+        if self.remaining <= 0:
+            return b""
+        size = self.remaining if size < 0 else min(size, self.remaining)
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self) -> int:
+        return self.file.fileno()
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """(start, end) inclusive for one satisfiable "bytes=" range, else None.
+
+    Raises ValueError when the range cannot be satisfied (416). A range that
+    is not valid (last before first), multiple ranges, and other units are
+    ignored as RFC 9110 requires, so the caller sends the whole file.
+    """
+    match = RANGE_RE.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes; none exist in an empty file.
+        length = int(last)
+        if length == 0 or size == 0:
+            raise ValueError("Suffix range of an empty file or of zero length.")
+        return max(0, size - length), size - 1
+    start = int(first)
+    if last and int(last) < start:
+        return None
+    if start >= size:
+        raise ValueError("Range starts past the end of the file.")
+    end = min(int(last), size - 1) if last else size - 1
+    return start, end
+
+
+def blob_response(request, name: str, sha256: str, filename: str, content_type: str, as_attachment=False):
+    """Serves a stored file; honours If-None-Match, Range and If-Range."""
+    config = get_files_settings()
+    path = document_storage.path(name)
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        raise Http404("The stored file is missing.")
+    size = stat.st_size
+    etag = f'"{sha256}"'
+    # The bytes behind an ETag never change, so clients may cache for long.
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": "private, max-age=31536000, immutable",
+        "Last-Modified": http_date(stat.st_mtime),
+    }
+
+    if etag in [tag.strip() for tag in request.headers.get("If-None-Match", "").split(",")]:
+        return HttpResponse(status=304, headers=headers)
+
+    if config["sendfile_header"]:
+        # The web server does the transfer, ranges included.
+        response = HttpResponse(content_type=content_type, headers=headers)
+        response[config["sendfile_header"]] = config["sendfile_prefix"] + name
+        response["Content-Disposition"] = content_disposition_header(as_attachment, filename)
+        return response
+
+    byte_range = None
+    range_header = request.headers.get("Range")
+    if range_header and request.headers.get("If-Range", etag) == etag:
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            return HttpResponse(status=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+
+    try:
+        file = open(path, "rb")
+    except FileNotFoundError:
+        raise Http404("The stored file is missing.")
+    if byte_range is None:
+        response = FileResponse(file, as_attachment=as_attachment, filename=filename, content_type=content_type)
+    else:
+        start, end = byte_range
+        response = FileResponse(
+            FileRange(file, start, end - start + 1),
+            as_attachment=as_attachment,
+            filename=filename,
+            content_type=content_type,
+            status=206,
+        )
+        response["Content-Length"] = str(end - start + 1)
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    response.block_size = config["chunk_size"]
+    for header, value in headers.items():
+        response[header] = value
+    return response
+
+
+@dataclass
+class GarbageStats:
+    removed: int = 0
+    removed_bytes: int = 0
+    kept: int = 0
+    temp_removed: int = 0
+
+
+def stored_files(storage: Optional[ContentAddressedStorage] = None) -> Iterator[Tuple[str, str]]:
+    """(name, path) for every stored file, skipping the temp directory."""
+    storage = storage or document_storage
+    if not os.path.isdir(storage.location):
+        return
+    for directory, subdirectories, files in os.walk(storage.location):
+        if directory == storage.location:
+            subdirectories[:] = [sub for sub in subdirectories if sub != TEMP_DIR]
+        for filename in files:
+            path = os.path.join(directory, filename)
+            yield os.path.relpath(path, storage.location).replace(os.sep, "/"), path
+
+
+def collect_garbage(grace: Optional[float] = None, now: Optional[float] = None) -> GarbageStats:
+    """Removes stored files no document references and temp files, once older than grace seconds.
+
+    Documents are checked after the age filter and in batches, so the cost is
+    one query per GC_BATCH_SIZE old files. An upload that reuses a stored
+    file refreshes its mtime first, so the file outlives the upload's
+    transaction by the whole grace period.
+    """
+    from notifier.models import Document
+
+    config = get_files_settings()
+    grace = config["gc_grace"] if grace is None else grace
+    cutoff = (time.time() if now is None else now) - grace
+    stats = GarbageStats()
+
+    temp_dir = document_storage.path(TEMP_DIR)
+    if os.path.isdir(temp_dir):
+        for entry in os.scandir(temp_dir):
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.unlink(entry.path)
+                stats.temp_removed += 1
+
+    def sweep(batch: List[Tuple[str, str]]):
+        referenced = set(Document.objects.filter(file__in=[name for name, _ in batch]).values_list("file", flat=True))
+        for name, path in batch:
+            if name in referenced:
+                stats.kept += 1
+                continue
+            try:
+                # Re-check the age right before removing: an upload may have
+                # reused the file since it was listed.
+                stat = os.stat(path)
+                if stat.st_mtime >= cutoff:
+                    stats.kept += 1
+                    continue
+                os.unlink(path)
+            except FileNotFoundError:
+                continue
+            stats.removed += 1
+            stats.removed_bytes += stat.st_size
+
+    batch = []
+    for name, path in stored_files():
+        try:
+            if os.stat(path).st_mtime >= cutoff:
+                stats.kept += 1
+                continue
+        except FileNotFoundError:
+            continue
+        batch.append((name, path))
+        if len(batch) >= GC_BATCH_SIZE:
+            sweep(batch)
+            batch = []
+    if batch:
+        sweep(batch)
+    return stats
@@ -0,0 +1,74 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from notifier.models import Notification
+from notifier.utils.pagination import EstimatedCountPaginator
+
+
+# Tests for the NotificationAdmin changelist in notifier/admin.py
+class NotificationChangelistTests(TestCase):
+    def setUp(self):
+        user_model = get_user_model()
+        self.admin = user_model.objects.create_superuser(username="admin", password="pass123")
+        self.client.login(username="admin", password="pass123")
+
+    def create_notifications(self, count):
+        user_model = get_user_model()
+        recipients = [user_model.objects.create_user(username=f"user{Notification.objects.count()}-{i}") for i in range(count)]
+        Notification.objects.bulk_create(
+            Notification(recipient=recipient, subject=f"Alert {recipient.username}", message="Body")
+            for recipient in recipients
+        )
+
+    def changelist_queries(self, **params):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(reverse("admin:notifier_notification_changelist"), params)
+        self.assertEqual(response.status_code, 200)
+        return [query["sql"] for query in captured.captured_queries]
+
+    def test_query_count_does_not_grow_with_rows(self):
+        self.create_notifications(3)
+        small = self.changelist_queries()
+        self.create_notifications(20)
+        large = self.changelist_queries()
+
+        self.assertEqual(len(small), len(large))
+
+    def test_no_exact_count_over_whole_table(self):
+        self.create_notifications(5)
+
+        queries = self.changelist_queries()
+
+        self.assertFalse(any('SELECT COUNT(*) AS "__count" FROM "notifier_notification"' in sql for sql in queries))
+
+    def test_no_per_row_date_truncation(self):
+        self.create_notifications(5)
+
+        queries = self.changelist_queries() + self.changelist_queries(created_at__gte="2026-01-01")
+
+        self.assertFalse(any("DISTINCT" in sql or "_trunc" in sql for sql in queries))
+
+
+# Tests for notifier/utils/pagination.py::EstimatedCountPaginator
+class EstimatedCountPaginatorTests(TestCase):
+    def setUp(self):
+        recipient = get_user_model().objects.create_user(username="ops")
+        Notification.objects.bulk_create(
+            Notification(recipient=recipient, subject=f"Alert {i}", message="Body", status="sent" if i % 2 else "queued")
+            for i in range(10)
+        )
+
+    def test_unfiltered_count_uses_primary_key_span(self):
+        paginator = EstimatedCountPaginator(Notification.objects.all(), 5)
+
+        self.assertEqual(paginator.count, 10)
+        self.assertEqual(paginator.num_pages, 2)
+
+    def test_filtered_count_is_capped(self):
+        paginator = EstimatedCountPaginator(Notification.objects.filter(status="sent"), 2)
+        paginator.count_cap = 3
+
+        self.assertEqual(paginator.count, 3)
@@ -0,0 +1,106 @@
+import gzip
+import json
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import IntegrityError
+from django.test import TestCase
+from django.utils import timezone
+
+from notifier.models import ArchivedNotification, Notification, Recipient
+from notifier.services.archival import archive_notifications, purge_archive
+from notifier.services.counters import status_totals
+
+
+# Tests for notifier/services/archival.py
+class ArchiveNotificationsTests(TestCase):
+    def setUp(self):
+        self.recipient = get_user_model().objects.create_user(username="ops")
+        self.now = timezone.now()
+        old = self.now - timedelta(days=120)
+        for i, status in enumerate(["sent", "sent", "dead", "failed", "queued"]):
+            Notification.objects.create(recipient=self.recipient, subject=f"Old {i}", status=status)
+        Notification.objects.update(created_at=old)
+        Notification.objects.create(recipient=self.recipient, subject="Recent", status="sent")
+
+    def test_moves_old_terminal_rows_in_batches(self):
+        progress = list(archive_notifications(self.now - timedelta(days=90), batch_size=2))
+
+        self.assertEqual([(step.archived, step.total) for step in progress], [(2, 3), (3, 3)])
+        self.assertEqual(ArchivedNotification.objects.count(), 3)
+        self.assertEqual(
+            sorted(Notification.objects.values_list("subject", flat=True)), ["Old 3", "Old 4", "Recent"]
+        )
+        # Status counters follow the deletes.
+        self.assertEqual(status_totals()["sent"], 1)
+
+    def test_rerun_after_interruption_continues(self):
+        batches = archive_notifications(self.now - timedelta(days=90), batch_size=1)
+        next(batches)
+        batches.close()  # interrupted after the first committed batch
+
+        list(archive_notifications(self.now - timedelta(days=90), batch_size=1))
+
+        self.assertEqual(ArchivedNotification.objects.count(), 3)
+
+    def test_rows_copied_by_an_earlier_run_are_skipped(self):
+        first = Notification.objects.get(subject="Old 0")
+        ArchivedNotification.objects.create(
+            id=first.id, recipient_id=self.recipient.id, subject=first.subject, message="",
+            status="sent", priority=first.priority, created_at=first.created_at,
+        )
+
+        list(archive_notifications(self.now - timedelta(days=90)))
+
+        self.assertEqual(ArchivedNotification.objects.count(), 3)
+        self.assertFalse(Notification.objects.filter(pk=first.pk).exists())
+
+    def test_failed_copy_keeps_the_source_rows(self):
+        with patch.object(ArchivedNotification.objects, "bulk_create", side_effect=IntegrityError("boom")):
+            with self.assertRaises(IntegrityError):
+                list(archive_notifications(self.now - timedelta(days=90)))
+
+        self.assertEqual(Notification.objects.count(), 6)
+        self.assertFalse(ArchivedNotification.objects.exists())
+
+    def test_contact_notifications_are_archived_not_lost(self):
+        contact = Recipient.objects.create(email="ada@example.com")
+        notification = Notification.objects.create(contact=contact, subject="Segment", status="sent")
+        Notification.objects.filter(pk=notification.pk).update(created_at=self.now - timedelta(days=120))
+
+        list(archive_notifications(self.now - timedelta(days=90)))
+
+        archived = ArchivedNotification.objects.get(pk=notification.pk)
+        self.assertEqual((archived.recipient_id, archived.contact_id), (None, contact.pk))
+        self.assertFalse(Notification.objects.filter(pk=notification.pk).exists())
+
+    def test_file_archive_writes_gzipped_json_lines(self):
+        with tempfile.TemporaryDirectory() as directory:
+            list(archive_notifications(self.now - timedelta(days=90), directory=Path(directory)))
+            (path,) = Path(directory).glob("*.jsonl.gz")
+            with gzip.open(path, "rt") as archive:
+                rows = [json.loads(line) for line in archive]
+
+        self.assertEqual([row["subject"] for row in rows], ["Old 0", "Old 1", "Old 2"])
+        self.assertFalse(ArchivedNotification.objects.exists())
+
+    def test_purge_removes_expired_archive_rows(self):
+        list(archive_notifications(self.now - timedelta(days=90)))
+        ArchivedNotification.objects.filter(subject="Old 0").update(archived_at=self.now - timedelta(days=400))
+
+        rows, files = purge_archive(self.now - timedelta(days=365), batch_size=1)
+
+        self.assertEqual((rows, files), (1, 0))
+        self.assertEqual(ArchivedNotification.objects.count(), 2)
+
+    def test_command_reports_progress(self):
+        output = StringIO()
+        call_command("archive_notifications", "--batch-size", "2", stdout=output)
+
+        self.assertIn("[ARCHIVE] 2/3 archived", output.getvalue())
+        self.assertIn("Archived 3 notification(s).", output.getvalue())
@@ -0,0 +1,140 @@
+import socket
+from io import StringIO
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from notifier.models import Notification
+from notifier.services.backends import DeliveryBackend, HTTPBackend, SMTPBackend
+from notifier.services.delivery import NotificationDeliveryError, NotificationRequest
+from notifier.services.queue import claim_batch, process_claim
+from notifier.services.sink import DeliverySink
+
+
+def requests_for(*addresses):
+    return [NotificationRequest(address, f"Alert for {address}", "Disk usage above 90%.") for address in addresses]
+
+
+class SinkMixin:
+    def setUp(self):
+        self.sink = DeliverySink(reject=["bounce@example.com"]).start()
+        self.addCleanup(self.sink.stop)
+
+
+# Tests for notifier/services/backends.py::SMTPBackend
+class SMTPBackendTests(SinkMixin, SimpleTestCase):
+    def test_batches_share_one_session_and_failures_stay_per_message(self):
+        backend = SMTPBackend(host=self.sink.host, port=self.sink.smtp_port, batch_size=3)
+
+        first = backend.send_messages(requests_for("a@example.com", "bounce@example.com", "b@example.com"))
+        second = backend.send_messages(requests_for("c@example.com"))
+        backend.close()
+
+        self.assertIsInstance(first[1], NotificationDeliveryError)
+        self.assertTrue(all(result.startswith("<") for result in [first[0], first[2], second[0]]))
+        self.assertEqual(self.sink.stats.messages, 3)
+        self.assertEqual(self.sink.stats.connections, 1)
+
+    def test_dropped_session_is_reopened(self):
+        backend = SMTPBackend(host=self.sink.host, port=self.sink.smtp_port)
+        backend.send_messages(requests_for("a@example.com"))
+        backend.connection.connection.sock.shutdown(socket.SHUT_RDWR)
+
+        results = backend.send_messages(requests_for("b@example.com"))
+        backend.close()
+
+        self.assertNotIsInstance(results[0], NotificationDeliveryError)
+        self.assertEqual(self.sink.stats.connections, 2)
+
+
+# Tests for notifier/services/backends.py::HTTPBackend
+class HTTPBackendTests(SinkMixin, SimpleTestCase):
+    def test_each_batch_is_one_request_on_a_kept_alive_connection(self):
+        backend = HTTPBackend(url=self.sink.http_url, batch_size=2)
+
+        first = backend.send_messages(requests_for("a@example.com", "bounce@example.com"))
+        second = backend.send_messages(requests_for("b@example.com"))
+        backend.close()
+
+        self.assertEqual([first[0], second[0]], ["sink-1", "sink-2"])
+        self.assertIsInstance(first[1], NotificationDeliveryError)
+        self.assertEqual(self.sink.stats.connections, 1)
+
+    def test_unreachable_endpoint_fails_the_whole_batch(self):
+        backend = HTTPBackend(url="http://127.0.0.1:9/send", timeout=1)
+
+        results = backend.send_messages(requests_for("a@example.com", "b@example.com"))
+
+        self.assertTrue(all(isinstance(result, NotificationDeliveryError) for result in results))
+
+    def test_unusable_2xx_answers_fail_the_whole_batch(self):
+        for body in (b"<html>ok</html>", b'{"ok": true}', b'{"results": [{"id": "x"}]}', b'{"results": [1, 2]}'):
+            with self.subTest(body=body):
+                backend = HTTPBackend(url="http://127.0.0.1:9/send")
+                backend.connection = Mock(getresponse=Mock(return_value=SimpleNamespace(status=200, read=lambda: body)))
+
+                results = backend.send_messages(requests_for("a@example.com", "b@example.com"))
+
+                self.assertEqual(len(results), 2)
+                self.assertTrue(all(isinstance(result, NotificationDeliveryError) for result in results))
+
+
+class RecordingBackend(DeliveryBackend):
+    def __init__(self, batch_size):
+        super().__init__(batch_size=batch_size)
+        self.calls = []
+
+    def send_messages(self, requests):
+        self.calls.append([request.recipient_email for request in requests])
+        return [f"id-{index}" for index, _ in enumerate(requests)]
+
+
+# Tests for notifier/services/queue.py::process_claim with a DeliveryBackend
+class BatchedDeliveryTests(TestCase):
+    def setUp(self):
+        recipient = get_user_model().objects.create_user(username="ops", email="ops@example.com")
+        Notification.objects.bulk_create(
+            Notification(recipient=recipient, subject=f"Alert {i}", message="Body") for i in range(5)
+        )
+
+    def test_claim_is_sent_in_backend_sized_batches(self):
+        backend = RecordingBackend(batch_size=2)
+
+        outcomes = process_claim(claim_batch("worker-a", 10, 60), backend)
+
+        self.assertEqual([len(call) for call in backend.calls], [2, 2, 1])
+        self.assertEqual(outcomes["success"], 5)
+        self.assertEqual(Notification.objects.filter(status="sent").count(), 5)
+
+    def test_results_missing_from_a_backend_count_as_failures(self):
+        backend = RecordingBackend(batch_size=10)
+        backend.send_messages = lambda requests: ["id-0"]
+
+        outcomes = process_claim(claim_batch("worker-a", 10, 60), backend)
+
+        self.assertEqual((outcomes["success"], outcomes["error"]), (1, 4))
+        self.assertEqual(Notification.objects.filter(status="failed").count(), 4)
+
+    def test_missing_address_fails_permanently_without_reaching_the_backend(self):
+        nobody = get_user_model().objects.create_user(username="nobody")
+        Notification.objects.filter(subject="Alert 0").update(recipient=nobody)
+        backend = RecordingBackend(batch_size=10)
+
+        outcomes = process_claim(claim_batch("worker-a", 10, 60), backend)
+
+        self.assertEqual(len(backend.calls[0]), 4)
+        self.assertEqual(outcomes["error"], 1)
+        self.assertEqual(Notification.objects.get(subject="Alert 0").status, "dead")
+
+    def test_run_worker_delivers_through_configured_smtp_backend(self):
+        with DeliverySink() as sink:
+            backends = {"sink": {"class": "notifier.services.backends.SMTPBackend", "port": sink.smtp_port}}
+            with override_settings(NOTIFIER_DELIVERY_BACKENDS=backends):
+                call_command("run_worker", once=True, provider="sink", stdout=StringIO())
+
+            self.assertEqual(sink.stats.messages, 5)
+            self.assertEqual(sink.stats.connections, 1)
+        self.assertEqual(Notification.objects.filter(status="sent").count(), 5)
@@ -0,0 +1,119 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from notifier.models import Notification
+from notifier.services.backends import DeliveryBackend
+from notifier.services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from notifier.services.delivery import NotificationDeliveryError
+from notifier.services.queue import claim_batch, process_claim
+
+SETTINGS = {"failure_rate": 0.5, "minimum_requests": 4, "window": 60, "cooldown": 30, "half_open_max": 1}
+
+
+# Tests for notifier/services/circuit_breaker.py::CircuitBreaker
+class CircuitBreakerTests(TestCase):
+    def setUp(self):
+        self.breaker = CircuitBreaker(SETTINGS)
+
+    def test_opens_once_failure_rate_is_reached_over_enough_sends(self):
+        self.assertEqual(self.breaker.record("smtp", failures=3, now=100.0), CLOSED)
+        self.assertEqual(self.breaker.record("smtp", successes=1, failures=1, now=101.0), OPEN)
+
+        permit = self.breaker.allow("smtp", 10, now=110.0)
+        self.assertEqual(permit.allowed, 0)
+        self.assertAlmostEqual(permit.retry_after, 21.0)
+
+    def test_window_expiry_forgets_old_failures(self):
+        self.breaker.record("smtp", failures=3, now=100.0)
+
+        self.assertEqual(self.breaker.record("smtp", failures=1, successes=3, now=161.0), CLOSED)
+
+    def test_half_open_probe_closes_or_reopens(self):
+        self.breaker.record("smtp", failures=4, now=100.0)
+
+        probe = self.breaker.allow("smtp", 5, now=130.0)
+        self.assertEqual((probe.allowed, probe.retry_after), (1, 30))
+        self.assertEqual(self.breaker.state("smtp", now=130.0).state, HALF_OPEN)
+        self.assertEqual(self.breaker.record("smtp", failures=1, now=131.0), OPEN)
+
+        self.breaker.allow("smtp", 1, now=161.0)
+        self.assertEqual(self.breaker.record("smtp", successes=1, now=162.0), CLOSED)
+        self.assertEqual(self.breaker.allow("smtp", 5, now=162.0).allowed, 5)
+        self.assertEqual(self.breaker.state("smtp", now=162.0).trips, 2)
+
+    def test_providers_are_independent_and_can_override_settings(self):
+        breaker = CircuitBreaker(SETTINGS, providers={"http": {"minimum_requests": 1}})
+        breaker.record("http", failures=1, now=100.0)
+        breaker.record("smtp", failures=1, now=100.0)
+
+        self.assertEqual(breaker.state("http", now=100.0).state, OPEN)
+        self.assertEqual(breaker.state("smtp", now=100.0).state, CLOSED)
+
+    def test_breakers_in_different_processes_share_state(self):
+        # A second instance stands in for another worker: only the shared cache links them.
+        self.breaker.record("smtp", failures=2, now=100.0)
+        CircuitBreaker(SETTINGS).record("smtp", failures=2, now=101.0)
+
+        self.assertEqual(self.breaker.allow("smtp", 1, now=102.0).allowed, 0)
+        self.assertEqual(self.breaker.state("smtp", now=102.0).failures, 4)
+
+
+class FailingBackend(DeliveryBackend):
+    def __init__(self, batch_size):
+        super().__init__(batch_size=batch_size)
+        self.sent = 0
+
+    def send_messages(self, requests):
+        self.sent += len(requests)
+        return [NotificationDeliveryError("Connection timed out.") for _ in requests]
+
+
+# Tests for the breaker hook in notifier/services/delivery.py::deliver_batch
+class BreakerDeliveryTests(TestCase):
+    def setUp(self):
+        recipient = get_user_model().objects.create_user(username="ops", email="ops@example.com")
+        Notification.objects.bulk_create(
+            Notification(recipient=recipient, subject=f"Alert {i}", message="Body") for i in range(10)
+        )
+
+    def test_open_breaker_defers_the_rest_of_the_claim_without_sending(self):
+        backend = FailingBackend(batch_size=4)
+        started = timezone.now()
+
+        outcomes = process_claim(claim_batch("worker-a", 10, 60), backend, breaker=CircuitBreaker(SETTINGS))
+
+        self.assertEqual(backend.sent, 4)
+        self.assertEqual(outcomes["error"], 4)
+        self.assertEqual(outcomes["deferred"], 6)
+        deferred = Notification.objects.filter(status="queued")
+        self.assertEqual(deferred.count(), 6)
+        self.assertTrue(all(n.attempts == 0 and n.send_at > started for n in deferred))
+
+
+# Tests for notifier/views/notifications.py::delivery_breakers
+class DeliveryBreakersViewTests(TestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_user(username="ops", password="pass123")
+        user.user_permissions.add(Permission.objects.get(codename="view_notification"))
+        self.client.force_login(user)
+
+    @override_settings(NOTIFIER_CIRCUIT_BREAKER={"minimum_requests": 1})
+    def test_reports_state_per_backend(self):
+        CircuitBreaker({**SETTINGS, "minimum_requests": 1}).record("default", failures=1)
+        # The web process's own cache never sees worker state; the shared one does.
+        cache.clear()
+
+        response = self.client.get(reverse("delivery_breakers"))
+
+        rows = {row["provider"]: row for row in response.json()["breakers"]}
+        self.assertEqual(rows["default"]["state"], OPEN)
+        self.assertEqual(rows["default"]["trips"], 1)
+        self.assertEqual(rows["sink-smtp"]["state"], CLOSED)
+
+    @override_settings(NOTIFIER_CIRCUIT_BREAKER=None)
+    def test_disabled_breakers(self):
+        self.assertEqual(self.client.get(reverse("delivery_breakers")).json(), {"enabled": False, "breakers": []})
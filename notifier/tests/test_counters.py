@@ -0,0 +1,101 @@
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from notifier.models import Notification, StatusCounter
+from notifier.services.counters import apply_drift, measure_drift, reconcile_counters, status_totals
+from notifier.services.shared_cache import get_shared_cache
+
+
+# Tests for notifier/migrations/0011_status_counters.py (counter triggers)
+class StatusCounterTriggerTests(TestCase):
+    def setUp(self):
+        self.recipient = get_user_model().objects.create_user(username="ops", email="ops@example.com")
+
+    def test_single_row_transitions_move_counts(self):
+        notification = Notification.objects.create(recipient=self.recipient, subject="Deploy")
+        notification.mark_as_sent()
+
+        totals = status_totals()
+        self.assertEqual(totals["queued"], 0)
+        self.assertEqual(totals["sent"], 1)
+
+        notification.delete()
+        self.assertEqual(status_totals()["sent"], 0)
+
+    def test_bulk_insert_and_update_are_counted(self):
+        Notification.objects.bulk_create(
+            Notification(recipient=self.recipient, subject=f"Bulk {i}") for i in range(5)
+        )
+        Notification.objects.filter(subject__in=["Bulk 0", "Bulk 1"]).update(status="failed")
+        # Saving without a status change must not move anything.
+        Notification.objects.filter(status="queued").update(claimed_by="worker-1")
+
+        totals = status_totals()
+        self.assertEqual(totals["queued"], 3)
+        self.assertEqual(totals["failed"], 2)
+        self.assertEqual(reconcile_counters(), {})
+
+
+# Tests for notifier/services/counters.py::reconcile_counters
+class ReconcileCountersTests(TestCase):
+    def test_reconcile_corrects_drift(self):
+        recipient = get_user_model().objects.create_user(username="ops")
+        Notification.objects.create(recipient=recipient, subject="Deploy", status="sent")
+        StatusCounter.objects.filter(status="sent").update(count=40)
+
+        drift = reconcile_counters()
+
+        self.assertEqual(drift, {"sent": -39})
+        self.assertEqual(status_totals()["sent"], 1)
+
+    def test_changes_after_the_count_survive_the_correction(self):
+        recipient = get_user_model().objects.create_user(username="ops")
+        StatusCounter.objects.filter(status="sent").update(count=40)
+        drift = measure_drift()
+        # Committed by a worker between the count and the correction.
+        Notification.objects.create(recipient=recipient, subject="Deploy", status="sent")
+
+        apply_drift(drift)
+
+        self.assertEqual(drift, {"sent": -40})
+        self.assertEqual(status_totals()["sent"], 1)
+
+    @override_settings(NOTIFIER_WORKER={**settings.NOTIFIER_WORKER, "reconcile_interval": 0})
+    def test_one_worker_per_interval_recounts(self):
+        StatusCounter.objects.filter(status="sent").update(count=40)
+        get_shared_cache().add("notifier.reconcile", "other-worker", timeout=60)
+        output = StringIO()
+
+        call_command("run_worker", once=True, stdout=output)
+        self.assertEqual(status_totals()["sent"], 40)
+
+        get_shared_cache().delete("notifier.reconcile")
+        call_command("run_worker", once=True, stdout=output)
+        self.assertEqual(status_totals()["sent"], 0)
+        self.assertIn("corrected status counters {'sent': -40}", output.getvalue())
+
+    def test_command_reports_when_counters_match(self):
+        output = StringIO()
+        call_command("reconcile_counters", stdout=output)
+
+        self.assertIn("Counters match", output.getvalue())
+
+
+# Tests for notifier/views/views.py::dashboard
+class DashboardTotalsTests(TestCase):
+    def test_dashboard_shows_counter_totals_and_alerts(self):
+        recipient = get_user_model().objects.create_user(username="ops")
+        Notification.objects.create(recipient=recipient, subject="Deploy", status="dead")
+        Notification.objects.create(recipient=recipient, subject="Digest", status="queued")
+
+        # One read of the counters, one of the breakers in the shared cache, one of the hourly rollups.
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("dashboard"))
+
+        self.assertEqual(response.context["totals"]["queued"], 1)
+        self.assertContains(response, "1 notification(s) in the dead-letter queue")
@@ -0,0 +1,79 @@
+import contextvars
+import json
+
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from notifier.models import Document
+from notifier_core.db import routers
+from notifier_core.db.routers import PIN_COOKIE, PrimaryReplicaRouter, ReplicaPinningMiddleware
+
+
+# Tests for notifier_core/db/routers.py::PrimaryReplicaRouter
+@override_settings(DATABASE_REPLICAS=["replica"])
+class PrimaryReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.router = PrimaryReplicaRouter()
+        self.factory = RequestFactory()
+
+    def run_in_request(self, view, cookies=None):
+        request = self.factory.get("/")
+        request.COOKIES.update(cookies or {})
+        return ReplicaPinningMiddleware(view)(request)
+
+    def test_reads_go_to_replica_until_a_write(self):
+        seen = {}
+
+        def view(request):
+            seen["before"] = self.router.db_for_read(Document)
+            seen["write"] = self.router.db_for_write(Document)
+            seen["after"] = self.router.db_for_read(Document)
+            return HttpResponse()
+
+        response = self.run_in_request(view)
+
+        self.assertEqual(seen, {"before": "replica", "write": "default", "after": "default"})
+        self.assertIn(PIN_COOKIE, response.cookies)
+
+    def test_pin_cookie_keeps_reads_on_primary(self):
+        seen = {}
+
+        def view(request):
+            seen["read"] = self.router.db_for_read(Document)
+            return HttpResponse()
+
+        response = self.run_in_request(view, cookies={PIN_COOKIE: "1"})
+
+        self.assertEqual(seen["read"], "default")
+        self.assertNotIn(PIN_COOKIE, response.cookies)
+
+    def test_pin_does_not_leak_into_next_request(self):
+        def scenario():
+            self.run_in_request(lambda request: self.router.db_for_write(Document) and HttpResponse())
+            return routers.is_pinned(), self.router.db_for_read(Document)
+
+        # Run in a fresh context so pins from earlier tests in this thread don't count.
+        pinned, alias = contextvars.Context().run(scenario)
+
+        self.assertFalse(pinned)
+        self.assertEqual(alias, "replica")
+
+    def test_replicas_are_not_migrated(self):
+        self.assertFalse(self.router.allow_migrate("replica", "notifier"))
+        self.assertTrue(self.router.allow_migrate("default", "notifier"))
+
+
+# Integration: a write through the API marks the client as pinned
+@override_settings(DATABASE_REPLICAS=["replica"])
+class ReadYourWritesIntegrationTests(TestCase):
+    def test_document_post_sets_pin_cookie(self):
+        response = self.client.post(
+            reverse("documents_collection"),
+            data=json.dumps({"title": "Roster"}),
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.cookies[PIN_COOKIE]["max-age"], 5)
@@ -0,0 +1,52 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from notifier.models import Document, Notification
+from notifier.services.digests import coalesce_digests
+from notifier.services.fanout import fan_out
+from notifier.services.queue import claimable
+
+
+# Tests for notifier/services/digests.py::coalesce_digests
+@override_settings(NOTIFIER_DIGEST={"enabled": True, "window": 600, "min_items": 2})
+class CoalesceDigestsTests(TestCase):
+    def setUp(self):
+        user_model = get_user_model()
+        self.heavy = user_model.objects.create_user(username="heavy")
+        self.light = user_model.objects.create_user(username="light")
+        for i in range(4):
+            document = Document.objects.create(title=f"Report {i}")
+            recipients = [self.heavy, self.light] if i == 0 else [self.heavy]
+            fan_out(recipients, f"New upload {i}", "A document was uploaded.", f"upload-{i}", document=document, digest=True)
+        self.later = timezone.now() + timedelta(seconds=601)
+
+    def test_buffered_rows_are_not_claimable(self):
+        self.assertFalse(claimable(self.later).exists())
+
+    def test_heavy_recipient_gets_one_digest(self):
+        # Includes the StatusEvent insert for the live stream.
+        with self.assertNumQueries(7):
+            created = coalesce_digests(now=self.later)
+
+        self.assertEqual(created, 1)
+        digest = Notification.objects.get(recipient=self.heavy, status="queued")
+        self.assertEqual(len(digest.metadata["digest_of"]), 4)
+        self.assertEqual(digest.metadata["documents"], [f"Report {i}" for i in range(4)])
+        self.assertIn("You have 4 new updates", digest.message)
+        self.assertEqual(Notification.objects.filter(recipient=self.heavy, status="digested").count(), 4)
+
+    def test_single_buffered_item_is_released_unchanged(self):
+        coalesce_digests(now=self.later)
+
+        notification = Notification.objects.get(recipient=self.light)
+        self.assertEqual(notification.status, "queued")
+        self.assertFalse(notification.digest)
+        self.assertTrue(claimable(self.later).filter(pk=notification.pk).exists())
+
+    def test_nothing_merges_before_window_elapses(self):
+        self.assertEqual(coalesce_digests(), 0)
+        self.assertFalse(Notification.objects.filter(status="digested").exists())
@@ -0,0 +1,243 @@
+import hashlib
+import os
+import tempfile
+import time
+from io import StringIO
+from pathlib import Path
+
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from notifier.models import Document
+from notifier.services.storage import blob_name, collect_garbage, parse_range
+
+CONTENT = b"0123456789" * 10_000
+
+
+class FileStorageTestMixin:
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = Path(directory.name)
+        # A small chunk size so the test upload really arrives in pieces.
+        settings_override = override_settings(NOTIFIER_FILES={"root": self.root, "chunk_size": 4096})
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    # Helper: everything stored under the root except the temp directory.
+    def stored_files(self):
+        return [path for path in self.root.rglob("*") if path.is_file() and path.parent.name != "tmp"]
+
+    # Helper: backdates a stored file past any grace period.
+    def age(self, path, seconds=2 * 60 * 60):
+        past = time.time() - seconds
+        os.utime(path, (past, past))
+
+    # Helper: multipart upload through the streaming handler.
+    def upload(self, content=CONTENT, name="report.bin", **fields):
+        return self.client.post(reverse("documents_upload"), {"file": SimpleUploadedFile(name, content), **fields})
+
+
+# Tests for notifier/views/views.py::documents_upload
+class DocumentUploadTests(FileStorageTestMixin, TestCase):
+    def test_upload_is_stored_under_its_sha256(self):
+        response = self.upload(title="Quarterly report")
+
+        digest = hashlib.sha256(CONTENT).hexdigest()
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            response.json()["file"],
+            {"filename": "report.bin", "content_type": "text/plain", "size": len(CONTENT), "sha256": digest},
+        )
+        self.assertEqual(self.stored_files(), [self.root / blob_name(digest)])
+        self.assertEqual((self.root / blob_name(digest)).read_bytes(), CONTENT)
+        self.assertEqual(list((self.root / "tmp").iterdir()), [])
+
+    def test_identical_uploads_share_one_file(self):
+        first = self.upload(name="a.bin").json()
+        second = self.upload(name="b.bin").json()
+
+        self.assertNotEqual(first["id"], second["id"])
+        self.assertEqual(Document.objects.filter(sha256=first["file"]["sha256"]).count(), 2)
+        self.assertEqual(len(self.stored_files()), 1)
+
+    def test_missing_file_is_rejected(self):
+        response = self.client.post(reverse("documents_upload"), {"title": "No file"})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_uploads_over_max_size_are_413(self):
+        with override_settings(NOTIFIER_FILES={"root": self.root, "chunk_size": 4096, "max_size": 1000}):
+            response = self.upload()
+
+        self.assertEqual(response.status_code, 413)
+        self.assertFalse(Document.objects.exists())
+        self.assertEqual(self.stored_files(), [])
+
+    def test_deleting_a_document_keeps_the_file_for_a_new_upload_of_the_same_bytes(self):
+        first = self.upload(name="a.bin").json()
+        self.age(self.root / blob_name(first["file"]["sha256"]))
+        Document.objects.get(pk=first["id"]).delete()
+
+        second = self.upload(name="b.bin").json()
+        collect_garbage()
+
+        response = self.client.get(reverse("document_file", args=[second["id"]]))
+        self.assertEqual(response.status_code, 200)
+        response.close()
+        self.assertEqual(len(self.stored_files()), 1)
+
+    def test_assigned_files_are_hashed_on_save(self):
+        document = Document.objects.create(title="Notes", file=ContentFile(b"notes", name="notes.txt"))
+
+        self.assertEqual(document.sha256, hashlib.sha256(b"notes").hexdigest())
+        self.assertEqual(document.size, 5)
+        self.assertEqual((document.filename, document.content_type), ("notes.txt", "text/plain"))
+
+
+# Tests for notifier/services/storage.py::collect_garbage
+class CollectGarbageTests(FileStorageTestMixin, TestCase):
+    def test_removes_old_unreferenced_files_only(self):
+        kept = self.upload(content=b"kept").json()
+        orphan = self.upload(content=b"orphan").json()
+        fresh = self.upload(content=b"fresh").json()
+        for document in (kept, orphan, fresh):
+            self.age(self.root / blob_name(document["file"]["sha256"]))
+        Document.objects.filter(pk__in=[orphan["id"], fresh["id"]]).delete()
+        os.utime(self.root / blob_name(fresh["file"]["sha256"]))
+
+        stats = collect_garbage()
+
+        self.assertEqual((stats.removed, stats.kept), (1, 2))
+        self.assertEqual(
+            sorted(self.stored_files()),
+            sorted([self.root / blob_name(kept["file"]["sha256"]), self.root / blob_name(fresh["file"]["sha256"])]),
+        )
+
+    def test_removes_blobs_of_extra_parts_and_abandoned_temp_files(self):
+        self.client.post(reverse("documents_upload"), {
+            "file": SimpleUploadedFile("a.bin", b"main"),
+            "other": SimpleUploadedFile("b.bin", b"extra"),
+        })
+        (self.root / "tmp" / "stale.upload").write_bytes(b"partial")
+        for path in self.root.rglob("*"):
+            if path.is_file():
+                self.age(path)
+
+        stats = collect_garbage()
+
+        self.assertEqual((stats.removed, stats.temp_removed), (1, 1))
+        self.assertEqual(self.stored_files(), [self.root / blob_name(hashlib.sha256(b"main").hexdigest())])
+
+    def test_command_reports_what_it_removed(self):
+        document = self.upload(content=b"orphan").json()
+        Document.objects.filter(pk=document["id"]).delete()
+        output = StringIO()
+
+        call_command("collect_document_files", "--grace", "0", stdout=output)
+
+        self.assertIn("Removed 1 file(s) (6 bytes)", output.getvalue())
+        self.assertEqual(self.stored_files(), [])
+
+
+# Tests for notifier/views/views.py::document_file
+class DocumentFileTests(FileStorageTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.document = Document.objects.get(pk=self.upload().json()["id"])
+        self.url = reverse("document_file", args=[self.document.pk])
+
+    # Helper: reads and closes a file response.
+    def body(self, response):
+        content = b"".join(response.streaming_content)
+        response.close()
+        return content
+
+    def test_whole_file_with_validators(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Length"], str(len(CONTENT)))
+        self.assertEqual(response["ETag"], f'"{self.document.sha256}"')
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertEqual(self.body(response), CONTENT)
+
+    def test_range_request_returns_partial_content(self):
+        response = self.client.get(self.url, headers={"Range": "bytes=10-19"})
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], f"bytes 10-19/{len(CONTENT)}")
+        self.assertEqual(response["Content-Length"], "10")
+        self.assertEqual(self.body(response), CONTENT[10:20])
+
+    def test_stale_if_range_sends_the_whole_file(self):
+        response = self.client.get(self.url, headers={"Range": "bytes=10-19", "If-Range": '"other"'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.body(response), CONTENT)
+
+    def test_unsatisfiable_range_is_416(self):
+        response = self.client.get(self.url, headers={"Range": f"bytes={len(CONTENT)}-"})
+
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], f"bytes */{len(CONTENT)}")
+
+    def test_invalid_range_is_ignored(self):
+        response = self.client.get(self.url, headers={"Range": "bytes=5-3"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.body(response), CONTENT)
+
+    def test_suffix_range_of_an_empty_file_is_416(self):
+        document = Document.objects.get(pk=self.upload(content=b"").json()["id"])
+
+        response = self.client.get(reverse("document_file", args=[document.pk]), headers={"Range": "bytes=-5"})
+
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], "bytes */0")
+
+    def test_matching_etag_is_304(self):
+        response = self.client.get(self.url, headers={"If-None-Match": f'"{self.document.sha256}"'})
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_sendfile_header_hands_the_file_to_the_web_server(self):
+        files = {"root": self.root, "sendfile_header": "X-Accel-Redirect", "sendfile_prefix": "/protected/"}
+        with override_settings(NOTIFIER_FILES=files):
+            response = self.client.get(self.url, {"download": "1"})
+
+        self.assertEqual(response["X-Accel-Redirect"], f"/protected/{self.document.file.name}")
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="report.bin"')
+        self.assertEqual(response.content, b"")
+
+    def test_missing_stored_file_is_404(self):
+        os.unlink(self.root / self.document.file.name)
+
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_document_without_a_file_is_404(self):
+        document = Document.objects.create(title="Metadata only")
+
+        self.assertEqual(self.client.get(reverse("document_file", args=[document.pk])).status_code, 404)
+
+
+# Tests for notifier/services/storage.py::parse_range
+class ParseRangeTests(SimpleTestCase):
+    def test_forms(self):
+        self.assertEqual(parse_range("bytes=0-9", 100), (0, 9))
+        self.assertEqual(parse_range("bytes=90-", 100), (90, 99))
+        self.assertEqual(parse_range("bytes=-10", 100), (90, 99))
+        self.assertEqual(parse_range("bytes=50-500", 100), (50, 99))
+
+    def test_unsupported_or_invalid_ranges_mean_the_whole_file(self):
+        self.assertIsNone(parse_range("bytes=0-1,5-6", 100))
+        self.assertIsNone(parse_range("items=0-1", 100))
+        self.assertIsNone(parse_range("bytes=9-3", 100))
+
+    def test_unsatisfiable(self):
+        for header, size in (("bytes=100-", 100), ("bytes=-0", 100), ("bytes=-5", 0), ("bytes=0-", 0)):
+            with self.subTest(header=header, size=size), self.assertRaises(ValueError):
+                parse_range(header, size)
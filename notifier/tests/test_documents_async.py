@@ -0,0 +1,92 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from notifier.models import Document
+
+
+# Tests for notifier/views/documents_async.py
+class AsyncDocumentApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    async def test_create_then_list_sees_new_document(self):
+        await Document.objects.acreate(title="Agenda", description="")
+        first_list = await self.async_client.get(reverse("documents_collection_async"))
+
+        create_response = await self.async_client.post(
+            reverse("documents_collection_async"),
+            data=json.dumps({"title": "Project Plan", "description": "Initial draft"}),
+            content_type="application/json",
+        )
+        second_list = await self.async_client.get(reverse("documents_collection_async"))
+
+        self.assertEqual(create_response.status_code, 201)
+        self.assertEqual(len(first_list.json()["documents"]), 1)
+        # The write invalidated the cached list.
+        self.assertEqual(len(second_list.json()["documents"]), 2)
+
+    async def test_detail_update_and_delete(self):
+        document = await Document.objects.acreate(title="Doc", description="")
+        url = reverse("document_detail_async", args=[document.pk])
+
+        patch_response = await self.async_client.patch(
+            url, data=json.dumps({"title": "Updated Doc"}), content_type="application/json"
+        )
+        delete_response = await self.async_client.delete(url)
+        missing_response = await self.async_client.get(url)
+
+        self.assertEqual(patch_response.json()["title"], "Updated Doc")
+        self.assertEqual(delete_response.status_code, 204)
+        self.assertEqual(missing_response.status_code, 404)
+
+    async def test_idempotency_key_replays_async_write(self):
+        for _ in range(2):
+            response = await self.async_client.post(
+                reverse("documents_collection_async"),
+                data=json.dumps({"title": "Roster"}),
+                content_type="application/json",
+                headers={"Idempotency-Key": "async-1"},
+            )
+
+        self.assertEqual(response["Idempotent-Replayed"], "true")
+        self.assertEqual(await Document.objects.acount(), 1)
+
+    async def test_idempotency_key_replays_for_a_logged_in_user(self):
+        user = await get_user_model().objects.acreate_user(username="editor", password="pass123")
+        await self.async_client.aforce_login(user)
+        responses = []
+        for _ in range(2):
+            responses.append(await self.async_client.post(
+                reverse("documents_collection_async"),
+                data=json.dumps({"title": "Roster"}),
+                content_type="application/json",
+                headers={"Idempotency-Key": "async-1"},
+            ))
+
+        self.assertEqual([response.status_code for response in responses], [201, 201])
+        self.assertEqual(responses[1]["Idempotent-Replayed"], "true")
+        self.assertEqual(await Document.objects.acount(), 1)
+
+    async def test_validation_matches_the_sync_views(self):
+        document = await Document.objects.acreate(title="Doc", description="")
+        cases = [
+            ("post", reverse("documents_collection"), reverse("documents_collection_async"), "{}"),
+            ("post", reverse("documents_collection"), reverse("documents_collection_async"), "not json"),
+            ("patch", reverse("document_detail", args=[document.pk]),
+             reverse("document_detail_async", args=[document.pk]), '{"title": ""}'),
+            ("get", reverse("document_detail", args=[0]), reverse("document_detail_async", args=[0]), ""),
+        ]
+        for method, sync_url, async_url, body in cases:
+            with self.subTest(url=async_url, body=body):
+                expected = await sync_to_async(getattr(self.client, method))(
+                    sync_url, data=body, content_type="application/json"
+                )
+                response = await getattr(self.async_client, method)(
+                    async_url, data=body, content_type="application/json"
+                )
+                self.assertEqual((response.status_code, response.content), (expected.status_code, expected.content))
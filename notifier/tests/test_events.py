@@ -0,0 +1,173 @@
+import asyncio
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from notifier.models import Notification, StatusEvent
+from notifier.services.archival import archive_notifications
+from notifier.services.delivery import deliver_notification, log_sender
+from notifier.services.events import StatusBroadcaster, broadcaster
+from notifier.services.fanout import fan_out
+
+
+async def take(iterator, count):
+    return [await asyncio.wait_for(anext(iterator), timeout=1) for _ in range(count)]
+
+
+# Helper: events up to and including the next "totals" event.
+async def until_totals(iterator):
+    received = []
+    while not received or received[-1] is None or received[-1].type != "totals":
+        received.append(await asyncio.wait_for(anext(iterator), timeout=1))
+    return received
+
+
+# Tests for notifier/services/events.py::StatusBroadcaster
+class StatusBroadcasterTests(TestCase):
+    async def test_listener_catches_up_from_cursor_then_receives_live_events(self):
+        events = StatusBroadcaster(poll_interval=0.01)
+        first = await sync_to_async(events.publish_status)(1, "queued", "sent")
+        await sync_to_async(events.publish_status)(2, "queued", "failed")
+
+        listener = events.listen(cursor=first.id)
+        caught_up = await until_totals(listener)
+        # Another process writing the table is picked up by polling.
+        await sync_to_async(StatusBroadcaster().publish_counts)({"failed": -3, "queued": 3})
+        live = await take(listener, 1)
+        await listener.aclose()
+
+        self.assertEqual([event.type for event in caught_up], ["status", "totals"])
+        self.assertEqual(caught_up[0].data["notification"], 2)
+        self.assertEqual(caught_up[0].data["deltas"], {"queued": -1, "failed": 1})
+        self.assertEqual(caught_up[1].id, caught_up[0].id)
+        self.assertEqual(live[0].type, "counts")
+
+    async def test_listener_behind_the_retained_events_skips_to_them_and_gets_totals(self):
+        events = StatusBroadcaster(retain=2)
+        published = [await sync_to_async(events.publish_status)(n, "queued", "sent") for n in range(5)]
+        oldest = await StatusEvent.objects.order_by("id").afirst()
+
+        listener = events.listen(cursor=published[0].id)
+        received = await until_totals(listener)
+        await listener.aclose()
+
+        self.assertLess(await StatusEvent.objects.acount(), 5)
+        self.assertEqual(received[0].id, oldest.id)
+        self.assertEqual(received[-1].id, published[-1].id)
+
+    async def test_rows_written_without_events_reach_listeners_as_totals(self):
+        recipients = [
+            await get_user_model().objects.acreate_user(username=f"user{i}") for i in range(3)
+        ]
+        listener = StatusBroadcaster(poll_interval=0.01).listen()
+        before = (await until_totals(listener))[-1].data
+
+        # A raw INSERT ... SELECT that publishes nothing, then an archival delete.
+        await sync_to_async(fan_out)(recipients, "Release", "v2 is out", idempotency_key="release-v2")
+        after_fan_out = (await until_totals(listener))[-1].data
+        await Notification.objects.all().aupdate(status="sent")
+        await until_totals(listener)
+        await sync_to_async(list)(archive_notifications(timezone.now() + timedelta(days=1)))
+        after_archival = (await until_totals(listener))[-1].data
+        await listener.aclose()
+
+        self.assertEqual(after_fan_out["queued"], before["queued"] + 3)
+        self.assertEqual(after_archival["sent"], before["sent"])
+
+    def test_cursor_ahead_of_the_newest_event_is_reset(self):
+        events = StatusBroadcaster()
+        newest = events.publish_status(1, "queued", "sent")
+
+        # e.g. a client that saw ids from a database since restored.
+        self.assertEqual(events.since(newest.id + 50), ([], newest.id))
+        self.assertEqual(events.since(newest.id), ([], None))
+
+    async def test_idle_listener_gets_heartbeats(self):
+        listener = StatusBroadcaster(poll_interval=0.01).listen(heartbeat=0.02)
+
+        self.assertEqual((await take(listener, 1))[0].type, "totals")
+        self.assertIsNone(await asyncio.wait_for(anext(listener), timeout=1))
+        await listener.aclose()
+
+    def test_empty_deltas_are_not_published(self):
+        events = StatusBroadcaster()
+
+        self.assertIsNone(events.publish_counts({"queued": 0}))
+        self.assertEqual(events.cursor, 0)
+
+
+# Tests for notifier/services/delivery.py::deliver_notification
+class DeliveryEventTests(TestCase):
+    def test_delivery_publishes_transition_after_commit(self):
+        recipient = get_user_model().objects.create_user(username="ops", email="ops@example.com")
+        notification = Notification.objects.create(recipient=recipient, subject="Deploy", status="queued")
+        cursor = broadcaster.cursor
+
+        with self.captureOnCommitCallbacks(execute=True):
+            deliver_notification(notification, log_sender)
+
+        events, _ = broadcaster.since(cursor)
+        self.assertEqual(len(events), 1)
+        self.assertEqual(events[0].data["notification"], notification.pk)
+        self.assertEqual(events[0].data["deltas"], {"queued": -1, "sent": 1})
+
+
+# Tests for notifier/views/notifications.py::notifications_stream
+class NotificationStreamViewTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="ops", password="pass123")
+        self.user.user_permissions.add(Permission.objects.get(codename="view_notification"))
+
+    async def test_stream_resumes_after_last_event_id(self):
+        await self.async_client.aforce_login(self.user)
+        seen = await sync_to_async(broadcaster.publish_status)(10, "queued", "sent")
+        await sync_to_async(broadcaster.publish_status)(11, "queued", "failed")
+
+        response = await self.async_client.get(
+            reverse("notifications_stream"), headers={"Last-Event-ID": str(seen.id)}
+        )
+        content = aiter(response.streaming_content)
+        retry, event, totals = await take(content, 3)
+        await content.aclose()
+
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertTrue(retry.startswith(b"retry:"))
+        self.assertIn(b"event: status", event)
+        self.assertIn(b'"notification": 11', event)
+        self.assertNotIn(b'"notification": 10', event)
+        self.assertTrue(totals.startswith(b"id: %d\nevent: totals" % (seen.id + 1)))
+
+    async def test_stream_requires_permission(self):
+        await self.user.user_permissions.aclear()
+        await self.async_client.aforce_login(self.user)
+
+        response = await self.async_client.get(reverse("notifications_stream"))
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_under_wsgi_the_response_ends_after_the_pending_events(self):
+        self.client.force_login(self.user)
+        seen = broadcaster.publish_status(10, "queued", "sent")
+        broadcaster.publish_status(11, "queued", "failed")
+
+        response = self.client.get(reverse("notifications_stream"), {"cursor": seen.id})
+
+        self.assertFalse(response.streaming)
+        self.assertTrue(response.content.startswith(b"retry: 5000"))
+        self.assertIn(b'"notification": 11', response.content)
+        self.assertNotIn(b'"notification": 10', response.content)
+        self.assertTrue(response.content.endswith(b'"digested": 0}\n\n'))
+
+    def test_under_wsgi_every_poll_carries_the_counter_totals(self):
+        self.client.force_login(self.user)
+        Notification.objects.create(recipient=self.user, subject="Deploy", status="queued")
+
+        # A cursor from before a database restore moves back to the newest event (none: 0).
+        response = self.client.get(reverse("notifications_stream"), headers={"Last-Event-ID": "999"})
+
+        self.assertIn(b'id: 0\nevent: totals\ndata: {"draft": 0, "queued": 1,', response.content)
@@ -0,0 +1,84 @@
+import csv
+import io
+import json
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from notifier.models import Notification
+from notifier.services import export
+
+
+class ExportFixtureMixin:
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="ops", password="pass123")
+        self.user.user_permissions.add(Permission.objects.get(codename="view_notification"))
+        for i, status in enumerate(["sent", "sent", "failed"]):
+            Notification.objects.create(
+                recipient=self.user, subject=f"Report, part {i}", status=status, metadata={"campaign": "q1"}
+            )
+        old = Notification.objects.create(recipient=self.user, subject="Old", status="sent")
+        Notification.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=30))
+
+
+# Tests for notifier/views/notifications.py::notifications_export
+class NotificationExportViewTests(ExportFixtureMixin, TestCase):
+    def test_csv_export_streams_filtered_rows(self):
+        self.client.force_login(self.user)
+        since = (timezone.now() - timedelta(days=1)).date().isoformat()
+
+        response = self.client.get(reverse("notifications_export"), {"status": "sent", "since": since})
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        rows = list(csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode())))
+        self.assertEqual([row["subject"] for row in rows], ["Report, part 0", "Report, part 1"])
+        self.assertEqual(rows[0]["campaign"], "q1")
+        self.assertTrue(rows[0]["created_at"].endswith("Z"))
+
+    def test_ndjson_export_in_small_chunks(self):
+        self.client.force_login(self.user)
+
+        with mock.patch.object(export, "CHUNK_SIZE", 2):
+            response = self.client.get(reverse("notifications_export"), {"format": "ndjson"})
+            chunks = list(response.streaming_content)
+
+        rows = [json.loads(line) for line in b"".join(chunks).splitlines()]
+        self.assertEqual(len(chunks), 2)
+        self.assertEqual([row["subject"] for row in rows][-1], "Old")
+        self.assertEqual(rows[0]["recipient"], "ops")
+
+    def test_rejects_bad_parameters(self):
+        self.client.force_login(self.user)
+
+        self.assertEqual(self.client.get(reverse("notifications_export"), {"format": "xml"}).status_code, 400)
+        self.assertEqual(self.client.get(reverse("notifications_export"), {"since": "yesterday"}).status_code, 400)
+
+    async def test_asgi_export_streams_asynchronously(self):
+        await self.async_client.aforce_login(self.user)
+
+        response = await self.async_client.get(reverse("notifications_export"), {"format": "ndjson"})
+
+        self.assertTrue(response.is_async)
+        body = b"".join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(len(body.splitlines()), 4)
+
+
+# Tests for notifier/management/commands/export_notifications.py
+class ExportCommandTests(ExportFixtureMixin, TestCase):
+    def test_command_writes_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "failed.csv"
+            call_command("export_notifications", "--status", "failed", "--campaign", "q1", "-o", str(path))
+            lines = path.read_text().splitlines()
+
+        self.assertEqual(lines[0].split(",")[:3], ["id", "recipient", "subject"])
+        self.assertEqual(len(lines), 2)
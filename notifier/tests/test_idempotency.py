@@ -0,0 +1,99 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+
+from notifier.models import Document, Notification
+from notifier.services.fanout import fan_out
+from notifier.services.idempotency import _cache_key
+from notifier.services.shared_cache import get_shared_cache
+
+
+# Tests for notifier/services/idempotency.py::idempotent on the documents API
+class IdempotencyKeyTests(TestCase):
+    def post_document(self, payload, key="retry-1"):
+        return self.client.post(
+            reverse("documents_collection"),
+            data=json.dumps(payload),
+            content_type="application/json",
+            headers={"Idempotency-Key": key},
+        )
+
+    def test_retried_post_replays_original_response(self):
+        first = self.post_document({"title": "Roster"})
+        second = self.post_document({"title": "Roster"})
+
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 201)
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second["Idempotent-Replayed"], "true")
+        self.assertEqual(Document.objects.count(), 1)
+
+    def test_reused_key_with_different_payload_is_rejected(self):
+        self.post_document({"title": "Roster"})
+
+        response = self.post_document({"title": "Another"})
+
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(Document.objects.count(), 1)
+
+    def test_retry_served_by_another_process_replays(self):
+        first = self.post_document({"title": "Roster"})
+        # Another process starts with an empty local cache; only the shared one carries over.
+        cache.clear()
+
+        second = self.post_document({"title": "Roster"})
+
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(Document.objects.count(), 1)
+
+    def test_key_locked_by_another_process_is_409(self):
+        request = RequestFactory().post(reverse("documents_collection"))
+        get_shared_cache().add(f"{_cache_key(request, None, 'retry-1')}:lock", "other", timeout=60)
+
+        response = self.post_document({"title": "Roster"})
+
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(Document.objects.exists())
+
+    def test_keys_are_scoped_per_user(self):
+        for username in ("alice", "bob"):
+            self.client.force_login(get_user_model().objects.create_user(username=username))
+            response = self.post_document({"title": "Roster"})
+            self.assertNotIn("Idempotent-Replayed", response)
+
+        self.assertEqual(Document.objects.count(), 2)
+
+    def test_requests_without_key_are_not_deduplicated(self):
+        for _ in range(2):
+            self.client.post(
+                reverse("documents_collection"),
+                data=json.dumps({"title": "Roster"}),
+                content_type="application/json",
+            )
+
+        self.assertEqual(Document.objects.count(), 2)
+
+
+# Tests for notifier/services/fanout.py::fan_out
+class FanOutTests(TestCase):
+    def setUp(self):
+        user_model = get_user_model()
+        self.recipients = [user_model.objects.create_user(username=f"user{i}") for i in range(3)]
+
+    def test_retried_fan_out_inserts_nothing_twice(self):
+        first = fan_out(self.recipients, "Release", "v2 is out", idempotency_key="release-v2")
+        second = fan_out(self.recipients, "Release", "v2 is out", idempotency_key="release-v2")
+
+        self.assertEqual(first.count(), 3)
+        self.assertEqual(second.count(), 3)
+        self.assertEqual(Notification.objects.count(), 3)
+
+    def test_existing_subject_conflict_is_skipped(self):
+        Notification.objects.create(recipient=self.recipients[0], subject="Release", message="manual")
+
+        fan_out(self.recipients, "Release", "v2 is out", idempotency_key="release-v2")
+
+        self.assertEqual(Notification.objects.count(), 3)
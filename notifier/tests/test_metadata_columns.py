@@ -0,0 +1,84 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.test import TestCase
+from django.urls import reverse
+
+from notifier.models import Notification
+
+
+# Tests for the hot metadata columns on notifier/models/notifications.py
+class HotMetadataColumnTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="ops", password="pass123")
+        self.spring = Notification.objects.create(
+            recipient=self.user,
+            subject="Spring sale",
+            message="20% off",
+            metadata={"campaign": "spring", "channel": "email", "locale": "en"},
+        )
+        Notification.objects.create(
+            recipient=self.user,
+            subject="Autumn sale",
+            message="10% off",
+            metadata={"campaign": "autumn", "channel": "sms"},
+        )
+
+    def test_columns_follow_metadata_on_every_write_path(self):
+        self.spring.refresh_from_db()
+        self.assertEqual(self.spring.campaign, "spring")
+
+        Notification.objects.filter(pk=self.spring.pk).update(metadata={"campaign": "summer"})
+        self.spring.refresh_from_db()
+        self.assertEqual(self.spring.campaign, "summer")
+        self.assertIsNone(self.spring.channel)
+
+    def test_hot_key_filter_uses_index(self):
+        queryset = Notification.objects.with_metadata(campaign="spring")
+
+        self.assertEqual(list(queryset), [self.spring])
+        self.assertIn("notification_campaign_idx", queryset.explain())
+
+    def test_other_keys_fall_back_to_json_lookup(self):
+        self.assertEqual(list(Notification.objects.with_metadata(locale="en")), [self.spring])
+
+    def test_api_filters_by_metadata(self):
+        self.user.user_permissions.add(Permission.objects.get(codename="view_notification"))
+        self.client.login(username="ops", password="pass123")
+
+        response = self.client.get(reverse("notifications_collection"), {"channel": "sms"})
+
+        self.assertEqual(response.status_code, 200)
+        subjects = [item["subject"] for item in response.json()["notifications"]]
+        self.assertEqual(subjects, ["Autumn sale"])
+
+    def test_api_rejects_lookups_in_metadata_keys(self):
+        self.user.user_permissions.add(Permission.objects.get(codename="view_notification"))
+        self.client.login(username="ops", password="pass123")
+
+        for param in ("metadata.locale__regex", "metadata."):
+            with self.subTest(param=param):
+                response = self.client.get(reverse("notifications_collection"), {param: ".*"})
+
+                self.assertEqual(response.status_code, 400)
+        response = self.client.get(reverse("notifications_collection"), {"metadata.locale": "en"})
+        self.assertEqual([item["subject"] for item in response.json()["notifications"]], ["Spring sale"])
+
+    def test_api_limit_is_clamped(self):
+        self.user.user_permissions.add(Permission.objects.get(codename="view_notification"))
+        self.client.login(username="ops", password="pass123")
+
+        for limit, expected in (("0", 1), ("-1", 1), ("1", 1), ("1000", 2)):
+            with self.subTest(limit=limit):
+                response = self.client.get(reverse("notifications_collection"), {"limit": limit})
+
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.json()["notifications"]), expected)
+
+    def test_admin_search_by_campaign(self):
+        get_user_model().objects.create_superuser(username="admin", password="pass123")
+        self.client.login(username="admin", password="pass123")
+
+        response = self.client.get(reverse("admin:notifier_notification_changelist"), {"q": "campaign:spring"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context["cl"].result_list), [self.spring])
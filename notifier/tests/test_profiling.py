@@ -0,0 +1,93 @@
+import json
+import tempfile
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+
+class ProfilingTestMixin:
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        settings_override = override_settings(
+            NOTIFIER_PROFILING={"directory": self.directory, "profiler": "cprofile", "keep": 2}
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.staff = get_user_model().objects.create_user(username="admin", password="pass123", is_staff=True)
+
+
+# Tests for notifier/services/profiling.py::ProfilingMiddleware
+class ProfilingMiddlewareTests(ProfilingTestMixin, TestCase):
+    def test_staff_header_profiles_the_request_with_its_queries(self):
+        self.client.force_login(self.staff)
+
+        response = self.client.get(reverse("notification_list"), headers={"X-Profile": "1"})
+
+        profile = json.loads((self.directory / f"{response['X-Profile-Id']}.json").read_text())
+        self.assertEqual(profile["view"], "notification_list")
+        self.assertEqual(profile["user"], "admin")
+        self.assertEqual(profile["query_count"], len(profile["queries"]))
+        self.assertTrue(any("notifier_notification" in query["sql"] for query in profile["queries"]))
+        self.assertIn("cumulative", profile["summary"])
+        self.assertTrue((self.directory / f"{response['X-Profile-Id']}.prof").exists())
+
+    async def test_async_view_queries_run_in_worker_threads_are_recorded(self):
+        await cache.aclear()
+        await self.async_client.aforce_login(self.staff)
+
+        response = await self.async_client.get(reverse("documents_collection_async"), headers={"X-Profile": "1"})
+
+        profile = json.loads((self.directory / f"{response['X-Profile-Id']}.json").read_text())
+        self.assertEqual(profile["view"], "documents_collection_async")
+        self.assertTrue(any("notifier_document" in query["sql"] for query in profile["queries"]))
+
+    def test_non_staff_cannot_ask_for_a_profile(self):
+        user = get_user_model().objects.create_user(username="ops", password="pass123")
+        self.client.force_login(user)
+
+        response = self.client.get(reverse("notify") + "?profile=1")
+
+        self.assertNotIn("X-Profile-Id", response)
+        self.assertEqual(list(self.directory.iterdir()), [])
+
+    def test_sampling_profiles_without_asking_and_old_profiles_are_pruned(self):
+        with override_settings(
+            NOTIFIER_PROFILING={"directory": self.directory, "profiler": "cprofile", "keep": 2, "sample_rate": 1.0}
+        ):
+            for _ in range(3):
+                self.client.get(reverse("notify"))
+
+        self.assertEqual(len(list(self.directory.glob("*.json"))), 2)
+        self.assertEqual(len(list(self.directory.glob("*.prof"))), 2)
+
+
+# Tests for notifier/views/profiling.py
+class ProfileViewsTests(ProfilingTestMixin, TestCase):
+    def test_staff_can_list_open_and_download_profiles(self):
+        self.client.force_login(self.staff)
+        profile_id = self.client.get(reverse("notify"), {"profile": "1"})["X-Profile-Id"]
+
+        listing = self.client.get(reverse("profile_list"))
+        detail = self.client.get(reverse("profile_detail", args=[profile_id]))
+        download = self.client.get(reverse("profile_download", args=[profile_id]))
+
+        self.assertContains(listing, reverse("profile_detail", args=[profile_id]))
+        self.assertContains(detail, "SQL, slowest first")
+        self.assertEqual(download["Content-Disposition"], f'attachment; filename="{profile_id}.prof"')
+        download.close()
+
+    def test_profiles_are_staff_only(self):
+        user = get_user_model().objects.create_user(username="ops", password="pass123")
+        self.client.force_login(user)
+
+        self.assertEqual(self.client.get(reverse("profile_list")).status_code, 302)
+
+    def test_unknown_profile_is_404(self):
+        self.client.force_login(self.staff)
+
+        self.assertEqual(self.client.get(reverse("profile_detail", args=["missing"])).status_code, 404)
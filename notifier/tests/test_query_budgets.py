@@ -0,0 +1,114 @@
+import asyncio
+import json
+import tempfile
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, reverse
+from django.utils import timezone
+
+from alerts import urls as alerts_urls
+from notifier import urls as notifier_urls
+from notifier.models import DeliveryRollup, Document, Notification, Recipient, Segment
+from notifier.utils.query_budgets import QUERY_BUDGETS
+
+SMALL, LARGE = 3, 15
+
+
+async def fake_metadata_fetch():
+    await asyncio.sleep(0)
+
+
+def route_names():
+    names = []
+    for urls in (notifier_urls, alerts_urls):
+        namespace = getattr(urls, "app_name", None)
+        for pattern in urls.urlpatterns:
+            if isinstance(pattern, URLPattern) and pattern.name:
+                names.append(f"{namespace}:{pattern.name}" if namespace else pattern.name)
+    return names
+
+
+# Tests for notifier/utils/query_budgets.py::QUERY_BUDGETS against every route
+@patch("notifier.views.views.fetch_all_metadata", new=fake_metadata_fetch)
+class QueryBudgetTests(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.profiles = Path(directory.name) / "profiles"
+        self.profiles.mkdir()
+        settings_override = override_settings(
+            NOTIFIER_PROFILING={"directory": self.profiles},
+            NOTIFIER_FILES={"root": Path(directory.name) / "files"},
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.admin = get_user_model().objects.create_superuser(username="admin", password="pass123")
+        self.client.force_login(self.admin)
+        self.segment = Segment.objects.create(name="Customers")
+        self.seeded = {}
+        self.rows = 0
+
+    def seed(self, total: int):
+        """Grows every table the routes read to `total` rows."""
+        now = timezone.now()
+        for index in range(self.rows, total):
+            user = get_user_model().objects.create_user(username=f"user{index}", email=f"user{index}@example.com")
+            document = Document.objects.create(
+                title=f"Quarterly report {index}", description="Numbers",
+                file=ContentFile(f"Q{index} numbers".encode(), name="report.txt"),
+            )
+            contact = Recipient.objects.create(email=f"contact{index}@example.com", first_name="Ada", user=user)
+            self.segment.recipients.add(contact)
+            Notification.objects.create(
+                recipient=user, document=document, subject=f"Report {index}", status="sent", sent_at=now,
+                metadata={"campaign": "q1"},
+            )
+            Notification.objects.create(contact=contact, subject=f"Reminder {index}", status="queued")
+            DeliveryRollup.objects.create(granularity="hour", bucket=now - timedelta(hours=index), sent=index)
+            profile_id = f"20260101T0000{index:02d}-{index:08x}"
+            (self.profiles / f"{profile_id}.json").write_text(
+                json.dumps({"id": profile_id, "created_at": "", "queries": [{"ms": 1, "sql": "SELECT 1"}]})
+            )
+            (self.profiles / f"{profile_id}.prof").write_bytes(b"")
+            self.seeded = {"document": document, "profile_id": profile_id}
+        self.rows = total
+
+    def count_queries(self, name: str) -> int:
+        budget = QUERY_BUDGETS[name]
+        url = reverse(name, kwargs=budget.kwargs(self.seeded) if budget.kwargs else None)
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, budget.params)
+            if response.streaming:
+                b"".join(response.streaming_content)
+            response.close()
+        self.assertLess(response.status_code, 400, f"{name} answered {response.status_code}")
+        return len(queries)
+
+    def test_every_route_has_a_budget(self):
+        names = route_names()
+
+        self.assertEqual(sorted(set(names) - set(QUERY_BUDGETS)), [], "Add these routes to QUERY_BUDGETS.")
+        self.assertEqual(sorted(set(QUERY_BUDGETS) - set(names)), [], "These budgets name no route.")
+
+    def test_routes_stay_within_budget_and_do_not_grow_with_data(self):
+        names = [name for name in route_names() if not QUERY_BUDGETS[name].skip]
+        self.seed(SMALL)
+        small = {name: self.count_queries(name) for name in names}
+        self.seed(LARGE)
+        large = {name: self.count_queries(name) for name in names}
+
+        for name in names:
+            with self.subTest(route=name):
+                self.assertEqual(
+                    large[name], small[name], f"{name}: {small[name]} queries for {SMALL} rows, {large[name]} for {LARGE}"
+                )
+                self.assertLessEqual(large[name], QUERY_BUDGETS[name].max_queries, f"{name} is over budget")
@@ -0,0 +1,112 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from notifier.models import Notification
+from notifier.services.queue import claim_batch, process_claim, select_candidates
+
+
+class QueueTestMixin:
+    def create_notifications(self, count):
+        recipient = get_user_model().objects.create_user(username="ops", email="ops@example.com")
+        return Notification.objects.bulk_create(
+            Notification(recipient=recipient, subject=f"Alert {i}", message="Body") for i in range(count)
+        )
+
+
+# Tests for notifier/services/queue.py::claim_batch
+class ClaimBatchTests(QueueTestMixin, TestCase):
+    def setUp(self):
+        self.create_notifications(5)
+        self.now = timezone.now()
+
+    def test_concurrent_claims_never_overlap(self):
+        first = claim_batch("worker-a", batch_size=3, lease_seconds=60, now=self.now)
+        second = claim_batch("worker-b", batch_size=3, lease_seconds=60, now=self.now)
+
+        first_ids = {n.id for n in first.notifications}
+        second_ids = {n.id for n in second.notifications}
+        self.assertEqual(len(first_ids), 3)
+        self.assertEqual(len(second_ids), 2)
+        self.assertFalse(first_ids & second_ids)
+
+    def test_expired_lease_is_reclaimed(self):
+        crashed = claim_batch("worker-a", batch_size=5, lease_seconds=60, now=self.now)
+
+        later = self.now + timedelta(seconds=61)
+        recovered = claim_batch("worker-b", batch_size=5, lease_seconds=60, now=later)
+
+        self.assertEqual(
+            {n.id for n in recovered.notifications},
+            {n.id for n in crashed.notifications},
+        )
+
+    def test_scheduled_rows_are_not_claimed_early(self):
+        Notification.objects.update(send_at=self.now + timedelta(minutes=1))
+
+        self.assertEqual(claim_batch("worker-a", 5, 60, now=self.now).notifications, [])
+
+
+# Tests for notifier/services/queue.py::process_claim and the run_worker command
+class ProcessClaimTests(QueueTestMixin, TestCase):
+    def test_process_claim_sends_and_releases(self):
+        self.create_notifications(2)
+        claim = claim_batch("worker-a", batch_size=10, lease_seconds=60)
+
+        outcomes = process_claim(claim, lambda request: "message-id")
+
+        self.assertEqual(outcomes["success"], 2)
+        self.assertFalse(Notification.objects.exclude(status="sent").exists())
+        self.assertFalse(Notification.objects.exclude(claimed_by="").exists())
+
+    def test_run_worker_once(self):
+        self.create_notifications(3)
+        out = StringIO()
+
+        call_command("run_worker", once=True, stdout=out)
+
+        self.assertEqual(Notification.objects.filter(status="sent").count(), 3)
+        self.assertIn("'success': 3", out.getvalue())
+
+
+# Tests for priority lanes in notifier/services/queue.py::select_candidates
+class PriorityLaneTests(QueueTestMixin, TestCase):
+    def setUp(self):
+        notifications = self.create_notifications(30)
+        self.urgent = {n.id for n in notifications[:20]}
+        Notification.objects.filter(id__in=self.urgent).update(priority=Notification.PRIORITY_HIGH)
+        Notification.objects.exclude(id__in=self.urgent).update(priority=Notification.PRIORITY_BULK)
+
+    def test_high_priority_first_with_starvation_guard(self):
+        claim = claim_batch("worker-a", batch_size=10, lease_seconds=60, lane_min_share=0.2)
+
+        claimed = [n.id for n in claim.notifications]
+        # Two slots are reserved for each lower lane; the empty normal lane's
+        # slots go back to the high lane.
+        self.assertEqual(len([i for i in claimed if i in self.urgent]), 8)
+        self.assertEqual(len([i for i in claimed if i not in self.urgent]), 2)
+        self.assertEqual(claim.notifications[0].priority, Notification.PRIORITY_HIGH)
+
+    def test_small_batches_still_take_the_high_lane_first(self):
+        for batch_size in (1, 2):
+            with self.subTest(batch_size=batch_size):
+                ids = select_candidates(timezone.now(), batch_size, lane_min_share=0.2)
+
+                self.assertEqual(len(ids), batch_size)
+                self.assertTrue(set(ids) <= self.urgent)
+
+    def test_three_slots_keep_one_for_the_top_lane(self):
+        ids = select_candidates(timezone.now(), 3, lane_min_share=0.2)
+
+        # One slot each: high, (empty normal handed back to high), bulk.
+        self.assertEqual(len([i for i in ids if i in self.urgent]), 2)
+        self.assertIn(ids[0], self.urgent)
+
+    def test_without_guard_bulk_waits_for_urgent(self):
+        claim = claim_batch("worker-a", batch_size=10, lease_seconds=60, lane_min_share=0)
+
+        self.assertTrue(all(n.id in self.urgent for n in claim.notifications))
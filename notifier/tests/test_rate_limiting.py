@@ -0,0 +1,105 @@
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import TestCase
+from django.test.utils import override_settings
+
+from notifier.models import RateBucket
+from notifier.services.delivery import NotificationRequest, safe_send_notification
+from notifier.services.rate_limiting import SendRateLimiter, get_send_rate_limiter, prune_rate_buckets
+
+
+# Tests for notifier/services/rate_limiting.py::SendRateLimiter
+class SendRateLimiterTests(TestCase):
+    def setUp(self):
+        self.limiter = SendRateLimiter(
+            providers={"smtp": {"rate": 2, "capacity": 3}},
+            recipient={"rate": 1, "capacity": 2},
+        )
+
+    def test_provider_burst_then_deferral(self):
+        delays = [self.limiter.acquire("smtp", f"user{i}@example.com", now=100.0) for i in range(4)]
+
+        self.assertEqual(delays[:3], [0.0, 0.0, 0.0])
+        # Empty bucket refills at 2 tokens/s, so the next token is 0.5s away.
+        self.assertAlmostEqual(delays[3], 0.5)
+
+    def test_bucket_refills_over_time(self):
+        for i in range(3):
+            self.limiter.acquire("smtp", f"user{i}@example.com", now=100.0)
+
+        self.assertEqual(self.limiter.acquire("smtp", "late@example.com", now=100.5), 0.0)
+
+    def test_recipient_limit_does_not_spend_provider_tokens(self):
+        self.limiter.acquire("smtp", "busy@example.com", now=100.0)
+        self.limiter.acquire("smtp", "busy@example.com", now=100.0)
+
+        self.assertAlmostEqual(self.limiter.acquire("smtp", "busy@example.com", now=100.0), 1.0)
+        # The deferred attempt left the last provider token in place.
+        self.assertEqual(self.limiter.acquire("smtp", "other@example.com", now=100.0), 0.0)
+
+    def test_limiters_in_different_processes_spend_one_budget(self):
+        # A second instance stands in for another worker: only the table links them.
+        other = SendRateLimiter(providers={"smtp": {"rate": 2, "capacity": 3}})
+        self.limiter.acquire("smtp", "a@example.com", now=100.0)
+        other.acquire("smtp", "b@example.com", now=100.0)
+        self.limiter.acquire("smtp", "c@example.com", now=100.0)
+
+        self.assertAlmostEqual(other.acquire("smtp", "d@example.com", now=100.0), 0.5)
+        self.assertEqual(RateBucket.objects.get(name="provider:smtp").tokens, 0)
+
+    def test_a_take_is_one_statement_per_bucket(self):
+        self.limiter.acquire("smtp", "a@example.com", now=100.0)
+
+        # The savepoint pair stands for the transaction; one upsert per bucket.
+        with self.assertNumQueries(4):
+            self.assertEqual(self.limiter.acquire("smtp", "a@example.com", now=100.0), 0.0)
+
+    def test_full_buckets_are_pruned(self):
+        self.limiter.acquire("smtp", "a@example.com", now=100.0)
+        self.limiter.acquire("smtp", "b@example.com", now=101.0)
+
+        # By 101.9 the provider bucket (full at 101.5) and a@'s (101) have refilled; b@'s (102) has not.
+        self.assertEqual(prune_rate_buckets(now=101.9), 2)
+        self.assertTrue(RateBucket.objects.get().name.startswith("recipient:"))
+        # A pruned bucket behaves as full.
+        self.assertEqual(self.limiter.acquire("smtp", "a@example.com", now=101.9), 0.0)
+
+    @override_settings(NOTIFIER_WORKER={**settings.NOTIFIER_WORKER, "rate_bucket_prune_interval": 0})
+    def test_worker_prunes_refilled_buckets(self):
+        self.limiter.acquire("smtp", "a@example.com", now=100.0)
+
+        call_command("run_worker", once=True, stdout=StringIO())
+
+        self.assertFalse(RateBucket.objects.exists())
+
+    @override_settings(NOTIFIER_RATE_LIMITS=None)
+    def test_limiter_disabled_without_settings(self):
+        self.assertIsNone(get_send_rate_limiter())
+
+
+# Tests for the limiter hook in notifier/services/delivery.py::safe_send_notification
+class DeferredDeliveryTests(TestCase):
+    def setUp(self):
+        self.request = NotificationRequest(
+            recipient_email="student@example.com",
+            subject="Reminder",
+            message="Stand-up at ten.",
+        )
+        self.sent = []
+
+    def send_callable(self, request):
+        self.sent.append(request)
+        return f"message-{len(self.sent)}"
+
+    def test_over_quota_send_is_deferred_not_attempted(self):
+        limiter = SendRateLimiter(providers={"default": {"rate": 1, "capacity": 1}})
+
+        first = safe_send_notification(self.request, self.send_callable, limiter=limiter)
+        second = safe_send_notification(self.request, self.send_callable, limiter=limiter)
+
+        self.assertEqual(first["status"], "success")
+        self.assertEqual(second["status"], "deferred")
+        self.assertGreater(second["retry_after"], 0)
+        self.assertEqual(len(self.sent), 1)
@@ -0,0 +1,74 @@
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from django.template.loader import get_template
+from django.test import SimpleTestCase, override_settings
+
+from notifier.services.rendering import TemplateRenderer
+
+TEMPLATE = "notifier/partials/notification_error.html"
+
+
+# Tests for notifier/services/rendering.py::TemplateRenderer
+class TemplateRendererTests(SimpleTestCase):
+    def setUp(self):
+        self.renderer = TemplateRenderer()
+
+    def test_template_is_compiled_once(self):
+        with patch("notifier.services.rendering.get_template", wraps=get_template) as loader:
+            self.renderer.get(TEMPLATE)
+            self.renderer.get(TEMPLATE)
+
+        self.assertEqual(loader.call_count, 1)
+
+    def test_cache_keeps_the_most_recently_used_templates(self):
+        renderer = TemplateRenderer(max_templates=1)
+        with patch("notifier.services.rendering.get_template", wraps=get_template) as loader:
+            renderer.get(TEMPLATE)
+            renderer.get("notifier/index.html")
+            renderer.get(TEMPLATE)
+
+        self.assertEqual(loader.call_count, 3)
+        self.assertEqual(list(renderer._compiled), [TEMPLATE])
+
+    def test_clear_rereads_edited_template_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "greeting.txt"
+            path.write_text("Hello {{ name }}")
+            templates = [{
+                "BACKEND": "django.template.backends.django.DjangoTemplates",
+                "DIRS": [directory],
+                "OPTIONS": {"loaders": [("django.template.loaders.cached.Loader", [
+                    "django.template.loaders.filesystem.Loader",
+                ])]},
+            }]
+            with override_settings(TEMPLATES=templates):
+                self.assertEqual(self.renderer.render("greeting.txt", {"name": "Ada"}), "Hello Ada")
+                path.write_text("Hi {{ name }}")
+                self.assertEqual(self.renderer.render("greeting.txt", {"name": "Ada"}), "Hello Ada")
+
+                self.renderer.clear()
+
+                self.assertEqual(self.renderer.render("greeting.txt", {"name": "Ada"}), "Hi Ada")
+
+    def test_render_many_renders_each_context(self):
+        contexts = [
+            {"recipient_email": f"user{i}@example.com", "subject": "Outage", "details": "<b>down</b>"}
+            for i in range(3)
+        ]
+
+        rendered = self.renderer.render_many(TEMPLATE, contexts)
+
+        self.assertEqual(len(rendered), 3)
+        self.assertIn("user2@example.com", rendered[2])
+        # Values from one recipient never leak into the next render.
+        self.assertNotIn("user0@example.com", rendered[1])
+        self.assertIn("&lt;b&gt;down&lt;/b&gt;", rendered[0])
+
+    def test_stats_track_render_counts(self):
+        self.renderer.render_many(TEMPLATE, [{"subject": "a"}, {"subject": "b"}])
+
+        stats = self.renderer.stats()[TEMPLATE]
+        self.assertEqual(stats["renders"], 2)
+        self.assertGreater(stats["total_seconds"], 0)
@@ -0,0 +1,69 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from notifier.models import Notification
+from notifier.services.delivery import NotificationDeliveryError, deliver_notification
+from notifier.services.retries import compute_backoff, due_retries, record_failure, requeue_due_retries
+
+
+# Tests for notifier/services/retries.py::compute_backoff
+class ComputeBackoffTests(SimpleTestCase):
+    def test_backoff_doubles_and_stays_within_jitter_band(self):
+        rng = random.Random(7)
+        for attempt, ceiling in [(1, 30), (2, 60), (3, 120), (4, 240)]:
+            delay = compute_backoff(attempt, base_delay=30, max_delay=3600, rng=rng)
+            self.assertGreaterEqual(delay, ceiling / 2)
+            self.assertLessEqual(delay, ceiling)
+
+    def test_backoff_is_capped(self):
+        delay = compute_backoff(20, base_delay=30, max_delay=100, rng=random.Random(1))
+        self.assertLessEqual(delay, 100)
+
+
+@override_settings(NOTIFIER_RETRY_POLICY={"max_attempts": 3, "base_delay": 10, "max_delay": 60})
+class RecordFailureTests(TestCase):
+    def setUp(self):
+        recipient = get_user_model().objects.create_user(username="ops", email="ops@example.com")
+        self.notification = Notification.objects.create(recipient=recipient, subject="Deploy", message="Done")
+        self.now = timezone.now()
+
+    def test_failure_schedules_retry(self):
+        record_failure(self.notification, "SMTP timeout", now=self.now)
+
+        self.notification.refresh_from_db()
+        self.assertEqual(self.notification.status, "failed")
+        self.assertEqual(self.notification.attempts, 1)
+        self.assertEqual(self.notification.last_error, "SMTP timeout")
+        self.assertGreater(self.notification.next_attempt_at, self.now)
+
+    def test_dead_letter_after_max_attempts(self):
+        for _ in range(3):
+            record_failure(self.notification, "SMTP timeout", now=self.now)
+
+        self.assertEqual(self.notification.status, "dead")
+        self.assertIsNone(self.notification.next_attempt_at)
+
+    def test_only_due_retries_are_requeued(self):
+        record_failure(self.notification, "SMTP timeout", now=self.now)
+
+        self.assertEqual(requeue_due_retries(now=self.now), 0)
+        self.assertEqual(due_retries(now=self.now + timedelta(minutes=5)).count(), 1)
+        self.assertEqual(requeue_due_retries(now=self.now + timedelta(minutes=5)), 1)
+        self.notification.refresh_from_db()
+        self.assertEqual(self.notification.status, "queued")
+
+    def test_deliver_notification_records_provider_error(self):
+        def failing_sender(request):
+            raise NotificationDeliveryError("Provider unavailable.")
+
+        payload = deliver_notification(self.notification, failing_sender)
+
+        self.assertEqual(payload["status"], "error")
+        self.notification.refresh_from_db()
+        self.assertEqual(self.notification.status, "failed")
+        self.assertEqual(self.notification.last_error, "Provider unavailable.")
@@ -0,0 +1,116 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from io import StringIO
+from unittest.mock import patch
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.core.management import call_command
+from django.db import IntegrityError
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from notifier.models import DeliveryRollup, Notification
+from notifier.services.rollups import empty_histogram, latency_slot, percentile, roll_up_deliveries
+from notifier.services.shared_cache import get_shared_cache
+
+NOW = datetime(2026, 3, 2, 10, 30, 15, tzinfo=dt_timezone.utc)
+
+
+# Tests for notifier/services/rollups.py::percentile
+class PercentileTests(SimpleTestCase):
+    def test_percentile_interpolates_inside_slot(self):
+        histogram = empty_histogram()
+        histogram[latency_slot(1.5)] += 10  # all between 1s and 2s
+
+        self.assertAlmostEqual(percentile(histogram, 0.5), 1.5)
+        self.assertIsNone(percentile(empty_histogram(), 0.5))
+
+
+# Tests for notifier/services/rollups.py::roll_up_deliveries
+class RollUpDeliveriesTests(TestCase):
+    def setUp(self):
+        self.recipient = get_user_model().objects.create_user(username="ops")
+
+    def add(self, subject, created_at, sent_at=None, failed_at=None):
+        notification = Notification.objects.create(recipient=self.recipient, subject=subject)
+        Notification.objects.filter(pk=notification.pk).update(
+            created_at=created_at, sent_at=sent_at, last_failed_at=failed_at
+        )
+
+    def test_minutes_and_hours_are_rolled_up(self):
+        minute = NOW.replace(minute=10, second=0)
+        self.add("fast", minute - timedelta(seconds=1), sent_at=minute + timedelta(seconds=5))
+        self.add("slow", minute - timedelta(seconds=100), sent_at=minute + timedelta(seconds=20))
+        self.add("next", minute, sent_at=minute + timedelta(minutes=1))
+        self.add("bounce", minute, failed_at=minute + timedelta(seconds=30))
+
+        written = roll_up_deliveries(now=NOW)
+
+        first = DeliveryRollup.objects.get(granularity="minute", bucket=minute)
+        hour = DeliveryRollup.objects.get(granularity="hour", bucket=NOW.replace(minute=0, second=0))
+        self.assertEqual(written, 2)
+        self.assertEqual((first.sent, first.failed), (2, 1))
+        self.assertLessEqual(first.latency_p50, 10)
+        self.assertGreater(first.latency_p99, 60)
+        self.assertEqual((hour.sent, hour.failed), (3, 1))
+
+    def test_later_runs_resume_without_double_counting(self):
+        early = NOW - timedelta(hours=2)
+        self.add("early", early, sent_at=early + timedelta(seconds=3))
+        roll_up_deliveries(now=NOW)
+        self.add("late", NOW, sent_at=NOW + timedelta(minutes=1))
+
+        roll_up_deliveries(now=NOW + timedelta(minutes=2))
+        roll_up_deliveries(now=NOW + timedelta(minutes=3))
+
+        hours = DeliveryRollup.objects.filter(granularity="hour").values_list("sent", flat=True)
+        self.assertEqual(list(hours), [1, 1])
+
+
+# Tests for the rollup step in notifier/management/commands/run_worker.py
+@override_settings(NOTIFIER_WORKER={**settings.NOTIFIER_WORKER, "rollup_interval": 0})
+@patch("notifier.management.commands.run_worker.roll_up_deliveries")
+class WorkerRollupTests(TestCase):
+    def test_one_worker_per_interval_rolls_up(self, roll_up):
+        get_shared_cache().add("notifier.rollup", "other-worker", timeout=60)
+
+        call_command("run_worker", once=True, stdout=StringIO())
+        self.assertEqual(roll_up.call_count, 0)
+
+        get_shared_cache().delete("notifier.rollup")
+        call_command("run_worker", once=True, stdout=StringIO())
+        self.assertEqual(roll_up.call_count, 1)
+
+    def test_integrity_errors_are_not_swallowed(self, roll_up):
+        roll_up.side_effect = IntegrityError("UNIQUE constraint failed")
+
+        with self.assertRaises(IntegrityError):
+            call_command("run_worker", once=True, stdout=StringIO())
+
+
+# Tests for notifier/views/notifications.py::delivery_rollups
+class DeliveryRollupsViewTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="ops", password="pass123")
+        self.user.user_permissions.add(Permission.objects.get(codename="view_notification"))
+        self.client.force_login(self.user)
+
+    def test_lists_rollups_since(self):
+        DeliveryRollup.objects.create(granularity="minute", bucket=NOW, sent=4, latency_p95=2.5)
+        DeliveryRollup.objects.create(granularity="minute", bucket=NOW - timedelta(days=1), sent=1)
+
+        response = self.client.get(
+            reverse("delivery_rollups"), {"granularity": "minute", "since": (NOW - timedelta(hours=1)).isoformat()}
+        )
+
+        rollups = response.json()["rollups"]
+        self.assertEqual(len(rollups), 1)
+        self.assertEqual(rollups[0]["sent"], 4)
+        self.assertEqual(rollups[0]["latency_p95"], 2.5)
+
+    def test_rejects_unknown_granularity(self):
+        response = self.client.get(reverse("delivery_rollups"), {"granularity": "day"})
+
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,56 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from notifier.models import Document, Notification
+from notifier.services.search import search_documents, to_match_query
+
+
+# Tests for notifier/services/search.py and the FTS5 triggers from migration 0009
+class DocumentSearchTests(TestCase):
+    def setUp(self):
+        self.release = Document.objects.create(title="Release notes", description="Sprint summary")
+        self.agenda = Document.objects.create(title="Agenda", description="Review the release checklist")
+        Document.objects.create(title="Budget", description="Quarterly numbers")
+
+    def test_title_hits_rank_above_description_hits(self):
+        documents, has_next = search_documents("release")
+
+        self.assertEqual(documents, [self.release, self.agenda])
+        self.assertFalse(has_next)
+
+    def test_index_follows_updates_and_deletes(self):
+        self.agenda.description = "Nothing relevant"
+        self.agenda.save()
+        self.release.delete()
+
+        self.assertEqual(search_documents("release")[0], [])
+
+    def test_user_input_cannot_break_match_syntax(self):
+        self.assertEqual(to_match_query('release" OR title:'), '"release" "OR" "title"*')
+        self.assertEqual(search_documents('"unbalanced')[0], [])
+
+    def test_search_endpoint_paginates(self):
+        response = self.client.get(reverse("documents_search"), {"q": "rel", "per_page": 1})
+
+        payload = response.json()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([result["id"] for result in payload["results"]], [self.release.id])
+        self.assertTrue(payload["has_next"])
+
+
+# Tests for the FTS-backed admin search in notifier/admin.py
+class NotificationAdminSearchTests(TestCase):
+    def setUp(self):
+        user_model = get_user_model()
+        self.admin = user_model.objects.create_superuser(username="admin", password="pass123")
+        self.notification = Notification.objects.create(
+            recipient=self.admin, subject="Outage report", message="Database failover completed"
+        )
+        Notification.objects.create(recipient=self.admin, subject="Weekly digest", message="Nothing new")
+        self.client.login(username="admin", password="pass123")
+
+    def test_admin_search_matches_message_text(self):
+        response = self.client.get(reverse("admin:notifier_notification_changelist"), {"q": "failover"})
+
+        self.assertEqual(list(response.context["cl"].result_list), [self.notification])
@@ -0,0 +1,135 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.contrib.messages import get_messages
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from django.urls import reverse
+
+from notifier.models import Notification, Recipient, Segment
+from notifier.services.delivery import deliver_notification
+from notifier.services.fanout import fan_out_segment
+from notifier.services.recipients import add_members, clean_records, upsert_recipients
+
+
+# Tests for notifier/services/recipients.py
+class UpsertRecipientsTests(TestCase):
+    def test_clean_records_normalises_and_skips_invalid(self):
+        records, skipped = clean_records([
+            {"email": " Ada@Example.com ", "first_name": "Ada", "last_name": "Lovelace"},
+            {"email": "not-an-email", "first_name": "X", "last_name": "Y"},
+            {"email": "ada@example.com", "first_name": "Augusta", "last_name": "King"},
+        ])
+
+        self.assertEqual(skipped, 1)
+        self.assertEqual(records, [{"email": "ada@example.com", "first_name": "Augusta", "last_name": "King"}])
+
+    def test_upsert_updates_existing_and_adds_to_segment(self):
+        Recipient.objects.create(email="ada@example.com", first_name="Ada")
+        segment = Segment.objects.create(name="beta")
+
+        upsert_recipients(
+            [
+                {"email": "ada@example.com", "first_name": "Augusta", "last_name": "King"},
+                {"email": "alan@example.com", "first_name": "Alan", "last_name": "Turing"},
+            ],
+            segment=segment,
+        )
+
+        self.assertEqual(Recipient.objects.get(email="ada@example.com").first_name, "Augusta")
+        self.assertEqual(segment.recipients.count(), 2)
+
+
+# Tests for notifier/services/fanout.py::fan_out_segment
+class SegmentFanOutTests(TestCase):
+    def setUp(self):
+        self.segment = Segment.objects.create(name="launch")
+        contacts = Recipient.objects.bulk_create(
+            Recipient(email=f"user{i}@example.com", is_active=i != 0) for i in range(5)
+        )
+        add_members(self.segment, [contact.pk for contact in contacts])
+
+    def test_single_statement_for_any_segment_size(self):
+        with self.assertNumQueries(1):
+            inserted = fan_out_segment(
+                self.segment, "Launch", "We are live", idempotency_key="launch-1", metadata={"campaign": "launch"}
+            )
+
+        notifications = Notification.objects.filter(contact__isnull=False)
+        self.assertEqual(inserted, 4)
+        self.assertEqual(notifications.count(), 4)
+        self.assertEqual(set(notifications.values_list("campaign", flat=True)), {"launch"})
+        self.assertEqual(set(notifications.values_list("status", flat=True)), {"queued"})
+
+    def test_repeating_the_fan_out_inserts_nothing(self):
+        fan_out_segment(self.segment, "Launch", "We are live", idempotency_key="launch-1")
+
+        self.assertEqual(fan_out_segment(self.segment, "Launch", "We are live", idempotency_key="launch-1"), 0)
+        self.assertEqual(Notification.objects.count(), 4)
+
+    def test_contact_notifications_are_delivered_to_the_contact(self):
+        fan_out_segment(self.segment, "Launch", "We are live", idempotency_key="launch-1")
+        notification = Notification.objects.select_related("contact").first()
+        sent_to = []
+
+        deliver_notification(notification, lambda request: sent_to.append(request.recipient_email))
+
+        self.assertEqual(sent_to, [notification.contact.email])
+        self.assertEqual(notification.recipient_name, notification.contact.email)
+
+
+# Tests for alerts/views.py::upload_recipients
+class RecipientUploadTests(TestCase):
+    def setUp(self):
+        user = get_user_model().objects.create_user(username="ops", password="pass123")
+        # Adding contacts, then the preview of them it redirects to.
+        user.user_permissions.add(*Permission.objects.filter(codename__in=["add_recipient", "view_recipient"]))
+        self.client.force_login(user)
+
+    def test_upload_persists_recipients_into_segment(self):
+        csv_file = SimpleUploadedFile(
+            "recipients.csv",
+            b"Email,First_Name,Last_Name\nada@example.com,Ada,Lovelace\nbroken,,\nalan@example.com,Alan,\n",
+        )
+
+        response = self.client.post(
+            reverse("alerts:upload_recipients"), {"csv_file": csv_file, "segment": "pioneers"}, follow=True
+        )
+
+        self.assertContains(response, "ada@example.com")
+        self.assertIn("Skipped 1 row(s) without a valid email.", [str(m) for m in get_messages(response.wsgi_request)])
+        self.assertEqual(Recipient.objects.get(email="alan@example.com").last_name, "")
+        self.assertEqual(Segment.objects.get(name="pioneers").recipients.count(), 2)
+
+
+# Tests for the permission checks on alerts/views.py
+class RecipientViewAccessTests(TestCase):
+    def setUp(self):
+        Recipient.objects.create(email="ada@example.com", first_name="Ada")
+
+    # Helper: a CSV upload that would add a contact to a segment.
+    def upload(self):
+        csv_file = SimpleUploadedFile("recipients.csv", b"email,first_name,last_name\nmallory@example.com,M,X\n")
+        return self.client.post(reverse("alerts:upload_recipients"), {"csv_file": csv_file, "segment": "pwned"})
+
+    def test_anonymous_users_are_sent_to_login(self):
+        for response in (self.upload(), self.client.get(reverse("alerts:preview_recipients"))):
+            self.assertEqual(response.status_code, 302)
+            self.assertIn("login", response["Location"])
+
+        self.assertFalse(Recipient.objects.filter(email="mallory@example.com").exists())
+        self.assertFalse(Segment.objects.exists())
+
+    def test_users_without_recipient_permissions_are_refused(self):
+        self.client.force_login(get_user_model().objects.create_user(username="intern", password="pass123"))
+
+        self.assertEqual(self.upload().status_code, 403)
+        self.assertEqual(self.client.get(reverse("alerts:preview_recipients")).status_code, 403)
+        self.assertFalse(Segment.objects.exists())
+
+    def test_view_permission_lists_contacts(self):
+        user = get_user_model().objects.create_user(username="viewer", password="pass123")
+        user.user_permissions.add(Permission.objects.get(codename="view_recipient"))
+        self.client.force_login(user)
+
+        self.assertContains(self.client.get(reverse("alerts:preview_recipients")), "ada@example.com")
+        self.assertEqual(self.upload().status_code, 403)
@@ -0,0 +1,59 @@
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+from unittest import skipIf
+
+from django.test import SimpleTestCase
+from django.test.utils import override_settings
+
+from notifier.models import Document
+from notifier.utils import serialization
+from notifier.utils.serialization import FastJsonResponse, dumps
+from notifier.views.views import serialise_document
+
+UPLOADED = datetime(2026, 5, 1, 9, 30, 0, 123456, tzinfo=dt_timezone.utc)
+
+
+# Tests for notifier/views/views.py::serialise_document
+class SerialiseDocumentTests(SimpleTestCase):
+    def test_document_serializer_keeps_api_format(self):
+        document = Document(title="Plan", description="Draft", uploaded_at=UPLOADED)
+
+        self.assertEqual(
+            serialise_document(document),
+            {"title": "Plan", "description": "Draft", "uploaded_at": "2026-05-01T09:30:00.123456Z"},
+        )
+
+
+# Tests for notifier/utils/serialization.py::dumps
+class DumpsTests(SimpleTestCase):
+    payload = {"title": "Plan", "count": 3, "ratio": 0.5, "price": Decimal("1.10"), "when": UPLOADED, 7: None}
+
+    def test_stdlib_backend_is_compact(self):
+        with override_settings(NOTIFIER_JSON_BACKEND="json"):
+            encoded = dumps(self.payload)
+
+        self.assertEqual(
+            encoded,
+            b'{"title":"Plan","count":3,"ratio":0.5,"price":"1.10","when":"2026-05-01T09:30:00.123Z","7":null}',
+        )
+
+    @skipIf(serialization.orjson is None, "orjson is not installed")
+    def test_backends_produce_identical_bytes(self):
+        with override_settings(NOTIFIER_JSON_BACKEND="json"):
+            stdlib = dumps(self.payload)
+        with override_settings(NOTIFIER_JSON_BACKEND="orjson"):
+            fast = dumps(self.payload)
+
+        self.assertEqual(fast, stdlib)
+
+    def test_unknown_backend_is_rejected(self):
+        with override_settings(NOTIFIER_JSON_BACKEND="simdjson"):
+            with self.assertRaises(ValueError):
+                dumps({})
+
+    def test_response_carries_encoded_bytes(self):
+        response = FastJsonResponse({"documents": []}, status=201)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(response.content, b'{"documents":[]}')
@@ -0,0 +1,50 @@
+import tempfile
+from pathlib import Path
+
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+from notifier_core.db.sqlite3.base import DatabaseWrapper, DEFAULT_PRAGMAS
+
+
+def pragma(conn, name):
+    with conn.cursor() as cursor:
+        cursor.execute(f"PRAGMA {name}")
+        return cursor.fetchone()[0]
+
+
+# Tests for notifier_core/db/sqlite3/base.py on the configured test database
+class TunedConnectionTests(TestCase):
+    def test_pragmas_applied_to_default_connection(self):
+        self.assertEqual(pragma(connection, "busy_timeout"), 5000)
+        # synchronous=NORMAL is reported as 1
+        self.assertEqual(pragma(connection, "synchronous"), 1)
+        self.assertEqual(pragma(connection, "cache_size"), DEFAULT_PRAGMAS["cache_size"])
+
+
+# Tests for the backend against a real on-disk file (WAL needs one)
+class FileDatabaseTests(SimpleTestCase):
+    def build_wrapper(self, path, options):
+        settings_dict = {**connection.settings_dict, "NAME": path, "OPTIONS": options}
+        return DatabaseWrapper(settings_dict, alias="pragma-test")
+
+    def test_file_database_uses_wal_and_overrides(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            wrapper = self.build_wrapper(
+                str(Path(tmp) / "wal.sqlite3"),
+                {"pragmas": {"busy_timeout": 1234, "mmap_size": None}},
+            )
+            try:
+                self.assertEqual(pragma(wrapper, "journal_mode"), "wal")
+                self.assertEqual(pragma(wrapper, "busy_timeout"), 1234)
+                self.assertEqual(pragma(wrapper, "mmap_size"), 0)
+            finally:
+                wrapper.close()
+
+    def test_pragmas_option_not_passed_to_sqlite3_connect(self):
+        wrapper = self.build_wrapper(":memory:", {"pragmas": {"busy_timeout": 10}})
+
+        params = wrapper.get_connection_params()
+
+        self.assertNotIn("pragmas", params)
+        self.assertEqual(wrapper.pragmas["busy_timeout"], 10)
@@ -4,14 +4,41 @@ from notifier.views.views import (
     notify_view,
     documents_collection,
     document_detail, dashboard,
+    documents_search,
+    documents_upload,
+    document_file,
 )
-from notifier.views import NotificationListView
+from notifier.views import (
+    NotificationListView,
+    notifications_collection,
+    notifications_stream,
+    delivery_rollups,
+    delivery_breakers,
+    notifications_export,
+    documents_collection_async,
+    document_detail_async,
+)
+from notifier.views.profiling import profile_detail, profile_download, profile_list
 
 urlpatterns = [
     path('', notify_view, name='home'),
     path('notify/', notify_view, name='notify'),
     path('api/documents/', documents_collection, name='documents_collection'),
+    path('api/documents/search', documents_search, name='documents_search'),
     path('api/documents/<int:pk>', document_detail, name='document_detail'),
+    path('api/documents/upload', documents_upload, name='documents_upload'),
+    path('api/documents/<int:pk>/file', document_file, name='document_file'),
+    # Async versions of the documents API for ASGI deployments.
+    path('api/async/documents/', documents_collection_async, name='documents_collection_async'),
+    path('api/async/documents/<int:pk>', document_detail_async, name='document_detail_async'),
     path('dashboard/', dashboard, name='dashboard'),
     path("notifications/", NotificationListView.as_view(), name="notification_list"),
+    path("api/notifications/", notifications_collection, name="notifications_collection"),
+    path("api/notifications/export", notifications_export, name="notifications_export"),
+    path("api/notifications/rollups/", delivery_rollups, name="delivery_rollups"),
+    path("api/delivery/breakers/", delivery_breakers, name="delivery_breakers"),
+    path("notifications/stream/", notifications_stream, name="notifications_stream"),
+    path("profiles/", profile_list, name="profile_list"),
+    path("profiles/<slug:profile_id>/", profile_detail, name="profile_detail"),
+    path("profiles/<slug:profile_id>/download", profile_download, name="profile_download"),
 ]
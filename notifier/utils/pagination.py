@@ -0,0 +1,40 @@
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Max, Min
+from django.utils.functional import cached_property
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that avoids exact COUNT(*) over very large tables.
+
+    Unfiltered querysets use a planner statistic (Postgres) or the primary key
+    span (other databases), both answered without scanning rows. Filtered
+    querysets are counted exactly but only up to count_cap rows; past that the
+    page count is approximate, which is fine for an admin changelist.
+    """
+
+    count_cap = 10_000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not hasattr(queryset, "query"):
+            return super().count
+        if queryset.query.where:
+            return queryset.order_by()[: self.count_cap].count()
+        return self.estimate_table_count(queryset)
+
+    def estimate_table_count(self, queryset):
+        connection = connections[queryset.db]
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE relname = %s", [queryset.model._meta.db_table])
+                row = cursor.fetchone()
+            if row and row[0] > 0:
+                return row[0]
+        # MIN/MAX on the primary key are single index lookups. Gaps from
+        # deleted or archived rows make this an overestimate, never a scan.
+        span = queryset.model._default_manager.using(queryset.db).aggregate(low=Min("pk"), high=Max("pk"))
+        if span["low"] is None:
+            return 0
+        return span["high"] - span["low"] + 1
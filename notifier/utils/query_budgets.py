@@ -0,0 +1,60 @@
+"""
+Query budgets per URL name, enforced by notifier/tests/test_query_budgets.py.
+
+Every route in notifier/urls.py and alerts/urls.py must have an entry here.
+The harness requests each one as a superuser against a small and a large
+seeded data set and fails when a request
+
+  * runs more than max_queries queries, or
+  * runs more queries on the large data set than on the small one, which is
+    how an N+1 (a query per row in a view or template) shows up.
+
+Counts include the session and user lookups (2) on routes that check the
+login; the documents API does not, so its counts are bare.
+When a change legitimately needs another query, raise the budget in the
+same commit so the reason is reviewed with the code.
+"""
+
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional
+
+
+@dataclass(frozen=True)
+class QueryBudget:
+    max_queries: int
+    # URL kwargs, built from the objects the harness seeded.
+    kwargs: Optional[Callable[[dict], dict]] = None
+    params: Dict[str, str] = field(default_factory=dict)
+    # Why the harness cannot exercise the route; it is then only registered.
+    skip: str = ""
+
+
+QUERY_BUDGETS: Dict[str, QueryBudget] = {
+    # notifier/urls.py
+    "home": QueryBudget(2),
+    "notify": QueryBudget(2),
+    "documents_collection": QueryBudget(1),
+    "documents_search": QueryBudget(2, params={"q": "report"}),
+    "document_detail": QueryBudget(1, kwargs=lambda seeded: {"pk": seeded["document"].pk}),
+    "documents_upload": QueryBudget(1, skip="POST only: a multipart upload, not a read."),
+    "document_file": QueryBudget(1, kwargs=lambda seeded: {"pk": seeded["document"].pk}),
+    "documents_collection_async": QueryBudget(1),
+    "document_detail_async": QueryBudget(1, kwargs=lambda seeded: {"pk": seeded["document"].pk}),
+    # +1 (here and delivery_breakers): one read of every breaker from the shared cache.
+    "dashboard": QueryBudget(5),
+    # +1: the newest StatusEvent id, where the page's live stream starts.
+    "notification_list": QueryBudget(5),
+    "notifications_collection": QueryBudget(3),
+    "notifications_export": QueryBudget(3),
+    "delivery_rollups": QueryBudget(3),
+    "delivery_breakers": QueryBudget(3),
+    # The harness runs under WSGI, where the stream answers with one batch and ends;
+    # every answer also reads the StatusCounter totals (+1).
+    "notifications_stream": QueryBudget(5),
+    "profile_list": QueryBudget(2),
+    "profile_detail": QueryBudget(2, kwargs=lambda seeded: {"profile_id": seeded["profile_id"]}),
+    "profile_download": QueryBudget(2, kwargs=lambda seeded: {"profile_id": seeded["profile_id"]}),
+    # alerts/urls.py
+    "alerts:upload_recipients": QueryBudget(2),
+    "alerts:preview_recipients": QueryBudget(4),
+}
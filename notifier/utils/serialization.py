@@ -0,0 +1,87 @@
+"""
+JSON encoding for API responses.
+
+dumps() uses orjson when it is installed and the stdlib json module
+otherwise; settings.NOTIFIER_JSON_BACKEND ("auto", "orjson" or "json") pins
+one. Both backends encode values the same way; the stdlib one escapes
+non-ASCII characters, which is its fast path.
+"""
+
+from datetime import datetime
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.http import HttpResponse
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+_django_encoder = DjangoJSONEncoder()
+
+
+def _orjson_dumps(data) -> bytes:
+    # Datetimes and Decimals go through DjangoJSONEncoder, exactly as in the
+    # stdlib backend, so switching backends never changes a value.
+    return orjson.dumps(
+        data,
+        default=_django_encoder.default,
+        option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+    )
+
+
+_stdlib_encoder = DjangoJSONEncoder(separators=(",", ":"))
+
+
+def _stdlib_dumps(data) -> bytes:
+    return _stdlib_encoder.encode(data).encode()
+
+
+BACKENDS = {"json": _stdlib_dumps}
+if orjson is not None:
+    BACKENDS["orjson"] = _orjson_dumps
+
+_dumps: Optional[Callable] = None
+
+
+def get_backend_name() -> str:
+    name = getattr(settings, "NOTIFIER_JSON_BACKEND", "auto")
+    if name == "auto":
+        return "orjson" if "orjson" in BACKENDS else "json"
+    if name not in BACKENDS:
+        raise ValueError(f"JSON backend {name!r} is not available; choose from {sorted(BACKENDS)}.")
+    return name
+
+
+def dumps(data) -> bytes:
+    global _dumps
+    if _dumps is None:
+        _dumps = BACKENDS[get_backend_name()]
+    return _dumps(data)
+
+
+@receiver(setting_changed)
+def reset_backend(sender, setting, **kwargs):
+    global _dumps
+    if setting == "NOTIFIER_JSON_BACKEND":
+        _dumps = None
+
+
+class FastJsonResponse(HttpResponse):
+    """JsonResponse replacement that encodes straight to bytes with dumps()."""
+
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(content=dumps(data), **kwargs)
+
+
+def isoformat_z(value: Optional[datetime]) -> Optional[str]:
+    """The API's timestamp format: ISO 8601 with "Z" for UTC."""
+    if value is None:
+        return None
+    return value.isoformat().replace("+00:00", "Z")
+
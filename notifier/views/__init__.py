@@ -1,3 +1,4 @@
 # re-export
-from .notifications import NotificationListView
+from .notifications import NotificationListView, notifications_collection, notifications_stream, delivery_rollups, delivery_breakers, notifications_export
+from .documents_async import documents_collection_async, document_detail_async
 from .views import *
\ No newline at end of file
@@ -0,0 +1,58 @@
+from django.http import HttpResponse, HttpResponseNotAllowed
+from django.views.decorators.csrf import csrf_exempt
+
+from notifier.models import Document
+from notifier.services.caching import aget_cached_document_payload, ainvalidate_document_payload
+from notifier.services.idempotency import idempotent
+from notifier.utils.serialization import FastJsonResponse
+from notifier.views.views import apply_document_changes, document_not_found, new_document_fields, serialise_document
+
+
+# Async twins of documents_collection / document_detail. Under ASGI they run on
+# the event loop with the async ORM and cache APIs, so a slow client or a slow
+# cache round trip does not hold a worker thread. Parsing and validation are
+# the sync views' helpers; only the ORM and cache calls are awaited here.
+@csrf_exempt
+@idempotent()
+async def documents_collection_async(request):
+    if request.method == "GET":
+        documents = await aget_cached_document_payload()
+        return FastJsonResponse({"documents": documents})
+
+    if request.method == "POST":
+        fields, error = new_document_fields(request)
+        if error:
+            return error
+        document = await Document.objects.acreate(**fields)
+        await ainvalidate_document_payload()
+
+        return FastJsonResponse(serialise_document(document), status=201)
+
+    return HttpResponseNotAllowed(["GET", "POST"])
+
+
+@csrf_exempt
+@idempotent()
+async def document_detail_async(request, pk):
+    try:
+        document = await Document.objects.aget(pk=pk)
+    except Document.DoesNotExist:
+        return document_not_found()
+
+    if request.method == "GET":
+        return FastJsonResponse(serialise_document(document))
+
+    if request.method in {"PUT", "PATCH"}:
+        document, error = apply_document_changes(request, document)
+        if error:
+            return error
+        await document.asave()
+        await ainvalidate_document_payload()
+        return FastJsonResponse(serialise_document(document))
+
+    if request.method == "DELETE":
+        await document.adelete()
+        await ainvalidate_document_payload()
+        return HttpResponse(status=204)
+
+    return HttpResponseNotAllowed(["GET", "PUT", "PATCH", "DELETE"])
@@ -1,26 +1,48 @@
+import json
+from datetime import timedelta
+
+from django.contrib.auth.decorators import login_required, permission_required
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, HttpResponseNotAllowed, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django.views.generic import ListView
-from notifier.models import Notification
+from notifier.models import DeliveryRollup, Notification
+from notifier.models.notifications import HOT_METADATA_KEYS
+from notifier.services.backends import get_backend_settings
+from notifier.services.circuit_breaker import get_circuit_breaker
 from notifier.services.delivery import NotificationRequest, safe_send_notification, NotificationDeliveryError
+from notifier.services.counters import status_totals
+from notifier.services.events import broadcaster
+from notifier.services.export import EXPORT_FORMATS, aiterate, export_lines, export_queryset, parse_moment
+from notifier.services.rollups import recent_rollups, serialise_rollup
+from notifier.utils.serialization import FastJsonResponse, isoformat_z
+
+STREAM_HEARTBEAT = 15  # seconds between keep-alive comments on an idle stream
+STREAM_POLL_RETRY = 5  # seconds between polls when the stream cannot stay open (WSGI)
 
 
 class NotificationListView(ListView):
     model = Notification
-    queryset = Notification.objects.select_related("document", "recipient")
+    queryset = Notification.objects.select_related("document", "recipient", "contact")
     template_name = "notifier/notification_list.html"
 
     # helper method
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         notifications = context["object_list"]
-        context["total_queued"] = notifications.filter(status="queued").count()
-        context["total_sent"] = notifications.filter(status="sent").count()
-        context["total_failed"] = notifications.filter(status="failed").count()
+        totals = status_totals()
+        context["total_queued"] = totals["queued"]
+        context["total_sent"] = totals["sent"]
+        context["total_failed"] = totals["failed"]
+        # The live stream picks up from here, so nothing between render and connect is lost.
+        context["stream_cursor"] = broadcaster.cursor
 
         # Sample usage of safe_send_notification for the first notification
         if notifications:
             sample = notifications.first()
             request = NotificationRequest(
-                recipient_email=sample.recipient.email,
+                recipient_email=sample.delivery_email,
                 subject=sample.subject,
                 message=sample.message
             )
@@ -32,4 +54,177 @@ class NotificationListView(ListView):
             payload = safe_send_notification(request, fake_sender)
             context["test_notification_result"] = payload
 
-        return context
\ No newline at end of file
+        return context
+
+
+def serialise_notification(notification: Notification) -> dict:
+    return {
+        "id": notification.id,
+        "recipient": notification.recipient_name,
+        "subject": notification.subject,
+        "status": notification.status,
+        "priority": notification.priority,
+        "metadata": notification.metadata,
+        "created_at": isoformat_z(notification.created_at),
+        "sent_at": isoformat_z(notification.sent_at),
+    }
+
+
+# JSON list with keyset pagination: pass ?before=<next_before> for the next page.
+# Hot metadata keys filter as ?campaign=..., other keys as ?metadata.<key>=...
+@login_required
+@permission_required("notifier.view_notification", raise_exception=True)
+def notifications_collection(request):
+    if request.method != "GET":
+        return HttpResponseNotAllowed(["GET"])
+
+    notifications = Notification.objects.select_related("recipient", "contact").order_by("-id")
+    if status := request.GET.get("status"):
+        notifications = notifications.filter(status=status)
+
+    metadata_filters = {key: request.GET[key] for key in HOT_METADATA_KEYS if key in request.GET}
+    for param, value in request.GET.items():
+        if param.startswith("metadata."):
+            key = param.removeprefix("metadata.")
+            # A plain key only; "__" would let the client pick ORM lookups (regex, ...).
+            if not key or "__" in key:
+                return FastJsonResponse({"error": f"Invalid metadata key: {key!r}."}, status=400)
+            metadata_filters[key] = value
+    if metadata_filters:
+        notifications = notifications.with_metadata(**metadata_filters)
+
+    try:
+        limit = min(max(int(request.GET.get("limit", 50)), 1), 500)
+        before = int(request.GET["before"]) if "before" in request.GET else None
+    except ValueError:
+        return FastJsonResponse({"error": "limit and before must be integers."}, status=400)
+    if before is not None:
+        notifications = notifications.filter(id__lt=before)
+
+    page = list(notifications[:limit])
+    return FastJsonResponse({
+        "notifications": [serialise_notification(notification) for notification in page],
+        "next_before": page[-1].id if len(page) == limit else None,
+    })
+
+
+# Delivery throughput and latency percentiles from the rollup tables.
+# ?granularity=minute|hour (default hour), ?since=<ISO datetime>.
+@login_required
+@permission_required("notifier.view_notification", raise_exception=True)
+def delivery_rollups(request):
+    if request.method != "GET":
+        return HttpResponseNotAllowed(["GET"])
+
+    granularity = request.GET.get("granularity", DeliveryRollup.HOUR)
+    if granularity not in {DeliveryRollup.MINUTE, DeliveryRollup.HOUR}:
+        return FastJsonResponse({"error": "granularity must be minute or hour."}, status=400)
+
+    if "since" in request.GET:
+        since = parse_datetime(request.GET["since"])
+        if since is None:
+            return FastJsonResponse({"error": "since must be an ISO 8601 datetime."}, status=400)
+        if timezone.is_naive(since):
+            since = timezone.make_aware(since)
+    else:
+        window = timedelta(hours=1) if granularity == DeliveryRollup.MINUTE else timedelta(days=1)
+        since = timezone.now() - window
+
+    return FastJsonResponse({
+        "granularity": granularity,
+        "rollups": [serialise_rollup(rollup) for rollup in recent_rollups(granularity, since)],
+    })
+
+
+# Circuit breaker state and counters for every configured delivery backend.
+@login_required
+@permission_required("notifier.view_notification", raise_exception=True)
+def delivery_breakers(request):
+    if request.method != "GET":
+        return HttpResponseNotAllowed(["GET"])
+
+    breaker = get_circuit_breaker()
+    if breaker is None:
+        return FastJsonResponse({"enabled": False, "breakers": []})
+    return FastJsonResponse({"enabled": True, "breakers": breaker.snapshot(list(get_backend_settings()))})
+
+
+# Streams every matching notification as CSV or NDJSON in constant memory.
+# ?format=csv|ndjson, ?status=, ?since= / ?until= (created_at), ?campaign= etc.
+@login_required
+@permission_required("notifier.view_notification", raise_exception=True)
+def notifications_export(request):
+    if request.method != "GET":
+        return HttpResponseNotAllowed(["GET"])
+
+    export_format = request.GET.get("format", "csv")
+    if export_format not in EXPORT_FORMATS:
+        return FastJsonResponse({"error": "format must be csv or ndjson."}, status=400)
+
+    bounds = {}
+    for name in ("since", "until"):
+        if name in request.GET:
+            bounds[name] = parse_moment(request.GET[name])
+            if bounds[name] is None:
+                return FastJsonResponse({"error": f"{name} must be an ISO 8601 date or datetime."}, status=400)
+
+    notifications = export_queryset(
+        status=request.GET.get("status"),
+        **bounds,
+        **{key: request.GET[key] for key in HOT_METADATA_KEYS if key in request.GET},
+    )
+    chunks = export_lines(notifications, export_format)
+    if isinstance(request, ASGIRequest):
+        chunks = aiterate(chunks)
+
+    response = StreamingHttpResponse(chunks, content_type=EXPORT_FORMATS[export_format])
+    response["Content-Disposition"] = f'attachment; filename="notifications.{export_format}"'
+    return response
+
+
+def format_event(event_id, event_type: str, data: dict) -> str:
+    return f"id: {event_id}\nevent: {event_type}\ndata: {json.dumps(data)}\n\n"
+
+
+# Server-sent events: status transitions as they happen, and "totals" (the
+# StatusCounter rows) whenever they change, so every writer is reflected.
+# Reconnects resume after the Last-Event-ID the browser sends (or ?cursor=).
+# Under ASGI the stream stays open. Under WSGI an endless stream would tie
+# up a worker thread for good (StreamingHttpResponse drains async iterators
+# into a list there), so the response carries the events available now and
+# ends; EventSource reconnects after STREAM_POLL_RETRY, which makes it a poll.
+@login_required
+@permission_required("notifier.view_notification", raise_exception=True)
+async def notifications_stream(request):
+    if request.method != "GET":
+        return HttpResponseNotAllowed(["GET"])
+
+    try:
+        cursor = int(request.headers.get("Last-Event-ID") or request.GET.get("cursor") or 0)
+    except ValueError:
+        return FastJsonResponse({"error": "cursor must be an integer."}, status=400)
+
+    def format_stream_event(event):
+        if event is None:
+            return ": keep-alive\n\n"
+        return format_event(event.id, event.type, event.data)
+
+    if not isinstance(request, ASGIRequest):
+        events, reset = await broadcaster.asince(cursor)
+        cursor = events[-1].id if events else reset if reset is not None else cursor
+        events.append(await broadcaster.atotals(cursor))
+        chunks = [f"retry: {STREAM_POLL_RETRY * 1000}\n\n"] + [format_stream_event(event) for event in events]
+        response = HttpResponse("".join(chunks), content_type="text/event-stream")
+        response["Cache-Control"] = "no-cache"
+        return response
+
+    async def events():
+        yield f"retry: {STREAM_HEARTBEAT * 1000}\n\n"
+        async for event in broadcaster.listen(cursor, heartbeat=STREAM_HEARTBEAT):
+            yield format_stream_event(event)
+
+    response = StreamingHttpResponse(events(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Stop nginx from buffering the stream.
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -0,0 +1,30 @@
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import FileResponse, Http404
+from django.shortcuts import render
+
+from notifier.services.profiling import get_profile_directory, list_profiles, load_profile
+
+
+# Profiles written by ProfilingMiddleware, newest first.
+@staff_member_required
+def profile_list(request):
+    return render(request, "notifier/profiles.html", {"profiles": list_profiles()})
+
+
+@staff_member_required
+def profile_detail(request, profile_id):
+    profile = load_profile(profile_id)
+    if profile is None:
+        raise Http404("No such profile.")
+    queries = sorted(profile["queries"], key=lambda query: query["ms"], reverse=True)
+    return render(request, "notifier/profile_detail.html", {"profile": profile, "slowest_queries": queries})
+
+
+# The raw profile: a .prof file for pstats/snakeviz, or pyinstrument's HTML.
+@staff_member_required
+def profile_download(request, profile_id):
+    profile = load_profile(profile_id)
+    if profile is None or profile["artifact"] is None:
+        raise Http404("No such profile.")
+    path = get_profile_directory() / profile["artifact"]
+    return FileResponse(open(path, "rb"), as_attachment=path.suffix == ".prof", filename=path.name)
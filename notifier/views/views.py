@@ -1,20 +1,30 @@
 import json
 import asyncio
 import logging
+from datetime import timedelta
 
 from django.shortcuts import render
-from django.http import JsonResponse, HttpResponseBadRequest, HttpResponseNotAllowed, HttpResponse
+from django.http import HttpResponseBadRequest, HttpResponseNotAllowed, HttpResponse, Http404
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth.decorators import login_required, permission_required
+from django.utils import timezone
 
 from notifier.models import Document
 from notifier.utils.factories import create_user
 from notifier.services.observer import UploadNotifier, alert_admin, log_upload
 from notifier.services.logging import action_logger
-from notifier.services.caching import get_cached_document_payload
+from notifier.services.backends import get_backend_settings
+from notifier.services.circuit_breaker import get_circuit_breaker
+from notifier.services.counters import status_totals
+from notifier.services.rollups import recent_rollups
+from notifier.services.caching import get_cached_document_payload, invalidate_document_payload
+from notifier.services.idempotency import idempotent
+from notifier.services.search import search_documents
 from notifier.services.session_storage import remember_last_document
+from notifier.services.storage import ContentAddressedUploadHandler, blob_response
 from notifier.utils.log_reader import read_logs
 from notifier.utils.metadata import fetch_all_metadata
+from notifier.utils.serialization import FastJsonResponse, isoformat_z
 
 notifier = UploadNotifier()
 notifier.subscribe(alert_admin)
@@ -52,76 +62,215 @@ def serialise_document(document: Document) -> dict:
     return {
         "title": document.title,
         "description": document.description,
-        "uploaded_at": document.uploaded_at.isoformat().replace("+00:00", "Z"),
+        "uploaded_at": isoformat_z(document.uploaded_at),
     }
 
 
+def serialise_document_file(document: Document) -> dict:
+    return {
+        "filename": document.filename,
+        "content_type": document.content_type,
+        "size": document.size,
+        "sha256": document.sha256,
+    }
+
+
+# Request handling shared by the sync views below and their async twins in
+# documents_async.py; only the ORM and cache calls differ between the two.
+# Each returns (result, None) or (None, error response).
+def parse_json_payload(request):
+    try:
+        return json.loads(request.body or "{}"), None
+    except json.JSONDecodeError:
+        return None, HttpResponseBadRequest("Invalid JSON payload.")
+
+
+def new_document_fields(request):
+    payload, error = parse_json_payload(request)
+    if error:
+        return None, error
+    title = payload.get("title")
+    if not title:
+        return None, FastJsonResponse({"error": "title is required."}, status=400)
+    return {"title": title, "description": payload.get("description", "")}, None
+
+
+def apply_document_changes(request, document):
+    payload, error = parse_json_payload(request)
+    if error:
+        return None, error
+    if "title" in payload:
+        title = payload["title"]
+        if not title:
+            return None, FastJsonResponse({"error": "title cannot be empty."}, status=400)
+        document.title = title
+    if "description" in payload:
+        document.description = payload["description"] or ""
+    return document, None
+
+
+def document_not_found():
+    return FastJsonResponse({"error": "Document not found."}, status=404)
+
+
 @csrf_exempt
+@idempotent()
 def documents_collection(request):
     if request.method == "GET":
         documents = get_cached_document_payload()
         # documents = Document.objects.order_by("-uploaded_at")
         # data = [serialise_document(doc) for doc in documents]
-        return JsonResponse({"documents": documents})
+        return FastJsonResponse({"documents": documents})
 
     if request.method == "POST":
-        try:
-            payload = json.loads(request.body or "{}")
-        except json.JSONDecodeError:
-            return HttpResponseBadRequest("Invalid JSON payload.")
+        fields, error = new_document_fields(request)
+        if error:
+            return error
+        document = Document.objects.create(**fields)
+        invalidate_document_payload()
 
-        title = payload.get("title")
-        if not title:
-            return JsonResponse({"error": "title is required."}, status=400)
+        return FastJsonResponse(serialise_document(document), status=201)
 
-        description = payload.get("description", "")
-        document = Document.objects.create(title=title, description=description)
+    return HttpResponseNotAllowed(["GET", "POST"])
 
-        return JsonResponse(serialise_document(document), status=201)
 
-    return HttpResponseNotAllowed(["GET", "POST"])
+# Multipart upload: a "file" part plus optional "title" and "description" fields.
+# Not @idempotent(): that reads request.body, which would buffer the whole file.
+@csrf_exempt
+def documents_upload(request):
+    if request.method != "POST":
+        return HttpResponseNotAllowed(["POST"])
+
+    # Must be set before request.POST/FILES is touched; the handler streams each
+    # chunk to disk and hashes it on the way, so the file is never in memory.
+    # Blobs of uploads that fail below (or extra file parts) are left for
+    # collect_garbage(), which removes them once nothing references them.
+    handler = ContentAddressedUploadHandler(request)
+    request.upload_handlers = [handler]
+    upload = request.FILES.get("file")
+    if handler.too_large:
+        return FastJsonResponse({"error": f"file is larger than {handler.max_size} bytes."}, status=413)
+    if upload is None:
+        return FastJsonResponse({"error": "file is required."}, status=400)
+
+    document = Document(
+        title=request.POST.get("title") or upload.name,
+        description=request.POST.get("description", ""),
+        filename=upload.name,
+        content_type=upload.content_type or "application/octet-stream",
+        size=upload.size,
+        sha256=upload.sha256,
+    )
+    # Already stored under its hash; just point the field at it.
+    document.file.name = upload.storage_name
+    document.save()
+    upload.close()
+    invalidate_document_payload()
+
+    return FastJsonResponse(
+        {"id": document.id, **serialise_document(document), "file": serialise_document_file(document)}, status=201
+    )
+
+
+# GET/HEAD the stored file, with Range and If-None-Match support.
+def document_file(request, pk):
+    if request.method not in {"GET", "HEAD"}:
+        return HttpResponseNotAllowed(["GET", "HEAD"])
+    document = Document.objects.filter(pk=pk).only("file", "filename", "content_type", "sha256").first()
+    if document is None or not document.file:
+        raise Http404("Document has no file.")
+    return blob_response(
+        request,
+        document.file.name,
+        document.sha256,
+        document.filename,
+        document.content_type,
+        as_attachment="download" in request.GET,
+    )
+
+
+# Ranked full-text search: /api/documents/search?q=release+notes&page=2
+def documents_search(request):
+    if request.method != "GET":
+        return HttpResponseNotAllowed(["GET"])
+
+    query = request.GET.get("q", "").strip()
+    if not query:
+        return FastJsonResponse({"error": "q is required."}, status=400)
+    try:
+        page = max(int(request.GET.get("page", 1)), 1)
+        per_page = min(max(int(request.GET.get("per_page", 20)), 1), 100)
+    except ValueError:
+        return FastJsonResponse({"error": "page and per_page must be integers."}, status=400)
+
+    documents, has_next = search_documents(query, page=page, per_page=per_page)
+    return FastJsonResponse({
+        "results": [{"id": document.id, **serialise_document(document)} for document in documents],
+        "page": page,
+        "has_next": has_next,
+    })
 
 
 @csrf_exempt
+@idempotent()
 def document_detail(request, pk):
     try:
         document = Document.objects.get(pk=pk)
     except Document.DoesNotExist:
-        return JsonResponse({"error": "Document not found."}, status=404)
+        return document_not_found()
 
     if request.method == "GET":
-        return JsonResponse(serialise_document(document))
+        return FastJsonResponse(serialise_document(document))
 
     if request.method in {"PUT", "PATCH"}:
-        try:
-            payload = json.loads(request.body or "{}")
-        except json.JSONDecodeError:
-            return HttpResponseBadRequest("Invalid JSON payload.")
-
-        if "title" in payload:
-            title = payload["title"]
-            if not title:
-                return JsonResponse({"error": "title cannot be empty."}, status=400)
-            document.title = title
-
-        if "description" in payload:
-            document.description = payload["description"] or ""
-
+        document, error = apply_document_changes(request, document)
+        if error:
+            return error
         document.save()
-        return JsonResponse(serialise_document(document))
+        invalidate_document_payload()
+        return FastJsonResponse(serialise_document(document))
 
     if request.method == "DELETE":
         document.delete()
+        invalidate_document_payload()
         return HttpResponse(status=204)
 
     return HttpResponseNotAllowed(["GET", "PUT", "PATCH", "DELETE"])
 
 
 def dashboard(request): # Build the context dictionary that template will consume
+    # Counter rows maintained by triggers, so this costs the same at any table size.
+    totals = status_totals()
+    active_alerts = []
+    if totals["dead"]:
+        active_alerts.append(f"{totals['dead']} notification(s) in the dead-letter queue")
+    if totals["failed"]:
+        active_alerts.append(f"{totals['failed']} notification(s) waiting to retry")
+    breaker = get_circuit_breaker()
+    if breaker is not None:
+        for row in breaker.snapshot(list(get_backend_settings())):
+            if row["state"] != "closed":
+                state = row["state"].replace("_", "-")
+                active_alerts.append(f"Deliveries via {row['provider']} paused: circuit breaker {state}")
+
+    # Last 24 hours of delivery rollups, scaled for the bar chart.
+    hourly = list(recent_rollups("hour", timezone.now() - timedelta(hours=24)))
+    peak = max((rollup.sent + rollup.failed for rollup in hourly), default=0) or 1
+    throughput = [
+        {
+            "rollup": rollup,
+            "sent_height": round(100 * rollup.sent / peak),
+            "failed_height": round(100 * rollup.failed / peak),
+        }
+        for rollup in hourly
+    ]
+
     context = {
         "page_title": "Notifier Dashboard",
         "welcome_message": "Welcome to the notifier control panel!",
-        "active_alerts": ["Server Load High", "Email Queue Delayed"],
+        "active_alerts": active_alerts,
+        "totals": totals,
+        "throughput": throughput,
     }
 
     return render(request, "notifier/dashboard.html", context)
\ No newline at end of file
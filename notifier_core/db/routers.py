@@ -0,0 +1,119 @@
+"""
+Primary/replica routing with a read-your-writes window.
+
+Reads go to one of settings.DATABASE_REPLICAS; writes always go to the
+primary ("default"). Once anything is written, the rest of that request is
+pinned to the primary, and ReplicaPinningMiddleware sets a short-lived cookie
+so the same client keeps reading from the primary for
+settings.REPLICA_PIN_SECONDS while the replicas catch up.
+"""
+
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+PIN_COOKIE = "db_pinned"
+
+_pinned: ContextVar[bool] = ContextVar("db_pinned", default=False)
+_wrote: ContextVar[bool] = ContextVar("db_wrote", default=False)
+
+
+def pin_to_primary() -> None:
+    _pinned.set(True)
+
+
+def is_pinned() -> bool:
+    return _pinned.get()
+
+
+def get_replicas() -> list:
+    return list(getattr(settings, "DATABASE_REPLICAS", []))
+
+
+def is_cache_table(model) -> bool:
+    # DatabaseCache tables (the shared cache) hold cross-process locks and
+    # counters; they must never be read from a lagging replica.
+    return model._meta.app_label == "django_cache"
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if is_cache_table(model):
+            return DEFAULT_DB_ALIAS
+        replicas = get_replicas()
+        if not replicas or is_pinned():
+            return DEFAULT_DB_ALIAS
+        # A read inside an open transaction must see that transaction's writes.
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        if is_cache_table(model):
+            # Cache bookkeeping is not a write the client should read back.
+            return DEFAULT_DB_ALIAS
+        _wrote.set(True)
+        pin_to_primary()
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db not in get_replicas()
+
+
+class ReplicaPinningMiddleware:
+    """Scopes the pin to one request and carries it across requests via a cookie."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        # Stay async under ASGI so async views don't get pushed onto a thread.
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        tokens = self.start(request)
+        try:
+            response = self.get_response(request)
+            self.finish(response)
+        finally:
+            self.reset(tokens)
+        return response
+
+    async def __acall__(self, request):
+        tokens = self.start(request)
+        try:
+            response = await self.get_response(request)
+            self.finish(response)
+        finally:
+            self.reset(tokens)
+        return response
+
+    def start(self, request):
+        return _pinned.set(PIN_COOKIE in request.COOKIES), _wrote.set(False)
+
+    def finish(self, response):
+        if _wrote.get():
+            response.set_cookie(
+                PIN_COOKIE,
+                "1",
+                max_age=getattr(settings, "REPLICA_PIN_SECONDS", 5),
+                httponly=True,
+                samesite="Lax",
+            )
+
+    def reset(self, tokens):
+        pinned_token, wrote_token = tokens
+        _pinned.reset(pinned_token)
+        _wrote.reset(wrote_token)
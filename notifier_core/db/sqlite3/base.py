@@ -0,0 +1,49 @@
+"""
+SQLite backend tuned for concurrent writers.
+
+Wraps Django's built-in sqlite3 backend and applies a set of PRAGMAs every
+time a new connection is opened. Configure it in settings.DATABASES:
+
+    'ENGINE': 'notifier_core.db.sqlite3',
+    'OPTIONS': {
+        'transaction_mode': 'IMMEDIATE',
+        'pragmas': {'busy_timeout': 10000},
+    },
+
+Values in OPTIONS['pragmas'] override DEFAULT_PRAGMAS; set a pragma to None
+to skip it entirely.
+"""
+
+from django.db.backends.sqlite3 import base
+
+DEFAULT_PRAGMAS = {
+    # WAL lets readers run alongside a single writer instead of blocking on it.
+    "journal_mode": "WAL",
+    # Wait (ms) for a competing writer instead of failing with "database is locked".
+    "busy_timeout": 5000,
+    # NORMAL is durable under WAL except on power loss; FULL fsyncs every commit.
+    "synchronous": "NORMAL",
+    # Memory-map up to 256 MiB of the database file for reads.
+    "mmap_size": 256 * 1024 * 1024,
+    # Negative values are KiB, so this is a 64 MiB page cache per connection.
+    "cache_size": -64 * 1024,
+    "temp_store": "MEMORY",
+}
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def get_connection_params(self):
+        kwargs = super().get_connection_params()
+        # sqlite3.connect() rejects unknown keyword arguments.
+        overrides = kwargs.pop("pragmas", None) or {}
+        pragmas = {**DEFAULT_PRAGMAS, **overrides}
+        self.pragmas = {name: value for name, value in pragmas.items() if value is not None}
+        return kwargs
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for name, value in self.pragmas.items():
+            # journal_mode=WAL is meaningless for in-memory test databases;
+            # SQLite silently keeps "memory" there, so no special case needed.
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
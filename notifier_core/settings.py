@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -43,12 +44,15 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'notifier_core.db.routers.ReplicaPinningMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # Last, so it sees request.user and times only the view and its queries.
+    'notifier.services.profiling.ProfilingMiddleware',
 ]
 
 ROOT_URLCONF = 'notifier_core.urls'
@@ -57,8 +61,16 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [],
-        'APP_DIRS': True,
+        # Loaders are listed explicitly (so APP_DIRS must be off) to make the
+        # cached loader unconditional: each template is parsed once per process.
+        'APP_DIRS': False,
         'OPTIONS': {
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
             'context_processors': [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
@@ -74,13 +86,60 @@ WSGI_APPLICATION = 'notifier_core.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# The custom engine applies WAL journaling, busy_timeout and cache PRAGMAs on
+# every new connection (see notifier_core/db/sqlite3/base.py). IMMEDIATE
+# transactions take the write lock up front, so concurrent writers queue on
+# busy_timeout instead of deadlocking on a lock upgrade.
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'notifier_core.db.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            'transaction_mode': 'IMMEDIATE',
+            'pragmas': {
+                'busy_timeout': 5000,
+                'synchronous': 'NORMAL',
+            },
+        },
+        # Reuse connections across requests instead of reconnecting (and
+        # re-running the PRAGMAs) every time. Health checks drop stale ones.
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Read replicas. Set NOTIFIER_REPLICA_DB to a second SQLite file to exercise
+# the router locally; tests mirror it onto the default test database.
+if os.environ.get('NOTIFIER_REPLICA_DB'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.environ['NOTIFIER_REPLICA_DB'],
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['notifier_core.db.routers.PrimaryReplicaRouter']
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+# Seconds a client keeps reading from the primary after it writes.
+REPLICA_PIN_SECONDS = 5
+
+
+# 'default' is per process and only holds data that may be rebuilt (the
+# document list). 'shared' is seen by the web process and every run_worker
+# process: circuit breakers and idempotency records live there
+# (notifier/services/shared_cache.py). Migration 0018 creates its table.
+# Rate-limit buckets have their own table (notifier.RateBucket).
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'notifier_shared_cache',
+        'OPTIONS': {'MAX_ENTRIES': 100_000},
+    },
+}
+NOTIFIER_SHARED_CACHE = 'shared'
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -129,3 +188,110 @@ APPEND_SLASH = True
 # Auth redirects
 LOGIN_REDIRECT_URL = 'dashboard'
 LOGOUT_REDIRECT_URL = 'login'
+
+# Delivery send-rate shaping (notifier/services/rate_limiting.py).
+# rate is tokens per second, capacity is the allowed burst.
+NOTIFIER_RATE_LIMITS = {
+    'providers': {
+        'default': {'rate': 20, 'capacity': 40},
+    },
+    'recipient': {'rate': 10 / 60, 'capacity': 10},
+}
+
+# Retry scheduling for failed deliveries (notifier/services/retries.py).
+# After max_attempts the notification moves to the "dead" (dead-letter) status.
+NOTIFIER_RETRY_POLICY = {
+    'max_attempts': 5,
+    'base_delay': 30,
+    'max_delay': 60 * 60,
+}
+
+# Queue workers (python manage.py run_worker).
+NOTIFIER_WORKER = {
+    'batch_size': 100,
+    'lease_seconds': 60,
+    'poll_interval': 1.0,
+    # Delivery backend (NOTIFIER_DELIVERY_BACKENDS) and rate-limit bucket.
+    'provider': 'default',
+    # Share of each batch reserved for every lower-priority lane.
+    'lane_min_share': 0.1,
+    # Seconds between recounts of the dashboard status counters.
+    'reconcile_interval': 300,
+    # Seconds between delivery rollup runs (notifier/services/rollups.py).
+    'rollup_interval': 60,
+    # Seconds between deletions of refilled rate-limit buckets.
+    'rate_bucket_prune_interval': 3600,
+}
+
+# Delivery backends (notifier/services/backends.py), one per provider name.
+# 'class' picks the backend, 'batch_size' is how many notifications it gets
+# per send_messages() call, and the remaining keys go to its constructor.
+# The sink-* entries talk to `manage.py run_delivery_sink`.
+NOTIFIER_DELIVERY_BACKENDS = {
+    'default': {'class': 'notifier.services.backends.LogBackend', 'batch_size': 100},
+    'sink-smtp': {
+        'class': 'notifier.services.backends.SMTPBackend',
+        'host': '127.0.0.1',
+        'port': 8025,
+        'timeout': 10,
+        'batch_size': 100,
+    },
+    'sink-http': {
+        'class': 'notifier.services.backends.HTTPBackend',
+        'url': 'http://127.0.0.1:8026/send',
+        'timeout': 10,
+        'batch_size': 100,
+    },
+}
+
+# On-demand request profiling (notifier/services/profiling.py). Staff profile a
+# request with the X-Profile header or ?profile=1; sample_rate profiles that
+# share of all requests. Results are listed at /profiles/.
+NOTIFIER_PROFILING = {
+    'directory': BASE_DIR / 'profiles',
+    'sample_rate': 0.0,
+    'keep': 200,
+}
+
+# Content-addressed document files (notifier/services/storage.py). Uploads are
+# streamed to root in chunk_size pieces and stored once per SHA-256. Set
+# sendfile_header to 'X-Accel-Redirect' (nginx, with an internal location at
+# sendfile_prefix aliased to root) or 'X-Sendfile' to let the web server send them.
+# `manage.py collect_document_files` removes files no document has referenced
+# for gc_grace seconds; run it periodically (cron).
+NOTIFIER_FILES = {
+    'root': BASE_DIR / 'media' / 'documents',
+    'chunk_size': 64 * 1024,
+    'max_size': 512 * 1024 * 1024,
+    'sendfile_header': None,
+    'sendfile_prefix': '/protected/documents/',
+    'gc_grace': 60 * 60,
+}
+
+# Per-provider circuit breakers (notifier/services/circuit_breaker.py). Opens
+# when failure_rate of at least minimum_requests sends in a window fail, then
+# defers sends for cooldown seconds before letting half_open_max probes through.
+# 'providers' overrides any value per backend name; None disables breakers.
+NOTIFIER_CIRCUIT_BREAKER = {
+    'failure_rate': 0.5,
+    'minimum_requests': 20,
+    'window': 60,
+    'cooldown': 30,
+    'half_open_max': 1,
+}
+
+# Archival of old notifications (notifier/services/archival.py), run with
+# `manage.py archive_notifications`.
+NOTIFIER_ARCHIVE = {
+    'retention_days': 90,
+    'batch_size': 500,
+    'pause': 0.0,
+}
+
+# Per-recipient digests (notifier/services/digests.py). fan_out(digest=True)
+# buffers notifications for `window` seconds, then the worker merges them.
+NOTIFIER_DIGEST = {
+    'enabled': True,
+    'window': 10 * 60,
+    'min_items': 2,
+}